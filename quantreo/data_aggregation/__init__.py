@@ -1,2 +1,4 @@
 from . import bar_building
 from . import bar_metrics
+from . import segments
+from . import tick_cleaning
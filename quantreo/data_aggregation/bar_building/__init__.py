@@ -1,9 +1,28 @@
-from .tick_bars import ticks_to_tick_bars
-from .tick_imbalance_bars import ticks_to_tick_imbalance_bars
-from .time_bars import ticks_to_time_bars
-from .volume_bars import ticks_to_volume_bars
-from .volume_imbalance_bars import ticks_to_volume_imbalance_bars
-
+from .tick_bars import tick_bar_boundaries, ticks_to_tick_bars
+from .tick_imbalance_bars import tick_imbalance_bar_boundaries, ticks_to_tick_imbalance_bars
+from .time_bars import time_bar_boundaries, ticks_to_time_bars
+from .volume_bars import volume_bar_boundaries, ticks_to_volume_bars
+from .volume_imbalance_bars import volume_imbalance_bar_boundaries, ticks_to_volume_imbalance_bars
+from .dollar_bars import dollar_bar_boundaries, ticks_to_dollar_bars
+from .dollar_imbalance_bars import dollar_imbalance_bar_boundaries, ticks_to_dollar_imbalance_bars
+from .tick_run_bars import tick_run_bar_boundaries, ticks_to_tick_run_bars
+from .volume_run_bars import volume_run_bar_boundaries, ticks_to_volume_run_bars
+from .streaming import (
+    TickBarBuilder,
+    VolumeBarBuilder,
+    TimeBarBuilder,
+    TickImbalanceBarBuilder,
+    VolumeImbalanceBarBuilder,
+    DollarBarBuilder,
+    DollarImbalanceBarBuilder,
+    TickRunBarBuilder,
+    VolumeRunBarBuilder,
+)
+from .file_bars import ticks_file_to_bars
+from .batch import ticks_to_bars_batch
+from .threshold_sweep import sweep_bar_thresholds
+from .bar_rollup import bars_to_tick_bars, bars_to_time_bars, bars_to_volume_bars
+from .tick_store import TickSlice, TickStore
 
 __all__ = [
     "ticks_to_tick_bars",
@@ -11,4 +30,38 @@ __all__ = [
     "ticks_to_time_bars",
     "ticks_to_volume_bars",
     "ticks_to_volume_imbalance_bars",
+    "ticks_to_dollar_bars",
+    "ticks_to_dollar_imbalance_bars",
+    "ticks_to_tick_run_bars",
+    "ticks_to_volume_run_bars",
+    "ticks_file_to_bars",
+    "ticks_to_bars_batch",
+    "sweep_bar_thresholds",
+    # Bar boundaries only
+    "tick_bar_boundaries",
+    "tick_imbalance_bar_boundaries",
+    "time_bar_boundaries",
+    "volume_bar_boundaries",
+    "volume_imbalance_bar_boundaries",
+    "dollar_bar_boundaries",
+    "dollar_imbalance_bar_boundaries",
+    "tick_run_bar_boundaries",
+    "volume_run_bar_boundaries",
+    # On-disk tick store
+    "TickStore",
+    "TickSlice",
+    # Rollup of existing bars
+    "bars_to_tick_bars",
+    "bars_to_time_bars",
+    "bars_to_volume_bars",
+    # Streaming builders
+    "TickBarBuilder",
+    "VolumeBarBuilder",
+    "TimeBarBuilder",
+    "TickImbalanceBarBuilder",
+    "VolumeImbalanceBarBuilder",
+    "DollarBarBuilder",
+    "DollarImbalanceBarBuilder",
+    "TickRunBarBuilder",
+    "VolumeRunBarBuilder",
 ]
@@ -0,0 +1,197 @@
+import pandas as pd
+import numpy as np
+from numba import njit
+
+from .engine import _merge_bars, _timestamps_ns, _to_bar_frame
+from .time_bars import _is_sorted, _time_bar_boundaries
+from .volume_bars import _volume_bar_boundaries
+
+_BAR_COLUMNS = ["open", "high", "low", "close", "volume", "high_time", "low_time"]
+
+
+@njit(nogil=True)
+def _rollup_durations(times, durations, starts, ends):
+    # Span between the first and the last merged bar, plus the duration of the last one
+    out = np.empty(len(starts), dtype=np.float64)
+    for k in range(len(starts)):
+        last = ends[k] - 1
+        out[k] = (times[last] - times[starts[k]]) / 60_000_000_000 + durations[last]
+    return out
+
+
+def _bar_arrays(df: pd.DataFrame) -> dict:
+    """Validate the bar DataFrame and extract its columns as numpy arrays."""
+    for col in _BAR_COLUMNS:
+        if col not in df.columns:
+            raise ValueError(f"Missing required column: '{col}' in DataFrame.")
+
+    times = _timestamps_ns(df.index)
+    if not _is_sorted(times):
+        raise ValueError("Bars must be sorted by time to be aggregated.")
+
+    has_ticks = "number_ticks" in df.columns
+    return {
+        "times": times,
+        "opens": df["open"].to_numpy(np.float64),
+        "highs": df["high"].to_numpy(np.float64),
+        "lows": df["low"].to_numpy(np.float64),
+        "closes": df["close"].to_numpy(np.float64),
+        "volumes": df["volume"].to_numpy(np.float64),
+        # Without a tick count every input bar weighs one, and the column is dropped at the end
+        "counts": (
+            df["number_ticks"].to_numpy(np.int64) if has_ticks else np.ones(len(df), dtype=np.int64)
+        ),
+        "has_ticks": has_ticks,
+        "high_times": _timestamps_ns(df["high_time"]),
+        "low_times": _timestamps_ns(df["low_time"]),
+    }
+
+
+def _rollup_frame(
+    arrays: dict, starts: np.ndarray, ends: np.ndarray, times: np.ndarray, durations, compact: bool
+) -> pd.DataFrame:
+    opens, highs, lows, closes, volumes, counts, high_times, low_times = _merge_bars(
+        starts,
+        ends,
+        arrays["opens"],
+        arrays["highs"],
+        arrays["lows"],
+        arrays["closes"],
+        arrays["volumes"],
+        arrays["counts"],
+        arrays["high_times"],
+        arrays["low_times"],
+    )
+    bars = _to_bar_frame(
+        (times, opens, highs, lows, closes, volumes, counts, durations, high_times, low_times),
+        compact=compact,
+    )
+    if not arrays["has_ticks"]:
+        bars = bars.drop(columns="number_ticks")
+    return bars
+
+
+def _threshold_rollup(
+    df: pd.DataFrame, arrays: dict, weights: np.ndarray, threshold: float, compact: bool
+):
+    starts, ends = _volume_bar_boundaries(weights, threshold)
+    times = arrays["times"]
+
+    if "duration_minutes" in df.columns:
+        durations = df["duration_minutes"].to_numpy(np.float64)
+    else:
+        durations = np.zeros(len(df), dtype=np.float64)
+    durations = _rollup_durations(times, durations, starts, ends)
+
+    return _rollup_frame(arrays, starts, ends, times[starts], durations, compact)
+
+
+def bars_to_time_bars(
+    df: pd.DataFrame, resample_factor: str = "1D", compact: bool = False
+) -> pd.DataFrame:
+    """
+    Aggregate existing OHLCV bars into coarser time bars, without going back to the ticks.
+
+    Each input bar is assigned to the period containing its timestamp, and only non-empty periods
+    are returned. `high_time` and `low_time` are taken from the input bar holding the extreme (the
+    earliest one on ties), volumes and tick counts are summed.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        Bars indexed by their start time and sorted, with columns 'open', 'high', 'low', 'close',
+        'volume', 'high_time' and 'low_time', and optionally 'number_ticks'.
+    resample_factor : str, default="1D"
+        Target frequency (e.g., "1H", "4H", "1D"). It should be a multiple of the input frequency,
+        otherwise an input bar is attributed entirely to the period containing its start.
+    compact : bool, default=False
+        If True, prices and volumes are returned as float32 and tick counts as int32.
+        Timestamps are always kept exactly as datetime64[ns].
+
+    Returns
+    -------
+    pd.DataFrame
+        DataFrame indexed by period start time with columns 'open', 'high', 'low', 'close', 'volume',
+        'number_ticks' (only if present in the input), 'high_time' and 'low_time'.
+    """
+    window_ns = pd.Timedelta(resample_factor).value
+    if window_ns <= 0:
+        raise ValueError("resample_factor must be a strictly positive duration.")
+
+    arrays = _bar_arrays(df)
+    times = arrays["times"]
+    starts, ends = _time_bar_boundaries(times, window_ns)
+    return _rollup_frame(
+        arrays, starts, ends, times[starts] // window_ns * window_ns, None, compact
+    )
+
+
+def bars_to_volume_bars(
+    df: pd.DataFrame, volume_per_bar: float = 1_000_000, compact: bool = False
+) -> pd.DataFrame:
+    """
+    Aggregate existing OHLCV bars into volume bars, without going back to the ticks.
+
+    Input bars are accumulated until their total volume reaches `volume_per_bar`. Input bars are
+    never split, so each output bar holds at least `volume_per_bar` and the trailing incomplete bar
+    is dropped, like in `ticks_to_volume_bars`.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        Bars indexed by their start time and sorted, with columns 'open', 'high', 'low', 'close',
+        'volume', 'high_time' and 'low_time', and optionally 'number_ticks' and 'duration_minutes'.
+    volume_per_bar : float, default=1_000_000
+        Volume threshold that triggers a new bar.
+    compact : bool, default=False
+        If True, prices, volumes and durations are returned as float32 and tick counts as int32.
+        Timestamps are always kept exactly as datetime64[ns].
+
+    Returns
+    -------
+    pd.DataFrame
+        DataFrame indexed by the start time of the first merged bar with columns 'open', 'high',
+        'low', 'close', 'volume', 'number_ticks' (only if present in the input), 'duration_minutes',
+        'high_time' and 'low_time'. The duration spans from the first to the last merged bar, plus
+        the duration of the last one when the input has a 'duration_minutes' column.
+    """
+    if volume_per_bar <= 0:
+        raise ValueError("volume_per_bar must be strictly positive.")
+
+    arrays = _bar_arrays(df)
+    return _threshold_rollup(df, arrays, arrays["volumes"], volume_per_bar, compact)
+
+
+def bars_to_tick_bars(
+    df: pd.DataFrame, tick_per_bar: int = 1000, compact: bool = False
+) -> pd.DataFrame:
+    """
+    Aggregate existing OHLCV bars into tick-count bars, without going back to the ticks.
+
+    Input bars are accumulated until their total 'number_ticks' reaches `tick_per_bar`. Input bars
+    are never split, so each output bar holds at least `tick_per_bar` ticks and the trailing
+    incomplete bar is dropped.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        Bars indexed by their start time and sorted, with columns 'open', 'high', 'low', 'close',
+        'volume', 'number_ticks', 'high_time' and 'low_time', and optionally 'duration_minutes'.
+    tick_per_bar : int, default=1000
+        Number of ticks that triggers a new bar.
+    compact : bool, default=False
+        If True, prices, volumes and durations are returned as float32 and tick counts as int32.
+        Timestamps are always kept exactly as datetime64[ns].
+
+    Returns
+    -------
+    pd.DataFrame
+        Same columns as `bars_to_volume_bars`.
+    """
+    if tick_per_bar <= 0:
+        raise ValueError("tick_per_bar must be strictly positive.")
+    if "number_ticks" not in df.columns:
+        raise ValueError("Missing required column: 'number_ticks' in DataFrame.")
+
+    arrays = _bar_arrays(df)
+    return _threshold_rollup(df, arrays, arrays["counts"].astype(np.float64), tick_per_bar, compact)
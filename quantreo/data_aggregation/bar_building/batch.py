@@ -0,0 +1,199 @@
+import multiprocessing
+import os
+import tempfile
+import time
+import numpy as np
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Callable, Dict, List, Mapping, Tuple, Union
+
+from .dollar_bars import ticks_to_dollar_bars
+from .dollar_imbalance_bars import ticks_to_dollar_imbalance_bars
+from .file_bars import _file_format, _import_pyarrow, _parse_times
+from .tick_bars import ticks_to_tick_bars
+from .tick_imbalance_bars import ticks_to_tick_imbalance_bars
+from .tick_run_bars import ticks_to_tick_run_bars
+from .engine import _tick_arrays
+from .tick_store import TickSlice, TickStore, _SliceLocation
+from .time_bars import ticks_to_time_bars
+from .volume_bars import ticks_to_volume_bars
+from .volume_imbalance_bars import ticks_to_volume_imbalance_bars
+from .volume_run_bars import ticks_to_volume_run_bars
+
+_BAR_FUNCTIONS = {
+    "tick": ticks_to_tick_bars,
+    "volume": ticks_to_volume_bars,
+    "time": ticks_to_time_bars,
+    "tick_imbalance": ticks_to_tick_imbalance_bars,
+    "volume_imbalance": ticks_to_volume_imbalance_bars,
+    "dollar": ticks_to_dollar_bars,
+    "dollar_imbalance": ticks_to_dollar_imbalance_bars,
+    "tick_run": ticks_to_tick_run_bars,
+    "volume_run": ticks_to_volume_run_bars,
+}
+
+
+def _read_ticks(path: str, col_time: str, col_price: str, col_volume: str) -> pd.DataFrame:
+    columns = [col_time, col_price, col_volume]
+    if _file_format(path) == "csv":
+        ticks = pd.read_csv(path, usecols=columns)
+    else:
+        pa = _import_pyarrow()
+        ticks = pa.parquet.read_table(path, columns=columns).to_pandas()
+
+    ticks.index = _parse_times(ticks.pop(col_time))
+    return ticks
+
+
+def _dump_ticks(
+    ticks, folder: str, col_time: str, col_price: str, col_volume: str
+) -> Tuple[str, str, str]:
+    """Write the tick columns as .npy files, to be memory-mapped by the worker processes."""
+    prices, volumes, timestamps_ns = _tick_arrays(ticks, col_price, col_volume, col_time)
+    paths = tuple(os.path.join(folder, name) for name in ("time.npy", "price.npy", "volume.npy"))
+    np.save(paths[0], np.asarray(timestamps_ns, dtype=np.int64).view("datetime64[ns]"))
+    np.save(paths[1], np.asarray(prices, dtype=np.float64))
+    np.save(paths[2], np.asarray(volumes, dtype=np.float64))
+    return paths
+
+
+def _load_ticks(paths: Tuple[str, str, str], col_price: str, col_volume: str) -> pd.DataFrame:
+    times, prices, volumes = (np.load(path, mmap_mode="r") for path in paths)
+    return pd.DataFrame(
+        {col_price: prices, col_volume: volumes}, index=pd.DatetimeIndex(times), copy=False
+    )
+
+
+def _process_inputs(
+    sources: Mapping, folder: str, col_time: str, col_price: str, col_volume: str
+) -> Dict[str, object]:
+    """Replace the in-memory sources by the location of their ticks on disk, cheap to pickle."""
+    inputs = {}
+    for i, (symbol, source) in enumerate(sources.items()):
+        location = source._location() if isinstance(source, TickSlice) else None
+        if location is not None:
+            source = location
+        elif isinstance(source, (pd.DataFrame, TickSlice)):
+            symbol_folder = os.path.join(folder, str(i))
+            os.mkdir(symbol_folder)
+            source = _dump_ticks(source, symbol_folder, col_time, col_price, col_volume)
+        inputs[symbol] = source
+    return inputs
+
+
+def _build_symbol(
+    source, bar_type, col_time, col_price, col_volume, additional_metrics, bar_params
+):
+    if isinstance(source, (pd.DataFrame, TickStore, TickSlice)):
+        ticks = source
+    elif isinstance(source, _SliceLocation):
+        ticks = source.map()
+    elif isinstance(source, tuple):
+        ticks = _load_ticks(source, col_price, col_volume)
+    else:
+        ticks = _read_ticks(source, col_time, col_price, col_volume)
+
+    start = time.perf_counter()
+    bars = _BAR_FUNCTIONS[bar_type](
+        ticks,
+        col_price=col_price,
+        col_volume=col_volume,
+        additional_metrics=additional_metrics,
+        **bar_params,
+    )
+    return bars, len(ticks), time.perf_counter() - start
+
+
+def ticks_to_bars_batch(
+    sources: Mapping[str, Union[pd.DataFrame, TickStore, TickSlice, str]],
+    bar_type: str = "volume",
+    backend: str = "thread",
+    n_jobs: int = None,
+    col_time: str = "datetime",
+    col_price: str = "price",
+    col_volume: str = "volume",
+    additional_metrics: List[Tuple[Callable, str, List[str]]] = [],
+    **bar_params,
+) -> Tuple[Dict[str, pd.DataFrame], pd.DataFrame]:
+    """
+    Build the same bar type for many symbols in parallel.
+
+    Symbols are distributed over a pool of workers. With the "thread" backend the compiled bar
+    kernels release the GIL, so the tick DataFrames are shared without any copy. With the "process"
+    backend, in-memory ticks are written once to temporary `.npy` files that the workers
+    memory-map, `TickStore` reads are sent as file offsets and mapped again by the workers, and tick
+    files are read directly by the workers, so tick data is never pickled.
+
+    Parameters
+    ----------
+    sources : Mapping[str, pd.DataFrame, TickStore, TickSlice or str]
+        Symbol -> tick DataFrame indexed by datetime, `TickStore`, `TickSlice` returned by
+        `TickStore.read`, or path to a tick file (".csv" or ".parquet") with a time column.
+        `TickStore` and `TickSlice` ticks are only memory-mapped by the workers, with either
+        backend.
+    bar_type : str, default="volume"
+        One of "tick", "volume", "time", "tick_imbalance", "volume_imbalance", "dollar",
+        "dollar_imbalance", "tick_run" or "volume_run".
+    backend : str, default="thread"
+        "thread" or "process". The process workers are started with the "spawn" method, which
+        re-imports the main module of the caller: in a script, the call must be placed under an
+        `if __name__ == "__main__":` guard. Each worker also pays a one-off start-up and numba
+        compilation cost, so "process" only pays off for large symbols.
+    n_jobs : int, optional
+        Number of workers. Defaults to the number of CPUs.
+    col_time : str, default="datetime"
+        Name of the time column, only used for tick files.
+    col_price : str, default="price"
+        Name of the column containing tick prices.
+    col_volume : str, default="volume"
+        Name of the column containing tick volumes.
+    additional_metrics : List of tuples (function, source, col_names)
+        Same format as in the `ticks_to_*_bars` functions. With the "process" backend the functions
+        must be picklable (defined at module level).
+    **bar_params
+        Parameters of the bar type, e.g. `volume_per_bar=1_000_000` or `resample_factor="5min"`.
+
+    Returns
+    -------
+    tuple (dict, pd.DataFrame)
+        Symbol -> bars, and a DataFrame indexed by symbol with the columns 'n_ticks', 'n_bars' and
+        'seconds' (time spent building the bars of the symbol, excluding the loading of the ticks).
+    """
+    if bar_type not in _BAR_FUNCTIONS:
+        raise ValueError(f"Invalid bar_type '{bar_type}'. Must be one of {list(_BAR_FUNCTIONS)}.")
+    if backend not in ("thread", "process"):
+        raise ValueError(f"Invalid backend '{backend}'. Must be 'thread' or 'process'.")
+    if n_jobs is not None and n_jobs <= 0:
+        raise ValueError("n_jobs must be strictly positive.")
+
+    n_jobs = n_jobs or os.cpu_count() or 1
+    args = (bar_type, col_time, col_price, col_volume, list(additional_metrics), bar_params)
+
+    with tempfile.TemporaryDirectory() as folder:
+        if backend == "thread":
+            executor = ThreadPoolExecutor(max_workers=n_jobs)
+            inputs = dict(sources)
+        else:
+            # Forking after numba has started its threading layer can deadlock the workers
+            executor = ProcessPoolExecutor(
+                max_workers=n_jobs, mp_context=multiprocessing.get_context("spawn")
+            )
+            inputs = _process_inputs(sources, folder, col_time, col_price, col_volume)
+
+        with executor:
+            futures = {
+                symbol: executor.submit(_build_symbol, source, *args)
+                for symbol, source in inputs.items()
+            }
+            results = {symbol: future.result() for symbol, future in futures.items()}
+
+    bars = {symbol: result[0] for symbol, result in results.items()}
+    report = pd.DataFrame(
+        {
+            "n_ticks": [result[1] for result in results.values()],
+            "n_bars": [len(result[0]) for result in results.values()],
+            "seconds": [result[2] for result in results.values()],
+        },
+        index=pd.Index(list(results), name="symbol"),
+    )
+    return bars, report
@@ -0,0 +1,226 @@
+import pandas as pd
+import numpy as np
+from numba import njit
+from typing import Callable, List, Tuple
+
+from .engine import (
+    _compute_additional_metrics,
+    _compute_extra_columns,
+    _ewma_params,
+    _extra_mode,
+    _fill_bars,
+    _tick_arrays,
+    _to_bar_frame,
+    _update_imbalance_ewma,
+)
+from .speculative import _DOLLAR_IMBALANCE, _build_speculative_bars, _parallel_bar_boundaries
+
+
+@njit(nogil=True)
+def _dollar_imbalance_bar_scan(prices, volumes, expected_imbalance, ewma, record, starts, ends):
+    n_bars = 0
+    start = 1
+    cum_imbalance = 0.0
+    threshold = float(expected_imbalance)
+    ewma_ticks = 0.0
+    ewma_imbalance = 0.0
+
+    for i in range(1, len(prices)):
+        delta = prices[i] - prices[i - 1]
+        if delta > 0:
+            sign = 1
+        elif delta < 0:
+            sign = -1
+        else:
+            continue
+
+        cum_imbalance += sign * prices[i] * volumes[i]
+
+        if abs(cum_imbalance) >= threshold:
+            if record:
+                starts[n_bars] = start
+                ends[n_bars] = i + 1
+            n_bars += 1
+
+            if ewma[0] > 0.0:
+                ewma_ticks, ewma_imbalance, threshold = _update_imbalance_ewma(
+                    ewma_ticks, ewma_imbalance, i + 1 - start, cum_imbalance, ewma
+                )
+
+            cum_imbalance = 0.0
+            start = i + 1
+
+    return n_bars
+
+
+@njit(nogil=True)
+def _dollar_imbalance_bar_boundaries(prices, volumes, expected_imbalance, ewma):
+    # Count the bars first so that the boundaries can be written into exact-size arrays
+    empty = np.empty(0, dtype=np.int64)
+    n_bars = _dollar_imbalance_bar_scan(
+        prices, volumes, expected_imbalance, ewma, False, empty, empty
+    )
+
+    starts = np.empty(n_bars, dtype=np.int64)
+    ends = np.empty(n_bars, dtype=np.int64)
+    _dollar_imbalance_bar_scan(prices, volumes, expected_imbalance, ewma, True, starts, ends)
+    return starts, ends
+
+
+@njit(nogil=True)
+def _build_dollar_imbalance_bars(
+    prices, volumes, timestamps_ns, expected_imbalance, ewma, extra_mode
+):
+    starts, ends = _dollar_imbalance_bar_boundaries(prices, volumes, expected_imbalance, ewma)
+    bars, extra = _fill_bars(prices, volumes, timestamps_ns, starts, ends, extra_mode)
+    return bars, extra, starts, ends
+
+
+def ticks_to_dollar_imbalance_bars(
+    df: pd.DataFrame,
+    expected_imbalance: float = 50_000_000,
+    col_price: str = "price",
+    col_volume: str = "volume",
+    additional_metrics: List[Tuple[Callable[[np.ndarray], float], str, List[str]]] = [],
+    compact: bool = False,
+    ewma_span: int = None,
+    ewma_bounds: Tuple[float, float] = (0.1, 10.0),
+    parallel: bool = False,
+    extra: List[str] = [],
+    col_time: str = "datetime",
+    output: str = "pandas",
+) -> pd.DataFrame:
+    """
+    Convert tick-level data into dollar imbalance bars, optionally enriched with custom metrics.
+
+    Each tick is signed with the tick rule and contributes `sign * price * volume` to the running
+    imbalance. A bar is closed when the absolute imbalance reaches `expected_imbalance`.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        Tick DataFrame indexed by datetime, must include price and volume columns.
+    expected_imbalance : float, default=50_000_000
+        Signed notional imbalance threshold that triggers a new bar.
+    col_price : str, default="price"
+        Column name representing the price of each tick.
+    col_volume : str, default="volume"
+        Column name representing the volume of each tick.
+    additional_metrics : list of tuples (function, source, col_names)
+        - function : a callable that takes a NumPy slice (1D array) and returns a float or tuple of floats.
+        - source   : "price" or "volume", defines what data is passed to the function.
+        - col_names: list of names corresponding to the outputs of the function.
+    compact : bool, default=False
+        If True, prices, volumes and durations are returned as float32 and tick counts as int32.
+        Timestamps are always kept exactly as datetime64[ns].
+    ewma_span : int, optional
+        If given, the threshold adapts to the data: `expected_imbalance` is only used for the first
+        bar, then the threshold becomes E[T] * |E[b]|, where E[T] and E[b] are exponentially
+        weighted averages (with this span) of the past bar lengths in ticks and of their
+        signed notional imbalance per tick.
+    ewma_bounds : tuple of float, default=(0.1, 10.0)
+        Lower and upper bounds of the adaptive threshold, as multiples of `expected_imbalance`.
+        Without them a drift-less market drives E[b] towards zero and the bars collapse to a few
+        ticks. Ignored when `ewma_span` is None.
+    parallel : bool, default=False
+        If True, the bar boundaries are searched speculatively on chunks of ticks with all the
+        threads available to numba (see `numba.set_num_threads`), then reconciled by a short
+        sequential pass. The output is identical to the sequential one.
+        Not available with `ewma_span`, whose threshold carries over from one bar to the next:
+        the bars are then built sequentially.
+    extra : list of str, default=[]
+        Built-in columns accumulated in the loop that builds the bars, placed before the
+        additional metrics: "vwap", "buy_volume" and "sell_volume" (tick rule, ticks without
+        price change are not counted), "signed_ticks", "realized_var" (sum of squared log returns
+        between consecutive ticks of the bar), "first_time" and "last_time".
+    col_time : str, default="datetime"
+        Name of the timestamp column when `df` is a pyarrow Table or a polars DataFrame, which are
+        accepted in place of a pandas DataFrame indexed by datetime.
+    output : str, default="pandas"
+        "pandas", "arrow" (pyarrow Table), "polars" (polars DataFrame) or "numpy" (dict of arrays).
+        Except for pandas, the bar start time is the first column, "time". The arrays computed by
+        the kernels are wrapped without copy.
+
+    Returns
+    -------
+    pd.DataFrame
+        DataFrame indexed by bar start time, with columns:
+        ["open", "high", "low", "close", "volume", "number_ticks",
+         "duration_minutes", "high_time", "low_time", ...custom metric columns]
+    """
+    extra_mode = _extra_mode(extra)
+    prices, volumes, timestamps_ns = _tick_arrays(df, col_price, col_volume, col_time)
+
+    if parallel and ewma_span is None:
+        bars, extra_columns, starts, ends = _build_speculative_bars(
+            _DOLLAR_IMBALANCE, prices, volumes, timestamps_ns, float(expected_imbalance), extra_mode
+        )
+    else:
+        bars, extra_columns, starts, ends = _build_dollar_imbalance_bars(
+            prices,
+            volumes,
+            timestamps_ns,
+            expected_imbalance,
+            _ewma_params(expected_imbalance, ewma_span, ewma_bounds),
+            extra_mode,
+        )
+
+    # Additional metrics computation
+    metrics = _compute_extra_columns(extra, extra_columns, bars[5], compact)
+    metrics.update(_compute_additional_metrics(additional_metrics, prices, volumes, starts, ends))
+
+    return _to_bar_frame(bars, metrics, compact, output)
+
+
+def dollar_imbalance_bar_boundaries(
+    df: pd.DataFrame,
+    expected_imbalance: float = 50_000_000,
+    col_price: str = "price",
+    col_volume: str = "volume",
+    ewma_span: int = None,
+    ewma_bounds: Tuple[float, float] = (0.1, 10.0),
+    parallel: bool = False,
+    col_time: str = "datetime",
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Locate the dollar imbalance bars in the ticks without building them.
+
+    Bar k holds the ticks `starts[k]:ends[k]` of `df`, the bars of `ticks_to_dollar_imbalance_bars`
+    called with the same parameters. Per-bar statistics can then be computed on views of the tick
+    arrays without materialising OHLCV.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        Tick DataFrame indexed by datetime, must include price and volume columns. A pyarrow
+        Table, a polars DataFrame or a `TickStore` are also accepted.
+    expected_imbalance : float, default=50_000_000
+        Signed notional imbalance threshold that triggers a new bar.
+    col_price : str, default="price"
+        Column name representing the price of each tick.
+    col_volume : str, default="volume"
+        Column name representing the volume of each tick.
+    ewma_span : int, optional
+        Span of the adaptive threshold, see `ticks_to_dollar_imbalance_bars`.
+    ewma_bounds : tuple of float, default=(0.1, 10.0)
+        Bounds of the adaptive threshold, as multiples of `expected_imbalance`.
+    parallel : bool, default=False
+        If True, the boundaries are searched speculatively on chunks of ticks with all the threads
+        available to numba, then reconciled by a short sequential pass. Same output.
+        Ignored with `ewma_span`, whose threshold carries over from one bar to the next.
+    col_time : str, default="datetime"
+        Name of the timestamp column for pyarrow and polars inputs.
+
+    Returns
+    -------
+    tuple of np.ndarray
+        int64 `starts` and `ends` offsets of the bars in the ticks.
+    """
+    prices, volumes, _ = _tick_arrays(df, col_price, col_volume, col_time)
+
+    if parallel and ewma_span is None:
+        return _parallel_bar_boundaries(
+            _DOLLAR_IMBALANCE, prices, volumes, float(expected_imbalance)
+        )
+    ewma = _ewma_params(expected_imbalance, ewma_span, ewma_bounds)
+    return _dollar_imbalance_bar_boundaries(prices, volumes, expected_imbalance, ewma)
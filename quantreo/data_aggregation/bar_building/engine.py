@@ -0,0 +1,747 @@
+import numpy as np
+import pandas as pd
+from numba import njit, prange, types, literal_unroll
+from numba.extending import is_jitted, overload
+from typing import Callable, Dict, List, Tuple
+
+
+def _timestamps_ns(index) -> np.ndarray:
+    """Return the tick timestamps as int64 nanoseconds, whatever the resolution of the index."""
+    return np.asarray(index, dtype="datetime64[ns]").view(np.int64)
+
+
+_OUTPUTS = ("pandas", "arrow", "polars", "numpy")
+
+
+def _import_output_backend(output: str):
+    package = "pyarrow" if output == "arrow" else output
+    try:
+        module = __import__(package)
+    except ImportError as e:
+        raise ImportError(
+            f"output='{output}' requires '{package}'. Install it with `pip install {package}`."
+        ) from e
+    return module
+
+
+def _column_to_numpy(column) -> np.ndarray:
+    # Arrow arrays and Polars series without nulls are exposed without any copy
+    if hasattr(column, "num_chunks"):
+        if column.num_chunks == 1:
+            return column.chunk(0).to_numpy(zero_copy_only=False)
+        return column.combine_chunks().to_numpy(zero_copy_only=False)
+    return column.to_numpy()
+
+
+def _tick_arrays(
+    df, col_price: str, col_volume: str, col_time: str = "datetime"
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Extract (prices, volumes, int64 nanosecond timestamps) from the tick table.
+
+    Pandas DataFrames are indexed by datetime. Arrow tables and Polars DataFrames have no index,
+    their timestamps are read from `col_time`. A `TickStore` or a `TickSlice` hands out its
+    memory-mapped columns. Float64 columns and nanosecond timestamps are returned without copy.
+    """
+    if hasattr(df, "_tick_columns"):
+        return df._tick_columns()
+
+    if isinstance(df, pd.DataFrame):
+        return (
+            df[col_price].to_numpy(np.float64),
+            df[col_volume].to_numpy(np.float64),
+            _timestamps_ns(df.index),
+        )
+
+    names = df.column_names if hasattr(df, "column_names") else df.columns
+    if col_time not in names:
+        raise ValueError(f"Missing required column: '{col_time}' in DataFrame.")
+    prices, volumes, times = (
+        _column_to_numpy(df[col]) for col in (col_price, col_volume, col_time)
+    )
+    return (
+        prices.astype(np.float64, copy=False),
+        volumes.astype(np.float64, copy=False),
+        _timestamps_ns(times),
+    )
+
+
+def _to_bar_frame(bars: tuple, metrics: dict = None, compact: bool = False, output: str = "pandas"):
+    """
+    Assemble the bar DataFrame from the columns returned by the bar kernels.
+
+    Parameters
+    ----------
+    bars : tuple of np.ndarray
+        (times, opens, highs, lows, closes, volumes, counts, durations, high_times, low_times), with
+        int64 nanosecond timestamps. `durations` is None for bars without a duration column.
+    metrics : dict, optional
+        Additional metric columns, appended after the base columns.
+    compact : bool, default=False
+        If True, prices, volumes and durations are stored as float32 and tick counts as int32.
+        Tick counts stay int64 by default, the dtype of the bars before this option existed.
+    output : str, default="pandas"
+        "pandas", "arrow", "polars" or "numpy". The kernel buffers are wrapped without copy.
+
+    Returns
+    -------
+    pd.DataFrame, pyarrow.Table, polars.DataFrame or dict of np.ndarray
+        Bars with their start time ("time"), timestamps kept exactly as datetime64[ns]. The pandas
+        DataFrame is indexed by "time", the other outputs have it as their first column.
+    """
+    if output not in _OUTPUTS:
+        raise ValueError(f"Invalid output '{output}'. Must be one of {list(_OUTPUTS)}.")
+
+    times, opens, highs, lows, closes, volumes, counts, durations, high_times, low_times = bars
+    float_dtype = np.float32 if compact else np.float64
+    int_dtype = np.int32 if compact else np.int64
+
+    data = {
+        "time": times.astype(np.int64, copy=False).view("datetime64[ns]"),
+        "open": opens.astype(float_dtype, copy=False),
+        "high": highs.astype(float_dtype, copy=False),
+        "low": lows.astype(float_dtype, copy=False),
+        "close": closes.astype(float_dtype, copy=False),
+        "volume": volumes.astype(float_dtype, copy=False),
+        "number_ticks": counts.astype(int_dtype, copy=False),
+    }
+    if durations is not None:
+        data["duration_minutes"] = durations.astype(float_dtype, copy=False)
+    data["high_time"] = high_times.astype(np.int64, copy=False).view("datetime64[ns]")
+    data["low_time"] = low_times.astype(np.int64, copy=False).view("datetime64[ns]")
+    if metrics:
+        data.update(metrics)
+
+    if output == "numpy":
+        return data
+    if output in ("arrow", "polars"):
+        table = _import_output_backend("arrow").table(data)
+        return table if output == "arrow" else _import_output_backend("polars").from_arrow(table)
+
+    index = pd.DatetimeIndex(data.pop("time"), name="time")
+    return pd.DataFrame(data, index=index)
+
+
+# Built-in columns of the `extra` parameter, accumulated by the bar kernels in the loop that builds
+# OHLCV. The kernels return them as a tuple of arrays in this order, with the notional of the bars
+# in place of the VWAP, which `_compute_extra_columns` divides by the bar volumes
+_EXTRA_COLUMNS = (
+    "vwap",
+    "buy_volume",
+    "sell_volume",
+    "signed_ticks",
+    "realized_var",
+    "first_time",
+    "last_time",
+)
+# Accumulated built-in columns: none, all but the realized variance (which costs a logarithm per
+# tick), all
+_EXTRA_NONE, _EXTRA_BASE, _EXTRA_ALL = range(3)
+
+
+def _extra_mode(extra: List[str]) -> int:
+    """
+    Check the requested built-in columns and return the columns the bar kernels must accumulate.
+    """
+    for name in extra:
+        if name not in _EXTRA_COLUMNS:
+            raise ValueError(
+                f"Invalid extra column '{name}'. Must be one of {list(_EXTRA_COLUMNS)}."
+            )
+    if "realized_var" in extra:
+        return _EXTRA_ALL
+    return _EXTRA_BASE if extra else _EXTRA_NONE
+
+
+@njit(nogil=True)
+def _empty_extra(n_bars, extra_mode):
+    # Columns that are not accumulated are left empty
+    n = n_bars if extra_mode != _EXTRA_NONE else 0
+    n_var = n_bars if extra_mode == _EXTRA_ALL else 0
+    return (
+        np.empty(n, dtype=np.float64),
+        np.empty(n, dtype=np.float64),
+        np.empty(n, dtype=np.float64),
+        np.empty(n, dtype=np.int64),
+        np.empty(n_var, dtype=np.float64),
+        np.empty(n, dtype=np.int64),
+        np.empty(n, dtype=np.int64),
+    )
+
+
+@njit(nogil=True)
+def _fill_bar(prices, volumes, timestamps_ns, start, end, bars, k):
+    bar_time, bar_open, bar_high, bar_low, bar_close, bar_volume = bars[:6]
+    bar_count, bar_duration, high_time, low_time = bars[6:]
+
+    high = prices[start]
+    low = prices[start]
+    high_idx = start
+    low_idx = start
+    volume = 0.0
+
+    for i in range(start, end):
+        price = prices[i]
+        if price > high:
+            high = price
+            high_idx = i
+        if price < low:
+            low = price
+            low_idx = i
+        volume += volumes[i]
+
+    bar_time[k] = timestamps_ns[start]
+    bar_open[k] = prices[start]
+    bar_high[k] = high
+    bar_low[k] = low
+    bar_close[k] = prices[end - 1]
+    bar_volume[k] = volume
+    bar_count[k] = end - start
+    bar_duration[k] = (timestamps_ns[end - 1] - timestamps_ns[start]) / 60_000_000_000
+    high_time[k] = timestamps_ns[high_idx]
+    low_time[k] = timestamps_ns[low_idx]
+
+
+@njit(nogil=True)
+def _fill_bar_extra(prices, volumes, timestamps_ns, start, end, bars, extra, k):
+    # `_fill_bar` accumulating the built-in columns in the same loop. It is kept apart so that the
+    # plain OHLCV loop stays as tight as before for bars without built-in columns
+    bar_time, bar_open, bar_high, bar_low, bar_close, bar_volume = bars[:6]
+    bar_count, bar_duration, high_time, low_time = bars[6:]
+    bar_notional, buy_volumes, sell_volumes, signed_ticks, realized_vars = extra[:5]
+    first_times, last_times = extra[5:]
+    with_realized_var = len(realized_vars) > 0
+
+    high = prices[start]
+    low = prices[start]
+    high_idx = start
+    low_idx = start
+    volume = 0.0
+    notional = 0.0
+    buy_volume = 0.0
+    sell_volume = 0.0
+    signed = 0
+    realized_var = 0.0
+    # Tick rule against the previous tick, which may belong to the previous bar
+    previous = prices[start - 1] if start > 0 else prices[start]
+
+    for i in range(start, end):
+        price = prices[i]
+        if price > high:
+            high = price
+            high_idx = i
+        if price < low:
+            low = price
+            low_idx = i
+        volume += volumes[i]
+
+        # Branchless tick rule, the sign of a price change being unpredictable
+        up = price > previous
+        down = price < previous
+        notional += price * volumes[i]
+        buy_volume += up * volumes[i]
+        sell_volume += down * volumes[i]
+        signed += up - down
+        if with_realized_var and i > start:
+            r = np.log(price / previous)
+            realized_var += r * r
+        previous = price
+
+    bar_time[k] = timestamps_ns[start]
+    bar_open[k] = prices[start]
+    bar_high[k] = high
+    bar_low[k] = low
+    bar_close[k] = prices[end - 1]
+    bar_volume[k] = volume
+    bar_count[k] = end - start
+    bar_duration[k] = (timestamps_ns[end - 1] - timestamps_ns[start]) / 60_000_000_000
+    high_time[k] = timestamps_ns[high_idx]
+    low_time[k] = timestamps_ns[low_idx]
+
+    bar_notional[k] = notional
+    buy_volumes[k] = buy_volume
+    sell_volumes[k] = sell_volume
+    signed_ticks[k] = signed
+    first_times[k] = timestamps_ns[start]
+    last_times[k] = timestamps_ns[end - 1]
+    if with_realized_var:
+        realized_vars[k] = realized_var
+
+
+@njit(nogil=True)
+def _empty_bars(n_bars):
+    return (
+        np.empty(n_bars, dtype=np.int64),
+        np.empty(n_bars, dtype=np.float64),
+        np.empty(n_bars, dtype=np.float64),
+        np.empty(n_bars, dtype=np.float64),
+        np.empty(n_bars, dtype=np.float64),
+        np.empty(n_bars, dtype=np.float64),
+        np.empty(n_bars, dtype=np.int64),
+        np.empty(n_bars, dtype=np.float64),
+        np.empty(n_bars, dtype=np.int64),
+        np.empty(n_bars, dtype=np.int64),
+    )
+
+
+@njit(nogil=True)
+def _fill_bars(prices, volumes, timestamps_ns, starts, ends, extra_mode):
+    # Returns (time, open, high, low, close, volume, count, duration, high_time, low_time) and the
+    # built-in columns (see `_empty_extra`)
+    bars = _empty_bars(len(starts))
+    extra = _empty_extra(len(starts), extra_mode)
+    if extra_mode == _EXTRA_NONE:
+        for k in range(len(starts)):
+            _fill_bar(prices, volumes, timestamps_ns, starts[k], ends[k], bars, k)
+    else:
+        for k in range(len(starts)):
+            _fill_bar_extra(prices, volumes, timestamps_ns, starts[k], ends[k], bars, extra, k)
+    return bars, extra
+
+
+@njit(nogil=True, parallel=True)
+def _fill_bars_parallel(prices, volumes, timestamps_ns, starts, ends, extra_mode):
+    # Bars only depend on their own tick range, so they are filled independently across threads
+    bars = _empty_bars(len(starts))
+    extra = _empty_extra(len(starts), extra_mode)
+    if extra_mode == _EXTRA_NONE:
+        for k in prange(len(starts)):
+            _fill_bar(prices, volumes, timestamps_ns, starts[k], ends[k], bars, k)
+    else:
+        for k in prange(len(starts)):
+            _fill_bar_extra(prices, volumes, timestamps_ns, starts[k], ends[k], bars, extra, k)
+    return bars, extra
+
+
+@njit(nogil=True)
+def _tick_sign(prices, i):
+    # Tick rule against the previous tick, 0 for the first tick
+    if i == 0 or prices[i] == prices[i - 1]:
+        return 0
+    return 1 if prices[i] > prices[i - 1] else -1
+
+
+@njit(nogil=True)
+def _squared_return(prices, i):
+    r = np.log(prices[i] / prices[i - 1])
+    return r * r
+
+
+@njit(nogil=True)
+def _fill_sliding_bars(prices, volumes, timestamps_ns, starts, ends, extra_mode):
+    # Overlapping bars whose starts and ends never decrease, filled in one pass over the ticks:
+    # monotonic deques hold the candidate extremes of the current window (the earliest one first
+    # on ties, as in `_fill_bar`) and the volume and built-in columns are running sums, so the cost
+    # does not depend on the overlap between bars. A bar that does not overlap the previous one
+    # restarts from empty deques and zero sums, so that it is identical to the one built by
+    # `_fill_bar`
+    bars = _empty_bars(len(starts))
+    bar_time, bar_open, bar_high, bar_low, bar_close, bar_volume = bars[:6]
+    bar_count, bar_duration, high_time, low_time = bars[6:]
+    extra = _empty_extra(len(starts), extra_mode)
+    bar_notional, buy_volumes, sell_volumes, signed_ticks, realized_vars = extra[:5]
+    first_times, last_times = extra[5:]
+    with_extra = extra_mode != _EXTRA_NONE
+    with_realized_var = extra_mode == _EXTRA_ALL
+
+    # The deques only hold ticks of the current window, so they are ring buffers of the size of
+    # the largest window, indexed by ever-increasing head and tail counters
+    size = 1
+    for k in range(len(starts)):
+        size = max(size, ends[k] - starts[k])
+    max_deque = np.empty(size, dtype=np.int64)
+    min_deque = np.empty(size, dtype=np.int64)
+    max_head, max_tail, min_head, min_tail = 0, 0, 0, 0
+    left = 0
+    right = 0
+    volume = 0.0
+    notional = 0.0
+    buy_volume = 0.0
+    sell_volume = 0.0
+    signed = 0
+    realized_var = 0.0
+
+    for k in range(len(starts)):
+        start = starts[k]
+        end = ends[k]
+
+        if start >= right:
+            max_head, max_tail, min_head, min_tail = 0, 0, 0, 0
+            left = start
+            right = start
+            volume = 0.0
+            notional = 0.0
+            buy_volume = 0.0
+            sell_volume = 0.0
+            signed = 0
+            realized_var = 0.0
+        while left < start:
+            volume -= volumes[left]
+            if with_extra:
+                notional -= prices[left] * volumes[left]
+                sign = _tick_sign(prices, left)
+                if sign > 0:
+                    buy_volume -= volumes[left]
+                elif sign < 0:
+                    sell_volume -= volumes[left]
+                signed -= sign
+            left += 1
+            # The return into the new first tick leaves the window
+            if with_realized_var:
+                realized_var -= _squared_return(prices, left)
+        while max_tail > max_head and max_deque[max_head % size] < left:
+            max_head += 1
+        while min_tail > min_head and min_deque[min_head % size] < left:
+            min_head += 1
+
+        while right < end:
+            while max_tail > max_head and prices[max_deque[(max_tail - 1) % size]] < prices[right]:
+                max_tail -= 1
+            max_deque[max_tail % size] = right
+            max_tail += 1
+            while min_tail > min_head and prices[min_deque[(min_tail - 1) % size]] > prices[right]:
+                min_tail -= 1
+            min_deque[min_tail % size] = right
+            min_tail += 1
+            volume += volumes[right]
+            if with_extra:
+                notional += prices[right] * volumes[right]
+                sign = _tick_sign(prices, right)
+                if sign > 0:
+                    buy_volume += volumes[right]
+                elif sign < 0:
+                    sell_volume += volumes[right]
+                signed += sign
+                if with_realized_var and right > left:
+                    realized_var += _squared_return(prices, right)
+            right += 1
+
+        high = max_deque[max_head % size]
+        low = min_deque[min_head % size]
+        bar_time[k] = timestamps_ns[start]
+        bar_open[k] = prices[start]
+        bar_high[k] = prices[high]
+        bar_low[k] = prices[low]
+        bar_close[k] = prices[end - 1]
+        bar_volume[k] = volume
+        bar_count[k] = end - start
+        bar_duration[k] = (timestamps_ns[end - 1] - timestamps_ns[start]) / 60_000_000_000
+        high_time[k] = timestamps_ns[high]
+        low_time[k] = timestamps_ns[low]
+
+        if with_extra:
+            bar_notional[k] = notional
+            buy_volumes[k] = buy_volume
+            sell_volumes[k] = sell_volume
+            signed_ticks[k] = signed
+            first_times[k] = timestamps_ns[start]
+            last_times[k] = timestamps_ns[end - 1]
+        if with_realized_var:
+            realized_vars[k] = realized_var
+
+    return bars, extra
+
+
+@njit(nogil=True)
+def _merge_bars(starts, ends, opens, highs, lows, closes, volumes, counts, high_times, low_times):
+    # Rows [starts[k], ends[k]) of finer bars are merged into the k-th coarser bar
+    n_bars = len(starts)
+
+    out_open = np.empty(n_bars, dtype=np.float64)
+    out_high = np.empty(n_bars, dtype=np.float64)
+    out_low = np.empty(n_bars, dtype=np.float64)
+    out_close = np.empty(n_bars, dtype=np.float64)
+    out_volume = np.empty(n_bars, dtype=np.float64)
+    out_count = np.empty(n_bars, dtype=np.int64)
+    out_high_time = np.empty(n_bars, dtype=np.int64)
+    out_low_time = np.empty(n_bars, dtype=np.int64)
+
+    for k in range(n_bars):
+        start = starts[k]
+        end = ends[k]
+
+        high = highs[start]
+        low = lows[start]
+        high_time = high_times[start]
+        low_time = low_times[start]
+        volume = 0.0
+        count = 0
+
+        for i in range(start, end):
+            # Strict comparisons keep the earliest extreme, as the tick-level kernels do
+            if highs[i] > high:
+                high = highs[i]
+                high_time = high_times[i]
+            if lows[i] < low:
+                low = lows[i]
+                low_time = low_times[i]
+            volume += volumes[i]
+            count += counts[i]
+
+        out_open[k] = opens[start]
+        out_high[k] = high
+        out_low[k] = low
+        out_close[k] = closes[end - 1]
+        out_volume[k] = volume
+        out_count[k] = count
+        out_high_time[k] = high_time
+        out_low_time[k] = low_time
+
+    return (
+        out_open,
+        out_high,
+        out_low,
+        out_close,
+        out_volume,
+        out_count,
+        out_high_time,
+        out_low_time,
+    )
+
+
+@njit(nogil=True)
+def _merge_extra(starts, ends, opens, closes, extra, extra_mode):
+    # Rows [starts[k], ends[k]) of the built-in columns of finer bars, covering consecutive ticks,
+    # merged into the k-th coarser bar. The returns between two finer bars are part of the realized
+    # variance of the coarser one
+    notionals, buy_volumes, sell_volumes, signed_ticks, realized_vars = extra[:5]
+    first_times, last_times = extra[5:]
+    out = _empty_extra(len(starts), extra_mode)
+    out_notional, out_buy, out_sell, out_signed, out_realized_var = out[:5]
+    out_first_time, out_last_time = out[5:]
+    if extra_mode == _EXTRA_NONE:
+        return out
+
+    for k in range(len(starts)):
+        start = starts[k]
+        end = ends[k]
+
+        notional = 0.0
+        buy_volume = 0.0
+        sell_volume = 0.0
+        signed = 0
+        realized_var = 0.0
+        for j in range(start, end):
+            notional += notionals[j]
+            buy_volume += buy_volumes[j]
+            sell_volume += sell_volumes[j]
+            signed += signed_ticks[j]
+            if extra_mode == _EXTRA_ALL:
+                realized_var += realized_vars[j]
+                if j > start:
+                    r = np.log(opens[j] / closes[j - 1])
+                    realized_var += r * r
+
+        out_notional[k] = notional
+        out_buy[k] = buy_volume
+        out_sell[k] = sell_volume
+        out_signed[k] = signed
+        out_first_time[k] = first_times[start]
+        out_last_time[k] = last_times[end - 1]
+        if extra_mode == _EXTRA_ALL:
+            out_realized_var[k] = realized_var
+
+    return out
+
+
+def _compute_extra_columns(
+    extra: List[str],
+    extra_columns: tuple,
+    bar_volumes: np.ndarray,
+    compact: bool = False,
+) -> Dict[str, np.ndarray]:
+    """
+    Assemble the requested built-in columns from the ones accumulated by the bar kernels.
+
+    Parameters
+    ----------
+    extra : list of str
+        Names among "vwap", "buy_volume", "sell_volume", "signed_ticks", "realized_var",
+        "first_time" and "last_time", checked by `_extra_mode`.
+    extra_columns : tuple of np.ndarray
+        Built-in columns returned by the kernels, in the order of `_EXTRA_COLUMNS`, with the
+        notional of the bars in place of the VWAP.
+    bar_volumes : np.ndarray
+        Volume of each bar.
+    compact : bool, default=False
+        If True, the float columns are returned as float32 and 'signed_ticks' as int32.
+
+    Returns
+    -------
+    dict
+        Column name -> values for each bar, in the order of `extra`.
+    """
+    float_dtype = np.float32 if compact else np.float64
+    int_dtype = np.int32 if compact else np.int64
+
+    data = {}
+    for name in extra:
+        values = extra_columns[_EXTRA_COLUMNS.index(name)]
+        if name in ("first_time", "last_time"):
+            data[name] = values.view("datetime64[ns]")
+        elif name == "signed_ticks":
+            data[name] = values.astype(int_dtype, copy=False)
+        elif name == "vwap":
+            with np.errstate(divide="ignore", invalid="ignore"):
+                vwap = np.where(bar_volumes > 0, values / bar_volumes, np.nan)
+            data[name] = vwap.astype(float_dtype, copy=False)
+        else:
+            data[name] = values.astype(float_dtype, copy=False)
+    return data
+
+
+def _ewma_params(expected_imbalance: float, ewma_span, ewma_bounds) -> Tuple[float, float, float]:
+    """
+    Parameters of the adaptive imbalance threshold: (alpha, lower bound, upper bound).
+
+    An alpha of 0.0 keeps the threshold fixed at `expected_imbalance`.
+    """
+    if ewma_span is None:
+        return 0.0, float(expected_imbalance), float(expected_imbalance)
+    if ewma_span < 1:
+        raise ValueError("ewma_span must be greater than or equal to 1.")
+
+    low, high = ewma_bounds
+    if not 0 < low <= 1 <= high:
+        raise ValueError("ewma_bounds must satisfy 0 < lower <= 1 <= upper.")
+    return 2.0 / (ewma_span + 1.0), low * expected_imbalance, high * expected_imbalance
+
+
+@njit(nogil=True)
+def _ewma_threshold(ewma_ticks, ewma_imbalance, ewma):
+    # E[T] * |E[b]|, kept within the bounds so that the bars can neither collapse nor explode
+    return min(max(ewma_ticks * abs(ewma_imbalance), ewma[1]), ewma[2])
+
+
+@njit(nogil=True)
+def _update_imbalance_ewma(ewma_ticks, ewma_imbalance, n_ticks, imbalance, ewma):
+    # EWMAs of the bar length and of the signed imbalance per tick, seeded by the first bar
+    alpha = ewma[0]
+    mean_imbalance = imbalance / n_ticks
+    if ewma_ticks == 0.0:
+        ewma_ticks = float(n_ticks)
+        ewma_imbalance = mean_imbalance
+    else:
+        ewma_ticks += alpha * (n_ticks - ewma_ticks)
+        ewma_imbalance += alpha * (mean_imbalance - ewma_imbalance)
+    return ewma_ticks, ewma_imbalance, _ewma_threshold(ewma_ticks, ewma_imbalance, ewma)
+
+
+def _store_result(out, i, res):
+    pass
+
+
+@overload(_store_result)
+def _store_result_impl(out, i, res):
+    if isinstance(res, types.BaseTuple):
+
+        def impl(out, i, res):
+            j = 0
+            for value in literal_unroll(res):
+                out[i, j] = value
+                j += 1
+
+        return impl
+
+    def impl(out, i, res):
+        out[i, 0] = res
+
+    return impl
+
+
+@njit(nogil=True)
+def _segmented_metric_1(func, x, starts, ends, out):
+    for i in range(len(starts)):
+        _store_result(out, i, func(x[starts[i] : ends[i]]))
+
+
+@njit(nogil=True)
+def _segmented_metric_2(func, x, y, starts, ends, out):
+    for i in range(len(starts)):
+        _store_result(out, i, func(x[starts[i] : ends[i]], y[starts[i] : ends[i]]))
+
+
+def _is_float(value) -> bool:
+    return isinstance(value, (float, np.floating))
+
+
+def _compute_additional_metrics(
+    additional_metrics: List[Tuple[Callable, str, List[str]]],
+    prices: np.ndarray,
+    volumes: np.ndarray,
+    starts: np.ndarray,
+    ends: np.ndarray,
+) -> Dict[str, object]:
+    """
+    Apply the user metrics to every bar defined by the (start, end) tick offsets.
+
+    Numba-compiled metrics returning floats (such as the ones of `bar_metrics`) are dispatched from
+    a single compiled loop over all bars writing into a preallocated array. Any other callable is
+    applied bar by bar from Python.
+
+    Parameters
+    ----------
+    additional_metrics : list of tuples (function, source, col_names)
+        - function : callable applied to price, volume, or both slices
+        - source   : one of "price", "volume", or "price_volume"
+        - col_names: list of column names corresponding to the outputs
+    prices : np.ndarray
+        Tick prices.
+    volumes : np.ndarray
+        Tick volumes.
+    starts : np.ndarray
+        First tick offset of each bar.
+    ends : np.ndarray
+        Offset following the last tick of each bar.
+
+    Returns
+    -------
+    dict
+        Column name -> values for each bar.
+    """
+    data = {}
+
+    for func, source, col_names in additional_metrics:
+        if source == "price":
+            inputs = (prices,)
+        elif source == "volume":
+            inputs = (volumes,)
+        elif source == "price_volume":
+            inputs = (prices, volumes)
+        else:
+            raise ValueError(
+                f"Invalid source '{source}'. Must be 'price', 'volume', or 'price_volume'."
+            )
+
+        if len(starts) == 0:
+            for name in col_names:
+                data[name] = np.empty(0, dtype=np.float64)
+            continue
+
+        # The first bar tells whether the metric returns a float or a tuple of floats
+        first = func(*(x[starts[0] : ends[0]] for x in inputs))
+        values = first if isinstance(first, tuple) else (first,)
+
+        if is_jitted(func) and all(_is_float(value) for value in values):
+            out = np.empty((len(starts), len(values)), dtype=np.float64)
+            if len(inputs) == 1:
+                _segmented_metric_1(func, inputs[0], starts, ends, out)
+            else:
+                _segmented_metric_2(func, inputs[0], inputs[1], starts, ends, out)
+
+            if isinstance(first, tuple):
+                for i, name in enumerate(col_names):
+                    data[name] = out[:, i]
+            else:
+                data[col_names[0]] = out[:, 0]
+            continue
+
+        outputs = [func(*(x[start:end] for x in inputs)) for start, end in zip(starts, ends)]
+
+        if isinstance(first, tuple):
+            for i, name in enumerate(col_names):
+                data[name] = [out[i] for out in outputs]
+        else:
+            data[col_names[0]] = outputs
+
+    return data
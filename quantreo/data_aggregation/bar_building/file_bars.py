@@ -0,0 +1,177 @@
+import os
+import pandas as pd
+from typing import Callable, Iterator, List, Tuple
+
+from .streaming import (
+    TickBarBuilder,
+    VolumeBarBuilder,
+    TimeBarBuilder,
+    TickImbalanceBarBuilder,
+    VolumeImbalanceBarBuilder,
+    DollarBarBuilder,
+    DollarImbalanceBarBuilder,
+    TickRunBarBuilder,
+    VolumeRunBarBuilder,
+)
+
+_BUILDERS = {
+    "tick": TickBarBuilder,
+    "volume": VolumeBarBuilder,
+    "time": TimeBarBuilder,
+    "tick_imbalance": TickImbalanceBarBuilder,
+    "volume_imbalance": VolumeImbalanceBarBuilder,
+    "dollar": DollarBarBuilder,
+    "dollar_imbalance": DollarImbalanceBarBuilder,
+    "tick_run": TickRunBarBuilder,
+    "volume_run": VolumeRunBarBuilder,
+}
+
+
+def _file_format(path: str) -> str:
+    ext = os.path.splitext(str(path))[1].lower()
+    if ext in (".csv", ".txt"):
+        return "csv"
+    if ext in (".parquet", ".pq"):
+        return "parquet"
+    raise ValueError(f"Unsupported file extension '{ext}'. Must be '.csv' or '.parquet'.")
+
+
+def _import_pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError as e:
+        raise ImportError(
+            "Reading or writing Parquet files requires 'pyarrow'. Install it with `pip install pyarrow`."
+        ) from e
+    return pyarrow
+
+
+def _parse_times(times: pd.Series) -> pd.DatetimeIndex:
+    # Timestamps with an offset are converted to naive UTC, like the times of the bars
+    return pd.DatetimeIndex(pd.to_datetime(times, utc=True).dt.tz_convert(None)).astype(
+        "datetime64[ns]"
+    )
+
+
+def _iter_tick_chunks(
+    path: str, chunk_size: int, col_time: str, col_price: str, col_volume: str
+) -> Iterator[pd.DataFrame]:
+    columns = [col_time, col_price, col_volume]
+
+    if _file_format(path) == "csv":
+        reader = pd.read_csv(path, usecols=columns, chunksize=chunk_size)
+        for chunk in reader:
+            yield chunk
+    else:
+        pa = _import_pyarrow()
+        parquet_file = pa.parquet.ParquetFile(path)
+        for batch in parquet_file.iter_batches(batch_size=chunk_size, columns=columns):
+            yield batch.to_pandas()
+
+
+def ticks_file_to_bars(
+    input_path: str,
+    output_path: str,
+    bar_type: str = "volume",
+    chunk_size: int = 1_000_000,
+    col_time: str = "datetime",
+    col_price: str = "price",
+    col_volume: str = "volume",
+    additional_metrics: List[Tuple[Callable, str, List[str]]] = [],
+    include_partial: bool = False,
+    **bar_params,
+) -> int:
+    """
+    Build bars from a tick file too large for memory and write them incrementally to disk.
+
+    The tick file is read `chunk_size` rows at a time (CSV chunks or Parquet record batches, in
+    file order) and each chunk is fed to the streaming builder of the requested bar type. The
+    open bar is carried from one chunk to the next, so bar boundaries are exactly the ones the
+    in-memory `ticks_to_*_bars` functions would produce. Peak memory is driven by `chunk_size`.
+    Parquet input or output requires the optional dependency `pyarrow`.
+
+    Parameters
+    ----------
+    input_path : str
+        Path to the tick file (".csv" or ".parquet"), sorted by time.
+    output_path : str
+        Path of the bar file to create (".csv" or ".parquet"). An existing file is overwritten.
+    bar_type : str, default="volume"
+        One of "tick", "volume", "time", "tick_imbalance", "volume_imbalance", "dollar",
+        "dollar_imbalance", "tick_run" or "volume_run".
+    chunk_size : int, default=1_000_000
+        Number of ticks loaded in memory at once.
+    col_time : str, default="datetime"
+        Name of the column containing tick timestamps. Timestamps carrying a UTC offset are
+        converted to naive UTC times.
+    col_price : str, default="price"
+        Name of the column containing tick prices.
+    col_volume : str, default="volume"
+        Name of the column containing tick volumes.
+    additional_metrics : List of tuples (function, source, col_names)
+        Same format as in the `ticks_to_*_bars` functions.
+    include_partial : bool, default=False
+        If True, the trailing partial bar is also written (time bars always write their last period,
+        like `ticks_to_time_bars`).
+    **bar_params
+        Parameters of the bar type, e.g. `volume_per_bar=1_000_000`, `tick_per_bar=1000`,
+        `resample_factor="5min"`, `dollar_per_bar=100_000_000` or `expected_imbalance=100`.
+
+    Returns
+    -------
+    int
+        Number of bars written to `output_path`.
+    """
+    if bar_type not in _BUILDERS:
+        raise ValueError(f"Invalid bar_type '{bar_type}'. Must be one of {list(_BUILDERS)}.")
+    if chunk_size <= 0:
+        raise ValueError("chunk_size must be strictly positive.")
+
+    output_format = _file_format(output_path)
+    builder = _BUILDERS[bar_type](
+        col_price=col_price,
+        col_volume=col_volume,
+        additional_metrics=additional_metrics,
+        **bar_params,
+    )
+
+    if output_format == "parquet":
+        pa = _import_pyarrow()
+    if os.path.exists(output_path):
+        os.remove(output_path)
+
+    writer = None
+    n_bars = 0
+
+    def write(bars: pd.DataFrame, force: bool = False):
+        nonlocal writer, n_bars
+        if bars.empty and not force:
+            return
+        n_bars += len(bars)
+
+        if output_format == "csv":
+            bars.to_csv(output_path, mode="a", header=not os.path.exists(output_path))
+        else:
+            table = pa.Table.from_pandas(bars)
+            if writer is None:
+                writer = pa.parquet.ParquetWriter(output_path, table.schema)
+            writer.write_table(table)
+
+    try:
+        for chunk in _iter_tick_chunks(input_path, chunk_size, col_time, col_price, col_volume):
+            chunk.index = _parse_times(chunk.pop(col_time))
+            write(builder.update(chunk))
+
+        last = builder.flush()
+        if bar_type == "time" or include_partial:
+            write(last)
+
+        # Always leave a readable file, even when no bar was closed
+        if n_bars == 0:
+            write(last.iloc[:0], force=True)
+    finally:
+        if writer is not None:
+            writer.close()
+
+    return n_bars
@@ -0,0 +1,267 @@
+import numpy as np
+from numba import get_num_threads, njit, prange
+
+from .engine import _fill_bars_parallel
+
+# Bar types supported by the speculative scan. Their state is fully reset when a bar closes, which
+# is what makes a guessed chunk start converge to the true bar boundaries
+_VOLUME = 0
+_DOLLAR = 1
+_TICK_IMBALANCE = 2
+_VOLUME_IMBALANCE = 3
+_DOLLAR_IMBALANCE = 4
+_TICK_RUN = 5
+_VOLUME_RUN = 6
+
+# Outcome of a tick: skipped before a bar opens, added to the open bar, or closing the bar
+_SKIPPED = -1
+_ADDED = 0
+_CLOSED = 1
+
+
+@njit(nogil=True)
+def _tick_sign(prices, i):
+    delta = prices[i] - prices[i - 1]
+    if delta > 0:
+        return 1
+    if delta < 0:
+        return -1
+    return 0
+
+
+@njit(nogil=True)
+def _step(mode, prices, volumes, i, threshold, state, is_open):
+    # Mirrors, tick by tick, the closing rule of the sequential `_*_bar_scan` kernels
+    if mode == _VOLUME or mode == _DOLLAR:
+        state[0] += volumes[i] if mode == _VOLUME else prices[i] * volumes[i]
+        if state[0] >= threshold:
+            state[0] = 0.0
+            return _CLOSED
+        return _ADDED
+
+    # The tick rule needs the previous price, so the first tick never belongs to a bar
+    if i == 0:
+        return _SKIPPED
+    sign = _tick_sign(prices, i)
+
+    if mode == _TICK_IMBALANCE:
+        if sign == 0:
+            return _ADDED if is_open else _SKIPPED
+        state[0] += sign
+        if abs(state[0]) > threshold:
+            state[0] = 0.0
+            return _CLOSED
+        return _ADDED
+
+    if sign == 0:
+        return _ADDED
+
+    if mode == _VOLUME_IMBALANCE or mode == _DOLLAR_IMBALANCE:
+        if mode == _VOLUME_IMBALANCE:
+            state[0] += sign * volumes[i]
+        else:
+            state[0] += sign * prices[i] * volumes[i]
+        if abs(state[0]) >= threshold:
+            state[0] = 0.0
+            return _CLOSED
+        return _ADDED
+
+    size = 1.0 if mode == _TICK_RUN else volumes[i]
+    if sign > 0:
+        state[0] += size
+    else:
+        state[1] += size
+    if max(state[0], state[1]) >= threshold:
+        state[0] = 0.0
+        state[1] = 0.0
+        return _CLOSED
+    return _ADDED
+
+
+@njit(nogil=True)
+def _scan_chunk(
+    mode, prices, volumes, threshold, lo, hi, state, cursor, sync_ends, record, starts, ends
+):
+    # Scan ticks [lo, hi) from the given state. `cursor` holds (bar open flag, bar start).
+    # When `sync_ends` is not empty, the scan stops on the first bar closing on one of them and
+    # returns its position + 1 in `sync_ends`, otherwise it returns -1
+    n_bars = 0
+    p = 0
+
+    for i in range(lo, hi):
+        outcome = _step(mode, prices, volumes, i, threshold, state, cursor[0] == 1)
+        if outcome == _SKIPPED:
+            continue
+        if cursor[0] == 0:
+            cursor[0] = 1
+            cursor[1] = i
+        if outcome == _CLOSED:
+            if record:
+                starts[n_bars] = cursor[1]
+                ends[n_bars] = i + 1
+            n_bars += 1
+            cursor[0] = 0
+
+            # Once the true scan closes a bar where the speculative one did, both states are reset
+            # at the same tick and every later speculative bar is exact
+            while p < len(sync_ends) and sync_ends[p] < i + 1:
+                p += 1
+            if p < len(sync_ends) and sync_ends[p] == i + 1:
+                return n_bars, p + 1
+
+    return n_bars, -1
+
+
+@njit(nogil=True, parallel=True)
+def _speculative_bar_boundaries(mode, prices, volumes, threshold, n_chunks):
+    """
+    Bar boundaries of a reset-on-close bar type, computed on chunks of ticks in parallel.
+
+    Every chunk is first scanned speculatively as if a bar opened on its first tick. A sequential
+    fix-up then replays each chunk from the true state left by the previous chunk until it closes
+    a bar on a boundary also found by the speculative scan; from there on the speculative bars are
+    kept as is. The boundaries are identical to the ones of the sequential kernels.
+    """
+    n = len(prices)
+    n_chunks = max(min(n_chunks, n), 1)
+    chunk_size = (n + n_chunks - 1) // n_chunks
+    no_sync = np.empty(0, dtype=np.int64)
+
+    # 1. Speculative scans, counted then recorded
+    states = np.zeros((n_chunks, 2), dtype=np.float64)
+    cursors = np.zeros((n_chunks, 2), dtype=np.int64)
+    spec_counts = np.zeros(n_chunks, dtype=np.int64)
+    for c in prange(n_chunks):
+        lo = c * chunk_size
+        hi = min(lo + chunk_size, n)
+        spec_counts[c], _ = _scan_chunk(
+            mode,
+            prices,
+            volumes,
+            threshold,
+            lo,
+            hi,
+            states[c],
+            cursors[c],
+            no_sync,
+            False,
+            no_sync,
+            no_sync,
+        )
+
+    spec_offsets = np.zeros(n_chunks + 1, dtype=np.int64)
+    spec_offsets[1:] = np.cumsum(spec_counts)
+    spec_starts = np.empty(spec_offsets[-1], dtype=np.int64)
+    spec_ends = np.empty(spec_offsets[-1], dtype=np.int64)
+    for c in prange(n_chunks):
+        lo = c * chunk_size
+        hi = min(lo + chunk_size, n)
+        state = np.zeros(2, dtype=np.float64)
+        cursor = np.zeros(2, dtype=np.int64)
+        rows = slice(spec_offsets[c], spec_offsets[c + 1])
+        _scan_chunk(
+            mode,
+            prices,
+            volumes,
+            threshold,
+            lo,
+            hi,
+            state,
+            cursor,
+            no_sync,
+            True,
+            spec_starts[rows],
+            spec_ends[rows],
+        )
+
+    # 2. Sequential fix-up, carrying the true state from one chunk to the next
+    fix_counts = np.zeros(n_chunks, dtype=np.int64)
+    keep_from = np.zeros(n_chunks, dtype=np.int64)
+    entry_states = np.zeros((n_chunks, 2), dtype=np.float64)
+    entry_cursors = np.zeros((n_chunks, 2), dtype=np.int64)
+    state = states[0].copy()
+    cursor = cursors[0].copy()
+    for c in range(1, n_chunks):
+        lo = c * chunk_size
+        hi = min(lo + chunk_size, n)
+        chunk_ends = spec_ends[spec_offsets[c] : spec_offsets[c + 1]]
+
+        # No bar open on the chunk boundary: the speculative start was the true one
+        if cursor[0] == 0:
+            state = states[c].copy()
+            cursor = cursors[c].copy()
+            continue
+
+        entry_states[c] = state
+        entry_cursors[c] = cursor
+        fix_counts[c], sync = _scan_chunk(
+            mode,
+            prices,
+            volumes,
+            threshold,
+            lo,
+            hi,
+            state,
+            cursor,
+            chunk_ends,
+            False,
+            no_sync,
+            no_sync,
+        )
+        if sync >= 0:
+            keep_from[c] = sync
+            state = states[c].copy()
+            cursor = cursors[c].copy()
+        else:
+            keep_from[c] = len(chunk_ends)
+
+    # 3. Assemble the fixed-up bars followed by the speculative bars kept in every chunk
+    counts = fix_counts + spec_counts - keep_from
+    offsets = np.zeros(n_chunks + 1, dtype=np.int64)
+    offsets[1:] = np.cumsum(counts)
+    starts = np.empty(offsets[-1], dtype=np.int64)
+    ends = np.empty(offsets[-1], dtype=np.int64)
+    for c in prange(n_chunks):
+        lo = c * chunk_size
+        hi = min(lo + chunk_size, n)
+        row = offsets[c]
+        if fix_counts[c] > 0:
+            state = entry_states[c].copy()
+            cursor = entry_cursors[c].copy()
+            rows = slice(row, row + fix_counts[c])
+            _scan_chunk(
+                mode,
+                prices,
+                volumes,
+                threshold,
+                lo,
+                hi,
+                state,
+                cursor,
+                spec_ends[spec_offsets[c] : spec_offsets[c + 1]],
+                True,
+                starts[rows],
+                ends[rows],
+            )
+            row += fix_counts[c]
+
+        first = spec_offsets[c] + keep_from[c]
+        last = spec_offsets[c + 1]
+        starts[row : row + last - first] = spec_starts[first:last]
+        ends[row : row + last - first] = spec_ends[first:last]
+
+    return starts, ends
+
+
+@njit(nogil=True)
+def _parallel_bar_boundaries(mode, prices, volumes, threshold):
+    # One chunk per thread, unless the chunks would be too short to be worth a fix-up
+    n_chunks = max(min(get_num_threads(), len(prices) // 1024), 1)
+    return _speculative_bar_boundaries(mode, prices, volumes, threshold, n_chunks)
+
+
+@njit(nogil=True)
+def _build_speculative_bars(mode, prices, volumes, timestamps_ns, threshold, extra_mode):
+    starts, ends = _parallel_bar_boundaries(mode, prices, volumes, threshold)
+    bars, extra = _fill_bars_parallel(prices, volumes, timestamps_ns, starts, ends, extra_mode)
+    return bars, extra, starts, ends
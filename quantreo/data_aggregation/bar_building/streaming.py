@@ -0,0 +1,883 @@
+import pandas as pd
+import numpy as np
+from numba import njit
+from typing import Callable, List, Tuple
+
+from .engine import (
+    _EXTRA_ALL,
+    _EXTRA_NONE,
+    _compute_additional_metrics,
+    _compute_extra_columns,
+    _ewma_params,
+    _extra_mode,
+    _ewma_threshold,
+    _timestamps_ns,
+    _to_bar_frame,
+    _update_imbalance_ewma,
+)
+
+_TICK = 0
+_VOLUME = 1
+_TICK_IMBALANCE = 2
+_VOLUME_IMBALANCE = 3
+_DOLLAR = 4
+_DOLLAR_IMBALANCE = 5
+_TICK_RUN = 6
+_VOLUME_RUN = 7
+
+# Float state: open, high, low, close, volume, cumulative criterion (buy side for run bars),
+# previous price, EWMAs of the bar length and of the imbalance per tick (adaptive imbalance
+# thresholds), cumulative sell side (run bars), then the notional, buy volume, sell volume and
+# realized variance of the built-in columns
+(
+    _F_OPEN,
+    _F_HIGH,
+    _F_LOW,
+    _F_CLOSE,
+    _F_VOLUME,
+    _F_CUM,
+    _F_PREV,
+    _F_EWMA_T,
+    _F_EWMA_B,
+    _F_CUM_SELL,
+    _F_NOTIONAL,
+    _F_BUY,
+    _F_SELL,
+    _F_REALIZED_VAR,
+) = range(14)
+# Integer state: start time, last time, high time, low time, tick count, bar open flag,
+# previous price available flag, current time bin, signed ticks of the built-in columns
+(
+    _I_START,
+    _I_LAST,
+    _I_HIGH_T,
+    _I_LOW_T,
+    _I_COUNT,
+    _I_OPEN,
+    _I_HAS_PREV,
+    _I_BIN,
+    _I_SIGNED,
+) = range(9)
+
+
+@njit(nogil=True)
+def _previous_price(fstate, istate, price):
+    # Every tick is signed with the tick rule against the previous one (itself for the first tick
+    # of the stream), for the imbalance and run criteria and the built-in columns
+    previous = fstate[_F_PREV] if istate[_I_HAS_PREV] == 1 else price
+    fstate[_F_PREV] = price
+    istate[_I_HAS_PREV] = 1
+    return previous
+
+
+@njit(nogil=True)
+def _add_tick(fstate, istate, price, volume, ts, previous, extra_mode):
+    if istate[_I_OPEN] == 0:
+        fstate[_F_OPEN] = price
+        fstate[_F_HIGH] = price
+        fstate[_F_LOW] = price
+        fstate[_F_VOLUME] = 0.0
+        fstate[_F_CUM] = 0.0
+        fstate[_F_CUM_SELL] = 0.0
+        fstate[_F_NOTIONAL] = 0.0
+        fstate[_F_BUY] = 0.0
+        fstate[_F_SELL] = 0.0
+        fstate[_F_REALIZED_VAR] = 0.0
+        istate[_I_START] = ts
+        istate[_I_HIGH_T] = ts
+        istate[_I_LOW_T] = ts
+        istate[_I_COUNT] = 0
+        istate[_I_SIGNED] = 0
+        istate[_I_OPEN] = 1
+
+    # Same accumulation as `_fill_bar_extra`, so that streamed bars match the batch ones exactly
+    if extra_mode != _EXTRA_NONE:
+        fstate[_F_NOTIONAL] += price * volume
+        if price > previous:
+            fstate[_F_BUY] += volume
+            istate[_I_SIGNED] += 1
+        elif price < previous:
+            fstate[_F_SELL] += volume
+            istate[_I_SIGNED] -= 1
+        if extra_mode == _EXTRA_ALL and istate[_I_COUNT] > 0:
+            r = np.log(price / previous)
+            fstate[_F_REALIZED_VAR] += r * r
+
+    if price > fstate[_F_HIGH]:
+        fstate[_F_HIGH] = price
+        istate[_I_HIGH_T] = ts
+    if price < fstate[_F_LOW]:
+        fstate[_F_LOW] = price
+        istate[_I_LOW_T] = ts
+
+    fstate[_F_CLOSE] = price
+    fstate[_F_VOLUME] += volume
+    istate[_I_COUNT] += 1
+    istate[_I_LAST] = ts
+
+
+@njit(nogil=True)
+def _write_open_bar(fstate, istate, bars_f, bars_i, row):
+    # Float columns: open, high, low, close, volume, duration, notional, buy volume, sell volume,
+    # realized variance. Integer columns: start time, tick count, high time, low time, first and
+    # end tick offsets (written by the scans), signed ticks, last time
+    bars_f[row, 0] = fstate[_F_OPEN]
+    bars_f[row, 1] = fstate[_F_HIGH]
+    bars_f[row, 2] = fstate[_F_LOW]
+    bars_f[row, 3] = fstate[_F_CLOSE]
+    bars_f[row, 4] = fstate[_F_VOLUME]
+    bars_f[row, 5] = (istate[_I_LAST] - istate[_I_START]) / 60_000_000_000
+    bars_f[row, 6] = fstate[_F_NOTIONAL]
+    bars_f[row, 7] = fstate[_F_BUY]
+    bars_f[row, 8] = fstate[_F_SELL]
+    bars_f[row, 9] = fstate[_F_REALIZED_VAR]
+    bars_i[row, 0] = istate[_I_START]
+    bars_i[row, 1] = istate[_I_COUNT]
+    bars_i[row, 2] = istate[_I_HIGH_T]
+    bars_i[row, 3] = istate[_I_LOW_T]
+    bars_i[row, 6] = istate[_I_SIGNED]
+    bars_i[row, 7] = istate[_I_LAST]
+
+
+@njit(nogil=True)
+def _stream_threshold_scan(
+    prices,
+    volumes,
+    timestamps_ns,
+    mode,
+    threshold,
+    ewma,
+    extra_mode,
+    fstate,
+    istate,
+    record,
+    bars_f,
+    bars_i,
+):
+    n_bars = 0
+    if ewma[0] > 0.0 and fstate[_F_EWMA_T] > 0.0:
+        threshold = _ewma_threshold(fstate[_F_EWMA_T], fstate[_F_EWMA_B], ewma)
+
+    # -1 flags a bar that was opened in a previous chunk
+    start = -1
+
+    for i in range(len(prices)):
+        price = prices[i]
+        first_tick = istate[_I_HAS_PREV] == 0
+        previous = _previous_price(fstate, istate, price)
+        sign = 0
+        if price > previous:
+            sign = 1
+        elif price < previous:
+            sign = -1
+
+        # Imbalance and run bars start from the second tick of the stream
+        if mode != _TICK and mode != _VOLUME and mode != _DOLLAR:
+            if first_tick:
+                continue
+
+            # Tick imbalance bars only open on a signed tick
+            if mode == _TICK_IMBALANCE and sign == 0 and istate[_I_OPEN] == 0:
+                continue
+
+        if istate[_I_OPEN] == 0:
+            start = i
+        _add_tick(fstate, istate, price, volumes[i], timestamps_ns[i], previous, extra_mode)
+
+        if mode == _TICK:
+            closed = istate[_I_COUNT] >= threshold
+        elif mode == _VOLUME:
+            fstate[_F_CUM] += volumes[i]
+            closed = fstate[_F_CUM] >= threshold
+        elif mode == _DOLLAR:
+            fstate[_F_CUM] += price * volumes[i]
+            closed = fstate[_F_CUM] >= threshold
+        elif mode == _TICK_IMBALANCE:
+            fstate[_F_CUM] += sign
+            closed = sign != 0 and abs(fstate[_F_CUM]) > threshold
+        elif mode == _VOLUME_IMBALANCE:
+            fstate[_F_CUM] += sign * volumes[i]
+            closed = sign != 0 and abs(fstate[_F_CUM]) >= threshold
+        elif mode == _DOLLAR_IMBALANCE:
+            fstate[_F_CUM] += sign * price * volumes[i]
+            closed = sign != 0 and abs(fstate[_F_CUM]) >= threshold
+        else:
+            size = 1.0 if mode == _TICK_RUN else volumes[i]
+            if sign > 0:
+                fstate[_F_CUM] += size
+            elif sign < 0:
+                fstate[_F_CUM_SELL] += size
+            closed = sign != 0 and max(fstate[_F_CUM], fstate[_F_CUM_SELL]) >= threshold
+
+        if closed:
+            if record:
+                _write_open_bar(fstate, istate, bars_f, bars_i, n_bars)
+                bars_i[n_bars, 4] = start
+                bars_i[n_bars, 5] = i + 1
+            n_bars += 1
+
+            if ewma[0] > 0.0:
+                fstate[_F_EWMA_T], fstate[_F_EWMA_B], threshold = _update_imbalance_ewma(
+                    fstate[_F_EWMA_T], fstate[_F_EWMA_B], istate[_I_COUNT], fstate[_F_CUM], ewma
+                )
+
+            istate[_I_OPEN] = 0
+            start = -1
+
+    return n_bars, start
+
+
+@njit(nogil=True)
+def _stream_threshold_bars(
+    prices, volumes, timestamps_ns, mode, threshold, ewma, extra_mode, fstate, istate
+):
+    # Dry run on a copy of the state to size the outputs, then fill them. The built-in columns are
+    # left out of the dry run, they do not change the bars
+    n_bars, _ = _stream_threshold_scan(
+        prices,
+        volumes,
+        timestamps_ns,
+        mode,
+        threshold,
+        ewma,
+        _EXTRA_NONE,
+        fstate.copy(),
+        istate.copy(),
+        False,
+        np.empty((0, 10), dtype=np.float64),
+        np.empty((0, 8), dtype=np.int64),
+    )
+
+    bars_f = np.empty((n_bars, 10), dtype=np.float64)
+    bars_i = np.empty((n_bars, 8), dtype=np.int64)
+    _, open_start = _stream_threshold_scan(
+        prices,
+        volumes,
+        timestamps_ns,
+        mode,
+        threshold,
+        ewma,
+        extra_mode,
+        fstate,
+        istate,
+        True,
+        bars_f,
+        bars_i,
+    )
+    return bars_f, bars_i, open_start
+
+
+@njit(nogil=True)
+def _stream_time_bars(prices, volumes, timestamps_ns, window_ns, extra_mode, fstate, istate):
+    # A chunk closes at most one bar per change of time bin, which sizes the outputs
+    n_max = 1
+    for i in range(1, len(prices)):
+        if timestamps_ns[i] // window_ns != timestamps_ns[i - 1] // window_ns:
+            n_max += 1
+    bar_bins = np.empty(n_max, dtype=np.int64)
+    bars_f = np.empty((n_max, 10), dtype=np.float64)
+    bars_i = np.empty((n_max, 8), dtype=np.int64)
+
+    n_bars = 0
+    start = -1
+
+    for i in range(len(prices)):
+        ts = timestamps_ns[i]
+        bin_ts = ts // window_ns * window_ns
+
+        if istate[_I_OPEN] == 1 and bin_ts != istate[_I_BIN]:
+            bar_bins[n_bars] = istate[_I_BIN]
+            _write_open_bar(fstate, istate, bars_f, bars_i, n_bars)
+            bars_i[n_bars, 4] = start
+            bars_i[n_bars, 5] = i
+            n_bars += 1
+            istate[_I_OPEN] = 0
+
+        previous = _previous_price(fstate, istate, prices[i])
+        if istate[_I_OPEN] == 0:
+            start = i
+            istate[_I_BIN] = bin_ts
+        _add_tick(fstate, istate, prices[i], volumes[i], ts, previous, extra_mode)
+
+    return bar_bins[:n_bars], bars_f[:n_bars], bars_i[:n_bars], start
+
+
+class _StreamingBarBuilder:
+    """
+    Base class for bar builders fed chunk by chunk.
+
+    The open bar is kept as a compact state (OHLC, volume, tick count, times, the criterion
+    accumulator and the built-in `extra` columns) between two calls to `update`, so memory does
+    not depend on the stream length. The ticks of the open bar are only buffered when
+    `additional_metrics` are requested.
+    """
+
+    def __init__(
+        self,
+        col_price: str = "price",
+        col_volume: str = "volume",
+        additional_metrics: List[Tuple[Callable, str, List[str]]] = [],
+        compact: bool = False,
+        extra: List[str] = [],
+    ):
+        for _, source, _ in additional_metrics:
+            if source not in ("price", "volume", "price_volume"):
+                raise ValueError(
+                    f"Invalid source '{source}'. Must be 'price', 'volume', or 'price_volume'."
+                )
+
+        self.col_price = col_price
+        self.col_volume = col_volume
+        self.additional_metrics = list(additional_metrics)
+        self.compact = compact
+        self.extra = list(extra)
+        self._extra_mode = _extra_mode(self.extra)
+        self.reset()
+
+    def reset(self) -> None:
+        """Discard the open bar and start again from an empty stream."""
+        self._fstate = np.zeros(14, dtype=np.float64)
+        self._istate = np.zeros(9, dtype=np.int64)
+        self._buffer_prices = np.empty(0, dtype=np.float64)
+        self._buffer_volumes = np.empty(0, dtype=np.float64)
+
+    def update(self, chunk: pd.DataFrame) -> pd.DataFrame:
+        """
+        Feed the next chunk of ticks and return the bars closed by it.
+
+        Parameters
+        ----------
+        chunk : pd.DataFrame
+            Tick DataFrame indexed by datetime, must include price and volume columns. Chunks must
+            be passed in chronological order.
+
+        Returns
+        -------
+        pd.DataFrame
+            Bars closed within this chunk, with the same schema as the batch function.
+        """
+        prices = chunk[self.col_price].to_numpy(np.float64)
+        volumes = chunk[self.col_volume].to_numpy(np.float64)
+        timestamps_ns = _timestamps_ns(chunk.index)
+
+        bars, extra_columns, starts, ends, open_start = self._scan(prices, volumes, timestamps_ns)
+
+        metrics = _compute_extra_columns(self.extra, extra_columns, bars[5], self.compact)
+        if self.additional_metrics:
+            # Prepend the ticks of the bar carried from the previous chunk
+            offset = len(self._buffer_prices)
+            prices = np.concatenate((self._buffer_prices, prices))
+            volumes = np.concatenate((self._buffer_volumes, volumes))
+            starts = np.where(starts < 0, 0, starts + offset)
+            metrics.update(
+                _compute_additional_metrics(
+                    self.additional_metrics, prices, volumes, starts, ends + offset
+                )
+            )
+
+            if self._istate[_I_OPEN] == 0:
+                self._buffer_prices = np.empty(0, dtype=np.float64)
+                self._buffer_volumes = np.empty(0, dtype=np.float64)
+            else:
+                open_start = 0 if open_start < 0 else open_start + offset
+                self._buffer_prices = prices[open_start:].copy()
+                self._buffer_volumes = volumes[open_start:].copy()
+
+        return _to_bar_frame(bars, metrics, self.compact)
+
+    def flush(self) -> pd.DataFrame:
+        """
+        Close the stream and return the open bar, if any.
+
+        Returns
+        -------
+        pd.DataFrame
+            The trailing partial bar (zero or one row). The builder is reset afterwards.
+        """
+        bars, extra_columns = self._open_bar()
+        n = len(bars[0])
+
+        metrics = _compute_extra_columns(self.extra, extra_columns, bars[5], self.compact)
+        if self.additional_metrics:
+            starts = np.zeros(n, dtype=np.int64)
+            ends = np.full(n, len(self._buffer_prices), dtype=np.int64)
+            metrics.update(
+                _compute_additional_metrics(
+                    self.additional_metrics, self._buffer_prices, self._buffer_volumes, starts, ends
+                )
+            )
+
+        self.reset()
+        return _to_bar_frame(bars, metrics, self.compact)
+
+    def _scan(self, prices, volumes, timestamps_ns):
+        raise NotImplementedError
+
+    def _open_bar(self):
+        raise NotImplementedError
+
+    def _open_bar_rows(self):
+        # The open bar, if any, written like the closed ones by `_write_open_bar`
+        n = 1 if self._istate[_I_OPEN] == 1 else 0
+        bars_f = np.empty((n, 10), dtype=np.float64)
+        bars_i = np.empty((n, 8), dtype=np.int64)
+        if n:
+            _write_open_bar(self._fstate, self._istate, bars_f, bars_i, 0)
+        return bars_f, bars_i
+
+    @staticmethod
+    def _to_columns(bars_f, bars_i):
+        # Bar columns in the layout of `_to_bar_frame`, and built-in columns in the layout of
+        # `_compute_extra_columns`
+        bars = (
+            bars_i[:, 0],
+            bars_f[:, 0],
+            bars_f[:, 1],
+            bars_f[:, 2],
+            bars_f[:, 3],
+            bars_f[:, 4],
+            bars_i[:, 1],
+            bars_f[:, 5],
+            bars_i[:, 2],
+            bars_i[:, 3],
+        )
+        extra = (
+            bars_f[:, 6],
+            bars_f[:, 7],
+            bars_f[:, 8],
+            bars_i[:, 6],
+            bars_f[:, 9],
+            bars_i[:, 0],
+            bars_i[:, 7],
+        )
+        return bars, extra
+
+
+class _ThresholdBarBuilder(_StreamingBarBuilder):
+    _mode = _TICK
+
+    def __init__(
+        self,
+        threshold,
+        col_price,
+        col_volume,
+        additional_metrics,
+        compact,
+        ewma_span=None,
+        ewma_bounds=None,
+        extra=[],
+    ):
+        self._threshold = threshold
+        self._ewma = _ewma_params(threshold, ewma_span, ewma_bounds)
+        super().__init__(col_price, col_volume, additional_metrics, compact, extra)
+
+    def _scan(self, prices, volumes, timestamps_ns):
+        bars_f, bars_i, open_start = _stream_threshold_bars(
+            prices,
+            volumes,
+            timestamps_ns,
+            self._mode,
+            self._threshold,
+            self._ewma,
+            self._extra_mode,
+            self._fstate,
+            self._istate,
+        )
+        bars, extra = self._to_columns(bars_f, bars_i)
+        return bars, extra, bars_i[:, 4], bars_i[:, 5], open_start
+
+    def _open_bar(self):
+        return self._to_columns(*self._open_bar_rows())
+
+
+class TickBarBuilder(_ThresholdBarBuilder):
+    """
+    Streaming counterpart of `ticks_to_tick_bars`.
+
+    Parameters
+    ----------
+    tick_per_bar : int, default=1000
+        Number of ticks per bar.
+    col_price : str, default="price"
+        Name of the column containing tick prices.
+    col_volume : str, default="volume"
+        Name of the column containing tick volumes.
+    additional_metrics : List of tuples (function, source, col_names)
+        Same format as in `ticks_to_tick_bars`.
+    compact : bool, default=False
+        If True, prices, volumes and durations are returned as float32 and tick counts as int32.
+    extra : list of str, default=[]
+        Built-in columns of `ticks_to_tick_bars`, accumulated in the state of the open bar.
+    """
+
+    _mode = _TICK
+
+    def __init__(
+        self,
+        tick_per_bar: int = 1000,
+        col_price: str = "price",
+        col_volume: str = "volume",
+        additional_metrics: List[Tuple[Callable, str, List[str]]] = [],
+        compact: bool = False,
+        extra: List[str] = [],
+    ):
+        if tick_per_bar <= 0:
+            raise ValueError("tick_per_bar must be strictly positive.")
+        super().__init__(
+            tick_per_bar, col_price, col_volume, additional_metrics, compact, extra=extra
+        )
+
+
+class VolumeBarBuilder(_ThresholdBarBuilder):
+    """
+    Streaming counterpart of `ticks_to_volume_bars`.
+
+    Parameters
+    ----------
+    volume_per_bar : float, default=1_000_000
+        Volume threshold that triggers a new bar.
+    col_price : str, default="price"
+        Name of the column containing tick prices.
+    col_volume : str, default="volume"
+        Name of the column containing tick volumes.
+    additional_metrics : List of tuples (function, source, col_names)
+        Same format as in `ticks_to_volume_bars`.
+    compact : bool, default=False
+        If True, prices, volumes and durations are returned as float32 and tick counts as int32.
+    extra : list of str, default=[]
+        Built-in columns of `ticks_to_volume_bars`, accumulated in the state of the open bar.
+    """
+
+    _mode = _VOLUME
+
+    def __init__(
+        self,
+        volume_per_bar: float = 1_000_000,
+        col_price: str = "price",
+        col_volume: str = "volume",
+        additional_metrics: List[Tuple[Callable, str, List[str]]] = [],
+        compact: bool = False,
+        extra: List[str] = [],
+    ):
+        super().__init__(
+            float(volume_per_bar), col_price, col_volume, additional_metrics, compact, extra=extra
+        )
+
+
+class TickImbalanceBarBuilder(_ThresholdBarBuilder):
+    """
+    Streaming counterpart of `ticks_to_tick_imbalance_bars`.
+
+    Parameters
+    ----------
+    expected_imbalance : int, default=100
+        Cumulative signed tick imbalance threshold that triggers a new bar.
+    col_price : str, default="price"
+        Name of the column containing tick prices.
+    col_volume : str, default="volume"
+        Name of the column containing tick volumes.
+    additional_metrics : List of tuples (function, source, col_names)
+        Same format as in `ticks_to_tick_imbalance_bars`.
+    compact : bool, default=False
+        If True, prices, volumes and durations are returned as float32 and tick counts as int32.
+    ewma_span : int, optional
+        Span of the adaptive threshold, as in the batch function.
+    ewma_bounds : tuple of float, default=(0.1, 10.0)
+        Bounds of the adaptive threshold, as in the batch function.
+    extra : list of str, default=[]
+        Built-in columns of `ticks_to_tick_imbalance_bars`, accumulated in the state of the
+        open bar.
+    """
+
+    _mode = _TICK_IMBALANCE
+
+    def __init__(
+        self,
+        expected_imbalance: int = 100,
+        col_price: str = "price",
+        col_volume: str = "volume",
+        additional_metrics: List[Tuple[Callable, str, List[str]]] = [],
+        compact: bool = False,
+        ewma_span: int = None,
+        ewma_bounds: Tuple[float, float] = (0.1, 10.0),
+        extra: List[str] = [],
+    ):
+        super().__init__(
+            float(expected_imbalance),
+            col_price,
+            col_volume,
+            additional_metrics,
+            compact,
+            ewma_span,
+            ewma_bounds,
+            extra,
+        )
+
+
+class VolumeImbalanceBarBuilder(_ThresholdBarBuilder):
+    """
+    Streaming counterpart of `ticks_to_volume_imbalance_bars`.
+
+    Parameters
+    ----------
+    expected_imbalance : float, default=500_000
+        Signed volume imbalance threshold that triggers a new bar.
+    col_price : str, default="price"
+        Name of the column containing tick prices.
+    col_volume : str, default="volume"
+        Name of the column containing tick volumes.
+    additional_metrics : List of tuples (function, source, col_names)
+        Same format as in `ticks_to_volume_imbalance_bars`.
+    compact : bool, default=False
+        If True, prices, volumes and durations are returned as float32 and tick counts as int32.
+    ewma_span : int, optional
+        Span of the adaptive threshold, as in the batch function.
+    ewma_bounds : tuple of float, default=(0.1, 10.0)
+        Bounds of the adaptive threshold, as in the batch function.
+    extra : list of str, default=[]
+        Built-in columns of `ticks_to_volume_imbalance_bars`, accumulated in the state of the
+        open bar.
+    """
+
+    _mode = _VOLUME_IMBALANCE
+
+    def __init__(
+        self,
+        expected_imbalance: float = 500_000,
+        col_price: str = "price",
+        col_volume: str = "volume",
+        additional_metrics: List[Tuple[Callable, str, List[str]]] = [],
+        compact: bool = False,
+        ewma_span: int = None,
+        ewma_bounds: Tuple[float, float] = (0.1, 10.0),
+        extra: List[str] = [],
+    ):
+        super().__init__(
+            float(expected_imbalance),
+            col_price,
+            col_volume,
+            additional_metrics,
+            compact,
+            ewma_span,
+            ewma_bounds,
+            extra,
+        )
+
+
+class DollarBarBuilder(_ThresholdBarBuilder):
+    """
+    Streaming counterpart of `ticks_to_dollar_bars`.
+
+    Parameters
+    ----------
+    dollar_per_bar : float, default=100_000_000
+        Notional threshold that triggers a new bar.
+    col_price : str, default="price"
+        Name of the column containing tick prices.
+    col_volume : str, default="volume"
+        Name of the column containing tick volumes.
+    additional_metrics : List of tuples (function, source, col_names)
+        Same format as in `ticks_to_dollar_bars`.
+    compact : bool, default=False
+        If True, prices, volumes and durations are returned as float32 and tick counts as int32.
+    extra : list of str, default=[]
+        Built-in columns of `ticks_to_dollar_bars`, accumulated in the state of the open bar.
+    """
+
+    _mode = _DOLLAR
+
+    def __init__(
+        self,
+        dollar_per_bar: float = 100_000_000,
+        col_price: str = "price",
+        col_volume: str = "volume",
+        additional_metrics: List[Tuple[Callable, str, List[str]]] = [],
+        compact: bool = False,
+        extra: List[str] = [],
+    ):
+        super().__init__(
+            float(dollar_per_bar), col_price, col_volume, additional_metrics, compact, extra=extra
+        )
+
+
+class DollarImbalanceBarBuilder(_ThresholdBarBuilder):
+    """
+    Streaming counterpart of `ticks_to_dollar_imbalance_bars`.
+
+    Parameters
+    ----------
+    expected_imbalance : float, default=50_000_000
+        Signed notional imbalance threshold that triggers a new bar.
+    col_price : str, default="price"
+        Name of the column containing tick prices.
+    col_volume : str, default="volume"
+        Name of the column containing tick volumes.
+    additional_metrics : List of tuples (function, source, col_names)
+        Same format as in `ticks_to_dollar_imbalance_bars`.
+    compact : bool, default=False
+        If True, prices, volumes and durations are returned as float32 and tick counts as int32.
+    ewma_span : int, optional
+        Span of the adaptive threshold, as in the batch function.
+    ewma_bounds : tuple of float, default=(0.1, 10.0)
+        Bounds of the adaptive threshold, as in the batch function.
+    extra : list of str, default=[]
+        Built-in columns of `ticks_to_dollar_imbalance_bars`, accumulated in the state of the
+        open bar.
+    """
+
+    _mode = _DOLLAR_IMBALANCE
+
+    def __init__(
+        self,
+        expected_imbalance: float = 50_000_000,
+        col_price: str = "price",
+        col_volume: str = "volume",
+        additional_metrics: List[Tuple[Callable, str, List[str]]] = [],
+        compact: bool = False,
+        ewma_span: int = None,
+        ewma_bounds: Tuple[float, float] = (0.1, 10.0),
+        extra: List[str] = [],
+    ):
+        super().__init__(
+            float(expected_imbalance),
+            col_price,
+            col_volume,
+            additional_metrics,
+            compact,
+            ewma_span,
+            ewma_bounds,
+            extra,
+        )
+
+
+class TickRunBarBuilder(_ThresholdBarBuilder):
+    """
+    Streaming counterpart of `ticks_to_tick_run_bars`.
+
+    Parameters
+    ----------
+    expected_run : int, default=100
+        Number of one-sided (buy or sell) ticks that triggers a new bar.
+    col_price : str, default="price"
+        Name of the column containing tick prices.
+    col_volume : str, default="volume"
+        Name of the column containing tick volumes.
+    additional_metrics : List of tuples (function, source, col_names)
+        Same format as in `ticks_to_tick_run_bars`.
+    compact : bool, default=False
+        If True, prices, volumes and durations are returned as float32 and tick counts as int32.
+    extra : list of str, default=[]
+        Built-in columns of `ticks_to_tick_run_bars`, accumulated in the state of the open bar.
+    """
+
+    _mode = _TICK_RUN
+
+    def __init__(
+        self,
+        expected_run: int = 100,
+        col_price: str = "price",
+        col_volume: str = "volume",
+        additional_metrics: List[Tuple[Callable, str, List[str]]] = [],
+        compact: bool = False,
+        extra: List[str] = [],
+    ):
+        super().__init__(
+            float(expected_run), col_price, col_volume, additional_metrics, compact, extra=extra
+        )
+
+
+class VolumeRunBarBuilder(_ThresholdBarBuilder):
+    """
+    Streaming counterpart of `ticks_to_volume_run_bars`.
+
+    Parameters
+    ----------
+    expected_run : float, default=500_000
+        One-sided (buy or sell) volume that triggers a new bar.
+    col_price : str, default="price"
+        Name of the column containing tick prices.
+    col_volume : str, default="volume"
+        Name of the column containing tick volumes.
+    additional_metrics : List of tuples (function, source, col_names)
+        Same format as in `ticks_to_volume_run_bars`.
+    compact : bool, default=False
+        If True, prices, volumes and durations are returned as float32 and tick counts as int32.
+    extra : list of str, default=[]
+        Built-in columns of `ticks_to_volume_run_bars`, accumulated in the state of the open bar.
+    """
+
+    _mode = _VOLUME_RUN
+
+    def __init__(
+        self,
+        expected_run: float = 500_000,
+        col_price: str = "price",
+        col_volume: str = "volume",
+        additional_metrics: List[Tuple[Callable, str, List[str]]] = [],
+        compact: bool = False,
+        extra: List[str] = [],
+    ):
+        super().__init__(
+            float(expected_run), col_price, col_volume, additional_metrics, compact, extra=extra
+        )
+
+
+class TimeBarBuilder(_StreamingBarBuilder):
+    """
+    Streaming counterpart of `ticks_to_time_bars`.
+
+    A time bar is closed as soon as a tick belonging to a later period is received, so the
+    bars returned by successive `update` calls followed by `flush` match `ticks_to_time_bars`.
+
+    Parameters
+    ----------
+    resample_factor : str, default="60min"
+        Resampling frequency (e.g., "1min", "5min", "1H", "1D").
+    col_price : str, default="price"
+        Name of the column containing tick prices.
+    col_volume : str, default="volume"
+        Name of the column containing tick volumes.
+    additional_metrics : List of tuples (function, source, col_names)
+        Same format as in `ticks_to_time_bars`.
+    compact : bool, default=False
+        If True, prices and volumes are returned as float32 and tick counts as int32.
+    extra : list of str, default=[]
+        Built-in columns of `ticks_to_time_bars`, accumulated in the state of the open bar.
+    """
+
+    def __init__(
+        self,
+        resample_factor: str = "60min",
+        col_price: str = "price",
+        col_volume: str = "volume",
+        additional_metrics: List[Tuple[Callable, str, List[str]]] = [],
+        compact: bool = False,
+        extra: List[str] = [],
+    ):
+        self._window_ns = pd.to_timedelta(resample_factor).value
+        if self._window_ns <= 0:
+            raise ValueError("resample_factor must be a strictly positive duration.")
+        super().__init__(col_price, col_volume, additional_metrics, compact, extra)
+
+    def _scan(self, prices, volumes, timestamps_ns):
+        bins, bars_f, bars_i, open_start = _stream_time_bars(
+            prices,
+            volumes,
+            timestamps_ns,
+            self._window_ns,
+            self._extra_mode,
+            self._fstate,
+            self._istate,
+        )
+        bars, extra = self._to_time_columns(bins, bars_f, bars_i)
+        return bars, extra, bars_i[:, 4], bars_i[:, 5], open_start
+
+    def _open_bar(self):
+        bars_f, bars_i = self._open_bar_rows()
+        bins = np.full(len(bars_f), self._istate[_I_BIN], dtype=np.int64)
+        return self._to_time_columns(bins, bars_f, bars_i)
+
+    def _to_time_columns(self, bins, bars_f, bars_i):
+        # Time bars are labelled by their period and have no duration column
+        bars, extra = self._to_columns(bars_f, bars_i)
+        return (bins,) + bars[1:7] + (None,) + bars[8:], extra
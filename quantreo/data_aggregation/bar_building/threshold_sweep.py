@@ -0,0 +1,237 @@
+import pandas as pd
+import numpy as np
+from numba import njit
+from typing import Dict, List, Tuple, Union
+
+from .engine import _tick_arrays, _to_bar_frame
+
+_TICK = 0
+_VOLUME = 1
+_DOLLAR = 2
+
+_SWEEP_TYPES = {"tick": _TICK, "volume": _VOLUME, "dollar": _DOLLAR}
+
+
+@njit(nogil=True)
+def _tick_weight(prices, volumes, i, mode):
+    if mode == _TICK:
+        return 1.0
+    if mode == _VOLUME:
+        return volumes[i]
+    return prices[i] * volumes[i]
+
+
+@njit(nogil=True)
+def _sweep_stats(prices, volumes, thresholds, mode):
+    # One accumulator per threshold; bars are reduced to the moments of their close-to-close
+    # log returns as soon as they close, so nothing proportional to the bar count is stored
+    n_thresholds = len(thresholds)
+    cum = np.zeros(n_thresholds, dtype=np.float64)
+    last_close = np.zeros(n_thresholds, dtype=np.float64)
+    n_bars = np.zeros(n_thresholds, dtype=np.int64)
+    moments = np.zeros((n_thresholds, 4), dtype=np.float64)
+
+    for i in range(len(prices)):
+        weight = _tick_weight(prices, volumes, i, mode)
+        for k in range(n_thresholds):
+            cum[k] += weight
+            if cum[k] >= thresholds[k]:
+                if n_bars[k] > 0:
+                    r = np.log(prices[i] / last_close[k])
+                    moments[k, 0] += r
+                    moments[k, 1] += r * r
+                    moments[k, 2] += r * r * r
+                    moments[k, 3] += r * r * r * r
+                last_close[k] = prices[i]
+                n_bars[k] += 1
+                cum[k] = 0.0
+
+    return n_bars, moments
+
+
+@njit(nogil=True)
+def _sweep_bars(prices, volumes, timestamps_ns, thresholds, mode, offsets):
+    # Same pass as `_sweep_stats`, but every accumulator also tracks its open bar and writes it
+    # at offsets[k] + (bar number) once closed
+    n_thresholds = len(thresholds)
+    n_total = offsets[-1]
+
+    bar_time = np.empty(n_total, dtype=np.int64)
+    bar_open = np.empty(n_total, dtype=np.float64)
+    bar_high = np.empty(n_total, dtype=np.float64)
+    bar_low = np.empty(n_total, dtype=np.float64)
+    bar_close = np.empty(n_total, dtype=np.float64)
+    bar_volume = np.empty(n_total, dtype=np.float64)
+    bar_count = np.empty(n_total, dtype=np.int64)
+    bar_duration = np.empty(n_total, dtype=np.float64)
+    high_time = np.empty(n_total, dtype=np.int64)
+    low_time = np.empty(n_total, dtype=np.int64)
+
+    cum = np.zeros(n_thresholds, dtype=np.float64)
+    row = offsets[:-1].copy()
+    start = np.zeros(n_thresholds, dtype=np.int64)
+    high = np.zeros(n_thresholds, dtype=np.float64)
+    low = np.zeros(n_thresholds, dtype=np.float64)
+    high_idx = np.zeros(n_thresholds, dtype=np.int64)
+    low_idx = np.zeros(n_thresholds, dtype=np.int64)
+    volume = np.zeros(n_thresholds, dtype=np.float64)
+    if len(prices) > 0:
+        high[:] = prices[0]
+        low[:] = prices[0]
+
+    for i in range(len(prices)):
+        price = prices[i]
+        weight = _tick_weight(prices, volumes, i, mode)
+        for k in range(n_thresholds):
+            if price > high[k]:
+                high[k] = price
+                high_idx[k] = i
+            if price < low[k]:
+                low[k] = price
+                low_idx[k] = i
+            volume[k] += volumes[i]
+            cum[k] += weight
+
+            if cum[k] >= thresholds[k]:
+                j = row[k]
+                bar_time[j] = timestamps_ns[start[k]]
+                bar_open[j] = prices[start[k]]
+                bar_high[j] = high[k]
+                bar_low[j] = low[k]
+                bar_close[j] = price
+                bar_volume[j] = volume[k]
+                bar_count[j] = i + 1 - start[k]
+                bar_duration[j] = (timestamps_ns[i] - timestamps_ns[start[k]]) / 60_000_000_000
+                high_time[j] = timestamps_ns[high_idx[k]]
+                low_time[j] = timestamps_ns[low_idx[k]]
+                row[k] += 1
+
+                # The next bar opens on the following tick
+                if i + 1 < len(prices):
+                    start[k] = i + 1
+                    high[k] = prices[i + 1]
+                    low[k] = prices[i + 1]
+                    high_idx[k] = i + 1
+                    low_idx[k] = i + 1
+                volume[k] = 0.0
+                cum[k] = 0.0
+
+    return (
+        bar_time,
+        bar_open,
+        bar_high,
+        bar_low,
+        bar_close,
+        bar_volume,
+        bar_count,
+        bar_duration,
+        high_time,
+        low_time,
+    )
+
+
+def _moments_to_stats(thresholds: np.ndarray, n_bars: np.ndarray, moments: np.ndarray):
+    n = np.maximum(n_bars - 1, 0).astype(np.float64)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        mean = moments[:, 0] / n
+        # Central moments from the raw power sums
+        m2 = moments[:, 1] / n - mean**2
+        m3 = moments[:, 2] / n - 3 * mean * moments[:, 1] / n + 2 * mean**3
+        m4 = (
+            moments[:, 3] / n
+            - 4 * mean * moments[:, 2] / n
+            + 6 * mean**2 * moments[:, 1] / n
+            - 3 * mean**4
+        )
+        skewness = m3 / m2**1.5
+        kurtosis = m4 / m2**2 - 3
+        jarque_bera = n / 6 * (skewness**2 + kurtosis**2 / 4)
+
+    stats = pd.DataFrame(
+        {
+            "n_bars": n_bars,
+            "mean_return": mean,
+            "std_return": np.sqrt(np.maximum(m2, 0)),
+            "skewness": skewness,
+            "kurtosis": kurtosis,
+            "jarque_bera": jarque_bera,
+        },
+        index=pd.Index(thresholds, name="threshold"),
+    )
+    return stats.replace([np.inf, -np.inf], np.nan)
+
+
+def sweep_bar_thresholds(
+    df: pd.DataFrame,
+    thresholds: List[float],
+    bar_type: str = "volume",
+    col_price: str = "price",
+    col_volume: str = "volume",
+    return_bars: bool = False,
+    compact: bool = False,
+    col_time: str = "datetime",
+) -> Union[pd.DataFrame, Tuple[pd.DataFrame, Dict[float, pd.DataFrame]]]:
+    """
+    Build tick, volume or dollar bars for a whole grid of thresholds in a single pass over the ticks.
+
+    Every threshold has its own accumulator inside the same compiled loop, so calibrating
+    `tick_per_bar`, `volume_per_bar` or `dollar_per_bar` over N candidates costs one scan of the
+    ticks instead of N calls to the bar function. Summary statistics are computed on the
+    close-to-close log returns of the bars while they are built.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        Tick DataFrame indexed by datetime, must include price and volume columns. A pyarrow
+        Table, a polars DataFrame, a `TickStore` or a `TickSlice` are also accepted.
+    thresholds : list of float
+        Candidate thresholds (`tick_per_bar`, `volume_per_bar` or `dollar_per_bar`), all distinct.
+    bar_type : str, default="volume"
+        One of "tick", "volume" or "dollar".
+    col_price : str, default="price"
+        Column name representing the price of each tick.
+    col_volume : str, default="volume"
+        Column name representing the volume of each tick.
+    return_bars : bool, default=False
+        If True, the bars of every threshold are also returned. They are identical to the output
+        of the corresponding `ticks_to_*_bars` function (without additional metrics).
+    compact : bool, default=False
+        If True, the returned bars use float32 prices, volumes and durations and int32 tick counts.
+    col_time : str, default="datetime"
+        Name of the timestamp column for pyarrow and polars inputs.
+
+    Returns
+    -------
+    pd.DataFrame or tuple (pd.DataFrame, dict)
+        Statistics indexed by threshold with columns 'n_bars', 'mean_return', 'std_return',
+        'skewness', 'kurtosis' (excess) and 'jarque_bera'. With `return_bars=True`, also a dict
+        mapping each threshold to its bar DataFrame.
+    """
+    if bar_type not in _SWEEP_TYPES:
+        raise ValueError(f"Invalid bar_type '{bar_type}'. Must be one of {list(_SWEEP_TYPES)}.")
+
+    thresholds = np.asarray(thresholds, dtype=np.float64)
+    if thresholds.ndim != 1 or len(thresholds) == 0:
+        raise ValueError("thresholds must be a non-empty 1D list of values.")
+    if (thresholds <= 0).any():
+        raise ValueError("thresholds must be strictly positive.")
+    if len(np.unique(thresholds)) != len(thresholds):
+        raise ValueError("thresholds must not contain duplicates.")
+
+    mode = _SWEEP_TYPES[bar_type]
+    prices, volumes, timestamps_ns = _tick_arrays(df, col_price, col_volume, col_time)
+
+    n_bars, moments = _sweep_stats(prices, volumes, thresholds, mode)
+    stats = _moments_to_stats(thresholds, n_bars, moments)
+    if not return_bars:
+        return stats
+
+    # The bar counts of the first pass size the outputs of the second one exactly
+    offsets = np.concatenate(([0], np.cumsum(n_bars))).astype(np.int64)
+    columns = _sweep_bars(prices, volumes, timestamps_ns, thresholds, mode, offsets)
+
+    bars = {}
+    for k, threshold in enumerate(stats.index):
+        rows = slice(offsets[k], offsets[k + 1])
+        bars[threshold] = _to_bar_frame(tuple(col[rows] for col in columns), compact=compact)
+    return stats, bars
@@ -3,41 +3,42 @@ import numpy as np
 from numba import njit
 from typing import Callable, List, Tuple
 
-
-@njit
-def _build_tick_bars(prices, volumes, timestamps_ns, tick_per_bar):
-    n_ticks = len(prices)
+from .engine import (
+    _compute_additional_metrics,
+    _compute_extra_columns,
+    _extra_mode,
+    _fill_bars,
+    _fill_bars_parallel,
+    _fill_sliding_bars,
+    _tick_arrays,
+    _to_bar_frame,
+)
+
+
+@njit(nogil=True)
+def _tick_bar_boundaries(n_ticks, tick_per_bar):
     n_bars = n_ticks // tick_per_bar
+    starts = np.arange(n_bars, dtype=np.int64) * tick_per_bar
+    ends = starts + tick_per_bar
+    return starts, ends
 
-    bars = np.empty((n_bars, 10), dtype=np.float64)
-    indices = np.empty((n_bars, 2), dtype=np.int64)
-
-    for i in range(n_bars):
-        start = i * tick_per_bar
-        end = start + tick_per_bar
-
-        p = prices[start:end]
-        v = volumes[start:end]
-        t = timestamps_ns[start:end]
-
-        high_idx = np.argmax(p)
-        low_idx = np.argmin(p)
 
-        bars[i, 0] = t[0]
-        bars[i, 1] = p[0]
-        bars[i, 2] = np.max(p)
-        bars[i, 3] = np.min(p)
-        bars[i, 4] = p[-1]
-        bars[i, 5] = np.sum(v)
-        bars[i, 6] = end - start
-        bars[i, 7] = (t[-1] - t[0]) / 60_000_000_000  # nanoseconds to minutes
-        bars[i, 8] = t[high_idx]
-        bars[i, 9] = t[low_idx]
+@njit(nogil=True)
+def _sliding_tick_bar_boundaries(n_ticks, tick_per_bar, step):
+    n_bars = max((n_ticks - tick_per_bar) // step + 1, 0)
+    starts = np.arange(n_bars, dtype=np.int64) * step
+    ends = starts + tick_per_bar
+    return starts, ends
 
-        indices[i, 0] = start
-        indices[i, 1] = end
 
-    return bars, indices
+@njit(nogil=True)
+def _build_tick_bars(prices, volumes, timestamps_ns, tick_per_bar, parallel, extra_mode):
+    starts, ends = _tick_bar_boundaries(len(prices), tick_per_bar)
+    if parallel:
+        bars, extra = _fill_bars_parallel(prices, volumes, timestamps_ns, starts, ends, extra_mode)
+    else:
+        bars, extra = _fill_bars(prices, volumes, timestamps_ns, starts, ends, extra_mode)
+    return bars, extra, starts, ends
 
 
 def ticks_to_tick_bars(
@@ -46,6 +47,12 @@ def ticks_to_tick_bars(
     col_price: str = "price",
     col_volume: str = "volume",
     additional_metrics: List[Tuple[Callable, str, List[str]]] = [],
+    compact: bool = False,
+    parallel: bool = False,
+    extra: List[str] = [],
+    col_time: str = "datetime",
+    output: str = "pandas",
+    step: int = None,
 ) -> pd.DataFrame:
     """
     Convert tick-level data into fixed-size tick bars, with optional additional metrics.
@@ -65,6 +72,29 @@ def ticks_to_tick_bars(
         - function : callable applied to price, volume, or both slices
         - source   : one of "price", "volume", or "price_volume"
         - col_names: list of column names corresponding to the outputs
+    compact : bool, default=False
+        If True, prices, volumes and durations are returned as float32 and tick counts as int32.
+        Timestamps are always kept exactly as datetime64[ns].
+    parallel : bool, default=False
+        If True, bars are built concurrently on all the threads available to numba (see
+        `numba.set_num_threads`). The output is identical to the sequential one.
+    extra : list of str, default=[]
+        Built-in columns accumulated in the loop that builds the bars, placed before the
+        additional metrics: "vwap", "buy_volume" and "sell_volume" (tick rule, ticks without
+        price change are not counted), "signed_ticks", "realized_var" (sum of squared log returns
+        between consecutive ticks of the bar), "first_time" and "last_time".
+    col_time : str, default="datetime"
+        Name of the timestamp column when `df` is a pyarrow Table or a polars DataFrame, which are
+        accepted in place of a pandas DataFrame indexed by datetime.
+    output : str, default="pandas"
+        "pandas", "arrow" (pyarrow Table), "polars" (polars DataFrame) or "numpy" (dict of arrays).
+        Except for pandas, the bar start time is the first column, "time". The arrays computed by
+        the kernels are wrapped without copy.
+    step : int, optional
+        If given, overlapping bars of `tick_per_bar` ticks are emitted every `step` ticks (e.g.
+        1000-tick bars every 100 ticks), as long as a full bar fits in the ticks. OHLCV, high_time,
+        low_time and the `extra` columns are computed in one pass with rolling extremes and running
+        sums, so the cost does not grow with the overlap. `parallel` is ignored.
 
     Returns
     -------
@@ -72,45 +102,69 @@ def ticks_to_tick_bars(
         Tick bars indexed by bar start time, with OHLCV, metadata, and custom metric columns.
     """
 
+    extra_mode = _extra_mode(extra)
+
     # Convert to NumPy
-    prices = df[col_price].to_numpy(np.float64)
-    volumes = df[col_volume].to_numpy(np.float64)
-    timestamps_ns = df.index.values.astype("int64")
+    prices, volumes, timestamps_ns = _tick_arrays(df, col_price, col_volume, col_time)
 
     # Compute bars
-    bars_np, index_pairs = _build_tick_bars(prices, volumes, timestamps_ns, tick_per_bar)
-
-    # Base output
-    data = {
-        "open": bars_np[:, 1],
-        "high": bars_np[:, 2],
-        "low": bars_np[:, 3],
-        "close": bars_np[:, 4],
-        "volume": bars_np[:, 5],
-        "number_ticks": bars_np[:, 6].astype(int),
-        "duration_minutes": bars_np[:, 7],
-        "high_time": pd.to_datetime(bars_np[:, 8].astype(np.int64)),
-        "low_time": pd.to_datetime(bars_np[:, 9].astype(np.int64)),
-    }
-
+    if step is not None:
+        if step < 1:
+            raise ValueError("step must be a positive integer.")
+        starts, ends = _sliding_tick_bar_boundaries(len(prices), tick_per_bar, step)
+        bars, extra_columns = _fill_sliding_bars(
+            prices, volumes, timestamps_ns, starts, ends, extra_mode
+        )
+    else:
+        bars, extra_columns, starts, ends = _build_tick_bars(
+            prices, volumes, timestamps_ns, tick_per_bar, parallel, extra_mode
+        )
     # Add additional metrics
-    for func, source, col_names in additional_metrics:
-        if source == "price":
-            inputs = [func(prices[start:end]) for start, end in index_pairs]
-        elif source == "volume":
-            inputs = [func(volumes[start:end]) for start, end in index_pairs]
-        elif source == "price_volume":
-            inputs = [func(prices[start:end], volumes[start:end]) for start, end in index_pairs]
-        else:
-            raise ValueError(
-                f"Invalid source '{source}'. Must be 'price', 'volume', or 'price_volume'."
-            )
-
-        if isinstance(inputs[0], tuple):
-            for i, name in enumerate(col_names):
-                data[name] = [out[i] for out in inputs]
-        else:
-            data[col_names[0]] = inputs
-
-    index = pd.to_datetime(bars_np[:, 0].astype(np.int64))
-    return pd.DataFrame(data, index=index).rename_axis("time")
+    metrics = _compute_extra_columns(extra, extra_columns, bars[5], compact)
+    metrics.update(_compute_additional_metrics(additional_metrics, prices, volumes, starts, ends))
+
+    return _to_bar_frame(bars, metrics, compact, output)
+
+
+def tick_bar_boundaries(
+    df: pd.DataFrame,
+    tick_per_bar: int = 1000,
+    col_price: str = "price",
+    col_volume: str = "volume",
+    col_time: str = "datetime",
+    step: int = None,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Locate the tick bars in the ticks without building them.
+
+    Bar k holds the ticks `starts[k]:ends[k]` of `df`, the bars of `ticks_to_tick_bars` called with
+    the same parameters. Per-bar statistics can then be computed on views of the tick arrays without
+    materialising OHLCV.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        Tick DataFrame indexed by datetime, must include price and volume columns. A pyarrow
+        Table, a polars DataFrame or a `TickStore` are also accepted.
+    tick_per_bar : int, default=1000
+        Number of ticks per bar.
+    col_price : str, default="price"
+        Column name representing the price of each tick.
+    col_volume : str, default="volume"
+        Column name representing the volume of each tick.
+    col_time : str, default="datetime"
+        Name of the timestamp column for pyarrow and polars inputs.
+    step : int, optional
+        Offset in ticks between the starts of overlapping bars, see `ticks_to_tick_bars`.
+
+    Returns
+    -------
+    tuple of np.ndarray
+        int64 `starts` and `ends` offsets of the bars in the ticks.
+    """
+    prices, _, _ = _tick_arrays(df, col_price, col_volume, col_time)
+    if step is not None:
+        if step < 1:
+            raise ValueError("step must be a positive integer.")
+        return _sliding_tick_bar_boundaries(len(prices), tick_per_bar, step)
+    return _tick_bar_boundaries(len(prices), tick_per_bar)
@@ -0,0 +1,185 @@
+import pandas as pd
+import numpy as np
+from numba import njit
+from typing import Callable, List, Tuple
+
+from .engine import (
+    _compute_additional_metrics,
+    _compute_extra_columns,
+    _extra_mode,
+    _fill_bars,
+    _tick_arrays,
+    _to_bar_frame,
+)
+from .speculative import _TICK_RUN, _build_speculative_bars, _parallel_bar_boundaries
+
+
+@njit(nogil=True)
+def _tick_run_bar_scan(prices, expected_run, record, starts, ends):
+    n_bars = 0
+    start = 1
+    buy_ticks = 0
+    sell_ticks = 0
+
+    for i in range(1, len(prices)):
+        delta = prices[i] - prices[i - 1]
+        if delta > 0:
+            buy_ticks += 1
+        elif delta < 0:
+            sell_ticks += 1
+        else:
+            continue
+
+        if max(buy_ticks, sell_ticks) >= expected_run:
+            if record:
+                starts[n_bars] = start
+                ends[n_bars] = i + 1
+            n_bars += 1
+
+            buy_ticks = 0
+            sell_ticks = 0
+            start = i + 1
+
+    return n_bars
+
+
+@njit(nogil=True)
+def _tick_run_bar_boundaries(prices, expected_run):
+    # Count the bars first so that the boundaries can be written into exact-size arrays
+    empty = np.empty(0, dtype=np.int64)
+    n_bars = _tick_run_bar_scan(prices, expected_run, False, empty, empty)
+
+    starts = np.empty(n_bars, dtype=np.int64)
+    ends = np.empty(n_bars, dtype=np.int64)
+    _tick_run_bar_scan(prices, expected_run, True, starts, ends)
+    return starts, ends
+
+
+@njit(nogil=True)
+def _build_tick_run_bars(prices, volumes, timestamps_ns, expected_run, extra_mode):
+    starts, ends = _tick_run_bar_boundaries(prices, expected_run)
+    bars, extra = _fill_bars(prices, volumes, timestamps_ns, starts, ends, extra_mode)
+    return bars, extra, starts, ends
+
+
+def ticks_to_tick_run_bars(
+    df: pd.DataFrame,
+    expected_run: int = 100,
+    col_price: str = "price",
+    col_volume: str = "volume",
+    additional_metrics: List[Tuple[Callable, str, List[str]]] = [],
+    compact: bool = False,
+    parallel: bool = False,
+    extra: List[str] = [],
+    col_time: str = "datetime",
+    output: str = "pandas",
+) -> pd.DataFrame:
+    """
+    Convert tick-level data into tick run bars, optionally enriched with custom metrics.
+
+    Each tick is classified as a buy or a sell with the tick rule (ticks without price change are
+    kept in the bar but not counted). A bar is closed as soon as the number of buy ticks or the
+    number of sell ticks it contains reaches `expected_run`, i.e. when the dominant side of the
+    order flow has persisted long enough.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        Tick DataFrame indexed by datetime, must include price and volume columns.
+    expected_run : int, default=100
+        Number of one-sided (buy or sell) ticks that triggers a new bar.
+    col_price : str, default="price"
+        Column name representing the price of each tick.
+    col_volume : str, default="volume"
+        Column name representing the volume of each tick.
+    additional_metrics : list of tuples (function, source, col_names)
+        Each tuple must contain:
+        - function : a callable applied to bar slices (can return float or tuple of floats)
+        - source   : "price", "volume", or "price_volume"
+        - col_names: list of strings (column names returned by the function)
+    compact : bool, default=False
+        If True, prices, volumes and durations are returned as float32 and tick counts as int32.
+        Timestamps are always kept exactly as datetime64[ns].
+    parallel : bool, default=False
+        If True, the bar boundaries are searched speculatively on chunks of ticks with all the
+        threads available to numba (see `numba.set_num_threads`), then reconciled by a short
+        sequential pass. The output is identical to the sequential one.
+    extra : list of str, default=[]
+        Built-in columns accumulated in the loop that builds the bars, placed before the
+        additional metrics: "vwap", "buy_volume" and "sell_volume" (tick rule, ticks without
+        price change are not counted), "signed_ticks", "realized_var" (sum of squared log returns
+        between consecutive ticks of the bar), "first_time" and "last_time".
+    col_time : str, default="datetime"
+        Name of the timestamp column when `df` is a pyarrow Table or a polars DataFrame, which are
+        accepted in place of a pandas DataFrame indexed by datetime.
+    output : str, default="pandas"
+        "pandas", "arrow" (pyarrow Table), "polars" (polars DataFrame) or "numpy" (dict of arrays).
+        Except for pandas, the bar start time is the first column, "time". The arrays computed by
+        the kernels are wrapped without copy.
+
+    Returns
+    -------
+    pd.DataFrame
+        Tick run bars indexed by bar start time with OHLCV, metadata, and custom metric columns.
+    """
+    extra_mode = _extra_mode(extra)
+    prices, volumes, timestamps_ns = _tick_arrays(df, col_price, col_volume, col_time)
+
+    if parallel:
+        bars, extra_columns, starts, ends = _build_speculative_bars(
+            _TICK_RUN, prices, volumes, timestamps_ns, float(expected_run), extra_mode
+        )
+    else:
+        bars, extra_columns, starts, ends = _build_tick_run_bars(
+            prices, volumes, timestamps_ns, expected_run, extra_mode
+        )
+
+    # Additional metrics computation
+    metrics = _compute_extra_columns(extra, extra_columns, bars[5], compact)
+    metrics.update(_compute_additional_metrics(additional_metrics, prices, volumes, starts, ends))
+
+    return _to_bar_frame(bars, metrics, compact, output)
+
+
+def tick_run_bar_boundaries(
+    df: pd.DataFrame,
+    expected_run: int = 100,
+    col_price: str = "price",
+    col_volume: str = "volume",
+    parallel: bool = False,
+    col_time: str = "datetime",
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Locate the tick run bars in the ticks without building them.
+
+    Bar k holds the ticks `starts[k]:ends[k]` of `df`, the bars of `ticks_to_tick_run_bars` called
+    with the same parameters. Per-bar statistics can then be computed on views of the tick arrays
+    without materialising OHLCV.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        Tick DataFrame indexed by datetime, must include price and volume columns. A pyarrow
+        Table, a polars DataFrame or a `TickStore` are also accepted.
+    expected_run : int, default=100
+        Number of one-sided (buy or sell) ticks that triggers a new bar.
+    col_price : str, default="price"
+        Column name representing the price of each tick.
+    col_volume : str, default="volume"
+        Column name representing the volume of each tick.
+    parallel : bool, default=False
+        If True, the boundaries are searched speculatively on chunks of ticks with all the threads
+        available to numba, then reconciled by a short sequential pass. Same output.
+    col_time : str, default="datetime"
+        Name of the timestamp column for pyarrow and polars inputs.
+
+    Returns
+    -------
+    tuple of np.ndarray
+        int64 `starts` and `ends` offsets of the bars in the ticks.
+    """
+    prices, volumes, _ = _tick_arrays(df, col_price, col_volume, col_time)
+
+    if parallel:
+        return _parallel_bar_boundaries(_TICK_RUN, prices, volumes, float(expected_run))
+    return _tick_run_bar_boundaries(prices, expected_run)
@@ -0,0 +1,224 @@
+import os
+import numpy as np
+import pandas as pd
+from typing import NamedTuple, Optional, Tuple
+
+from .engine import _tick_arrays
+
+_DAY_NS = 86_400_000_000_000
+
+# Raw little-endian columns, one value per tick, and the (day, first tick offset) pairs
+_COLUMNS = {"timestamps_ns": "timestamp.i8", "prices": "price.f8", "volumes": "volume.f8"}
+_DTYPES = {"timestamps_ns": "<i8", "prices": "<f8", "volumes": "<f8"}
+_DAY_INDEX = "day_index.i8"
+
+
+def _memmap_location(values: np.ndarray) -> Optional[Tuple[str, int]]:
+    """File and byte offset of a contiguous view on a `np.memmap`, None for any other array."""
+    if not isinstance(values, np.memmap) or not values.flags.c_contiguous:
+        return None
+    root = values
+    while isinstance(root.base, np.memmap):
+        root = root.base
+    return root.filename, root.offset + values.ctypes.data - root.ctypes.data
+
+
+class _SliceLocation(NamedTuple):
+    """Backing files and byte offsets of a `TickSlice`, to map it again in another process."""
+
+    files: Tuple[str, str, str]
+    offsets: Tuple[int, int, int]
+    length: int
+
+    def map(self) -> "TickSlice":
+        return TickSlice(
+            *(
+                np.memmap(file, dtype=_DTYPES[column], mode="r", offset=offset, shape=(self.length,))
+                for file, offset, column in zip(self.files, self.offsets, _COLUMNS)
+            )
+        )
+
+
+class TickSlice(NamedTuple):
+    """Memory-mapped tick columns of a `TickStore`, accepted as ticks by the bar functions."""
+
+    timestamps_ns: np.ndarray
+    prices: np.ndarray
+    volumes: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.timestamps_ns)
+
+    def _tick_columns(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        return self.prices, self.volumes, self.timestamps_ns
+
+    def _location(self) -> Optional[_SliceLocation]:
+        # Only non-empty slices read from a `TickStore` are backed by files
+        locations = [_memmap_location(values) for values in self]
+        dtypes_match = all(
+            values.dtype == np.dtype(_DTYPES[column]) for values, column in zip(self, _COLUMNS)
+        )
+        if len(self) == 0 or not dtypes_match or any(location is None for location in locations):
+            return None
+        files, offsets = zip(*locations)
+        return _SliceLocation(files, offsets, len(self))
+
+    def to_pandas(self) -> pd.DataFrame:
+        """Copy the slice into a DataFrame indexed by datetime, with 'price' and 'volume' columns."""
+        return pd.DataFrame(
+            {"price": np.array(self.prices), "volume": np.array(self.volumes)},
+            index=pd.DatetimeIndex(
+                np.array(self.timestamps_ns).view("datetime64[ns]"), name="datetime"
+            ),
+        )
+
+
+class TickStore:
+    """
+    Append-only on-disk tick store with memory-mapped reads.
+
+    Ticks are kept in a folder as three raw binary columns (int64 nanosecond UTC timestamps,
+    float64 prices and float64 volumes) plus a per-day index holding the offset of the first tick
+    of each day. Reading a date range only maps the files: the returned `TickSlice` holds
+    `np.memmap` views, which the `ticks_to_*_bars` functions accept directly without parsing or
+    copying the ticks.
+
+    Parameters
+    ----------
+    path : str
+        Folder of the store, created if it does not exist.
+
+    Examples
+    --------
+    >>> store = TickStore("ticks/EURUSD")
+    >>> store.append(ticks)  # DataFrame indexed by datetime with 'price' and 'volume' columns
+    >>> bars = ticks_to_volume_bars(store.read("2024-03-01", "2024-04-01"), volume_per_bar=1_000)
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        os.makedirs(path, exist_ok=True)
+        for name in list(_COLUMNS.values()) + [_DAY_INDEX]:
+            open(os.path.join(path, name), "ab").close()
+
+        lengths = {
+            os.path.getsize(self._file(col)) // np.dtype(_DTYPES[col]).itemsize for col in _COLUMNS
+        }
+        if len(lengths) != 1:
+            raise ValueError(f"Corrupted tick store '{path}': columns have different lengths.")
+
+    def _file(self, column: str) -> str:
+        return os.path.join(self.path, _COLUMNS[column])
+
+    def _map(self, column: str) -> np.ndarray:
+        dtype = _DTYPES[column]
+        if os.path.getsize(self._file(column)) == 0:
+            return np.empty(0, dtype=dtype)
+        return np.memmap(self._file(column), dtype=dtype, mode="r")
+
+    def _day_index(self) -> np.ndarray:
+        return np.fromfile(os.path.join(self.path, _DAY_INDEX), dtype="<i8").reshape(-1, 2)
+
+    def __len__(self) -> int:
+        return os.path.getsize(self._file("timestamps_ns")) // 8
+
+    @property
+    def days(self) -> pd.DatetimeIndex:
+        """UTC days holding at least one tick."""
+        return pd.DatetimeIndex((self._day_index()[:, 0] * _DAY_NS).view("datetime64[ns]"))
+
+    def append(
+        self,
+        df,
+        col_price: str = "price",
+        col_volume: str = "volume",
+        col_time: str = "datetime",
+    ) -> None:
+        """
+        Append ticks at the end of the store.
+
+        Parameters
+        ----------
+        df : pd.DataFrame, pyarrow.Table or polars.DataFrame
+            Ticks sorted by time, none of them earlier than the last stored tick. Pandas
+            DataFrames are indexed by datetime, the other inputs hold their timestamps in `col_time`.
+        col_price : str, default="price"
+            Name of the column containing tick prices.
+        col_volume : str, default="volume"
+            Name of the column containing tick volumes.
+        col_time : str, default="datetime"
+            Name of the timestamp column for pyarrow and polars inputs.
+        """
+        prices, volumes, timestamps_ns = _tick_arrays(df, col_price, col_volume, col_time)
+        if len(timestamps_ns) == 0:
+            return
+        if (np.diff(timestamps_ns) < 0).any():
+            raise ValueError("Ticks must be sorted by time to be appended.")
+
+        n_stored = len(self)
+        stored = self._map("timestamps_ns")
+        if n_stored and timestamps_ns[0] < stored[-1]:
+            raise ValueError("Ticks cannot be appended before the last stored tick.")
+
+        # A new day starts on every change of UTC day, the first tick only if its day is new
+        days = timestamps_ns // _DAY_NS
+        new_day = np.empty(len(days), dtype=bool)
+        new_day[0] = n_stored == 0 or days[0] != stored[-1] // _DAY_NS
+        new_day[1:] = days[1:] != days[:-1]
+        index = np.column_stack((days[new_day], np.flatnonzero(new_day) + n_stored))
+
+        # Columns first and the index last, so that an interrupted append never indexes missing ticks
+        for column, values in (
+            ("timestamps_ns", timestamps_ns),
+            ("prices", prices),
+            ("volumes", volumes),
+        ):
+            with open(self._file(column), "ab") as f:
+                values.astype(_DTYPES[column], copy=False).tofile(f)
+        with open(os.path.join(self.path, _DAY_INDEX), "ab") as f:
+            index.astype("<i8").tofile(f)
+
+    def read(self, start=None, end=None) -> TickSlice:
+        """
+        Memory-mapped ticks with `start <= time < end`.
+
+        Parameters
+        ----------
+        start : str or pd.Timestamp, optional
+            First time included (UTC). Defaults to the first tick.
+        end : str or pd.Timestamp, optional
+            First time excluded (UTC). Defaults to after the last tick.
+
+        Returns
+        -------
+        TickSlice
+            `np.memmap` views of the timestamps (int64 nanoseconds), prices and volumes.
+        """
+        timestamps_ns = self._map("timestamps_ns")
+        lo, hi = 0, len(timestamps_ns)
+        day_index = self._day_index()
+
+        # The day index narrows the search to the first and last days, which are then bisected
+        if start is not None:
+            start_ns = pd.Timestamp(start).value
+            day = np.searchsorted(day_index[:, 0], start_ns // _DAY_NS)
+            if day < len(day_index):
+                lo = day_index[day, 1]
+                day_end = day_index[day + 1, 1] if day + 1 < len(day_index) else hi
+                lo += np.searchsorted(timestamps_ns[lo:day_end], start_ns)
+            else:
+                lo = hi
+        if end is not None:
+            end_ns = pd.Timestamp(end).value
+            day = np.searchsorted(day_index[:, 0], end_ns // _DAY_NS)
+            if day < len(day_index):
+                day_start = day_index[day, 1]
+                day_end = day_index[day + 1, 1] if day + 1 < len(day_index) else len(timestamps_ns)
+                hi = day_start + np.searchsorted(timestamps_ns[day_start:day_end], end_ns)
+            hi = max(hi, lo)
+
+        rows = slice(lo, hi)
+        return TickSlice(timestamps_ns[rows], self._map("prices")[rows], self._map("volumes")[rows])
+
+    def _tick_columns(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        return self.read()._tick_columns()
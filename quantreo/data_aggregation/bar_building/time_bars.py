@@ -1,10 +1,27 @@
+import math
 import pandas as pd
 import numpy as np
-from numba import njit
-from typing import Callable, List, Tuple
+from functools import reduce
+from numba import get_num_threads, njit, prange
+from typing import Callable, Dict, List, Tuple, Union
 
+from .engine import (
+    _EXTRA_NONE,
+    _compute_additional_metrics,
+    _compute_extra_columns,
+    _empty_extra,
+    _extra_mode,
+    _fill_bars,
+    _fill_bars_parallel,
+    _fill_sliding_bars,
+    _merge_bars,
+    _merge_extra,
+    _tick_arrays,
+    _to_bar_frame,
+)
 
-@njit
+
+@njit(nogil=True)
 def _build_time_bars(prices, volumes, timestamps_ns, window_ns):
     start_ts = timestamps_ns[0] // window_ns * window_ns
     end_ts = timestamps_ns[-1] // window_ns * window_ns + window_ns
@@ -63,13 +80,418 @@ def _build_time_bars(prices, volumes, timestamps_ns, window_ns):
     )
 
 
+@njit(nogil=True)
+def _time_bar_scan(timestamps_ns, window_ns, record, starts, ends):
+    n = len(timestamps_ns)
+    if n == 0:
+        return 0
+
+    n_bars = 0
+    start = 0
+    current_bin = timestamps_ns[0] // window_ns
+
+    for i in range(1, n):
+        bin_idx = timestamps_ns[i] // window_ns
+        if bin_idx != current_bin:
+            if record:
+                starts[n_bars] = start
+                ends[n_bars] = i
+            n_bars += 1
+            start = i
+            current_bin = bin_idx
+
+    if record:
+        starts[n_bars] = start
+        ends[n_bars] = n
+    return n_bars + 1
+
+
+@njit(nogil=True)
+def _time_bar_boundaries(timestamps_ns, window_ns):
+    # Only the non-empty periods are materialised, so memory follows the number of bars
+    empty = np.empty(0, dtype=np.int64)
+    n_bars = _time_bar_scan(timestamps_ns, window_ns, False, empty, empty)
+
+    starts = np.empty(n_bars, dtype=np.int64)
+    ends = np.empty(n_bars, dtype=np.int64)
+    _time_bar_scan(timestamps_ns, window_ns, True, starts, ends)
+    return starts, ends
+
+
+@njit(nogil=True, parallel=True)
+def _time_bar_boundaries_parallel(timestamps_ns, window_ns):
+    # A bar starts wherever the bin of a tick differs from the bin of the previous tick. That test
+    # only looks one tick back, so each chunk of ticks finds its bar starts on its own, including
+    # for bins straddling two chunks, and the chunks are stitched together with a prefix sum
+    n = len(timestamps_ns)
+    if n == 0:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+
+    n_chunks = min(get_num_threads(), n)
+    chunk_size = (n + n_chunks - 1) // n_chunks
+
+    counts = np.zeros(n_chunks, dtype=np.int64)
+    for c in prange(n_chunks):
+        for i in range(max(c * chunk_size, 1), min((c + 1) * chunk_size, n)):
+            if timestamps_ns[i] // window_ns != timestamps_ns[i - 1] // window_ns:
+                counts[c] += 1
+
+    offsets = np.zeros(n_chunks + 1, dtype=np.int64)
+    offsets[1:] = np.cumsum(counts)
+    n_bars = offsets[-1] + 1
+
+    starts = np.empty(n_bars, dtype=np.int64)
+    starts[0] = 0
+    for c in prange(n_chunks):
+        j = offsets[c] + 1
+        for i in range(max(c * chunk_size, 1), min((c + 1) * chunk_size, n)):
+            if timestamps_ns[i] // window_ns != timestamps_ns[i - 1] // window_ns:
+                starts[j] = i
+                j += 1
+
+    ends = np.empty(n_bars, dtype=np.int64)
+    ends[:-1] = starts[1:]
+    ends[-1] = n
+    return starts, ends
+
+
+@njit(nogil=True)
+def _sliding_time_bar_scan(timestamps_ns, window_ns, step_ns, record, times, starts, ends):
+    # Windows [t, t + window) start on every multiple t of the step up to the last tick. Empty
+    # windows are skipped by jumping to the first step whose window reaches the next tick
+    n = len(timestamps_ns)
+    if n == 0:
+        return 0
+
+    n_bars = 0
+    t = timestamps_ns[0] // step_ns * step_ns
+    lo = 0
+    hi = 0
+    while t <= timestamps_ns[-1]:
+        while timestamps_ns[lo] < t:
+            lo += 1
+        while hi < n and timestamps_ns[hi] < t + window_ns:
+            hi += 1
+        if hi > lo:
+            if record:
+                times[n_bars] = t
+                starts[n_bars] = lo
+                ends[n_bars] = hi
+            n_bars += 1
+            t += step_ns
+        else:
+            t = max(t + step_ns, ((timestamps_ns[lo] - window_ns) // step_ns + 1) * step_ns)
+    return n_bars
+
+
+@njit(nogil=True)
+def _sliding_time_bar_boundaries(timestamps_ns, window_ns, step_ns):
+    empty = np.empty(0, dtype=np.int64)
+    n_bars = _sliding_time_bar_scan(timestamps_ns, window_ns, step_ns, False, empty, empty, empty)
+
+    times = np.empty(n_bars, dtype=np.int64)
+    starts = np.empty(n_bars, dtype=np.int64)
+    ends = np.empty(n_bars, dtype=np.int64)
+    _sliding_time_bar_scan(timestamps_ns, window_ns, step_ns, True, times, starts, ends)
+    return times, starts, ends
+
+
+@njit(nogil=True)
+def _build_time_bars_sparse(
+    prices, volumes, timestamps_ns, bucket_ns, window_ns, parallel=False, extra_mode=_EXTRA_NONE
+):
+    # Ticks are bucketed on `bucket_ns` (the tick timestamps, or their shifted local time), and the
+    # returned bar times are the bucket starts in that same time scale. The built-in columns are
+    # returned next to the `_build_time_bars` layout
+    if parallel:
+        starts, ends = _time_bar_boundaries_parallel(bucket_ns, window_ns)
+        bars, extra = _fill_bars_parallel(prices, volumes, timestamps_ns, starts, ends, extra_mode)
+    else:
+        starts, ends = _time_bar_boundaries(bucket_ns, window_ns)
+        bars, extra = _fill_bars(prices, volumes, timestamps_ns, starts, ends, extra_mode)
+    _, opens, highs, lows, closes, vols, counts, _, high_times, low_times = bars
+    times = bucket_ns[starts] // window_ns * window_ns
+    return (
+        times,
+        opens,
+        highs,
+        lows,
+        closes,
+        vols,
+        counts,
+        starts,
+        ends,
+        high_times,
+        low_times,
+    ), extra
+
+
+@njit(nogil=True)
+def _build_sliding_time_bars(
+    prices, volumes, timestamps_ns, bucket_ns, window_ns, step_ns, extra_mode
+):
+    # Same layout as `_build_time_bars_sparse`, for overlapping windows
+    times, starts, ends = _sliding_time_bar_boundaries(bucket_ns, window_ns, step_ns)
+    bars, extra = _fill_sliding_bars(prices, volumes, timestamps_ns, starts, ends, extra_mode)
+    _, opens, highs, lows, closes, vols, counts, _, high_times, low_times = bars
+    return (
+        times,
+        opens,
+        highs,
+        lows,
+        closes,
+        vols,
+        counts,
+        starts,
+        ends,
+        high_times,
+        low_times,
+    ), extra
+
+
+@njit(nogil=True)
+def _is_sorted(timestamps_ns):
+    for i in range(1, len(timestamps_ns)):
+        if timestamps_ns[i] < timestamps_ns[i - 1]:
+            return False
+    return True
+
+
+_DAY_NS = 86_400_000_000_000
+
+
+def _utc_offset_table(timezone: str, timestamps_ns: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    UTC offsets of `timezone` over the span of the ticks, as (transition times, offsets) in ns.
+
+    The offsets are sampled every 15 minutes from the day before the first tick to the day after
+    the last one, which catches every DST change (they all happen on a quarter hour).
+    """
+    never = np.array([np.iinfo(np.int64).min], dtype=np.int64)
+    if timezone is None or len(timestamps_ns) == 0:
+        return never, np.zeros(1, dtype=np.int64)
+
+    grid = pd.date_range(
+        pd.Timestamp(timestamps_ns[0] // _DAY_NS * _DAY_NS - _DAY_NS, tz="UTC"),
+        pd.Timestamp(timestamps_ns[-1] + _DAY_NS, tz="UTC"),
+        freq="15min",
+    )
+    offsets = grid.tz_convert(timezone).tz_localize(None).asi8 - grid.asi8
+    changes = np.flatnonzero(np.diff(offsets)) + 1
+    return np.concatenate((never, grid.asi8[changes])), np.concatenate(
+        (offsets[:1], offsets[changes])
+    )
+
+
+@njit(nogil=True)
+def _bucket_timestamps(timestamps_ns, transitions_ns, utc_offsets_ns, offset_ns):
+    # Local wall-clock time minus the period offset. Ticks are sorted, so the UTC offset in effect
+    # is found by walking the transition table alongside them
+    out = np.empty(len(timestamps_ns), dtype=np.int64)
+    j = 0
+    for i in range(len(timestamps_ns)):
+        while j + 1 < len(transitions_ns) and timestamps_ns[i] >= transitions_ns[j + 1]:
+            j += 1
+        out[i] = timestamps_ns[i] + utc_offsets_ns[j] - offset_ns
+    return out
+
+
+@njit(nogil=True)
+def _period_starts_utc(
+    times, first_ticks_ns, first_buckets_ns, transitions_ns, utc_offsets_ns, offset_ns
+):
+    # A local period start is converted with the UTC offset in effect at that start, which differs
+    # from the one of its first tick when a DST change falls in between. A start repeated by a
+    # fall-back gives the latest occurrence before the first tick, and a start skipped by a
+    # spring-forward keeps the offset of the first tick
+    out = np.empty(len(times), dtype=np.int64)
+    n = len(transitions_ns)
+    for k in range(len(times)):
+        local = times[k] + offset_ns
+        out[k] = times[k] + first_ticks_ns[k] - first_buckets_ns[k]
+        found = False
+        j0 = np.searchsorted(transitions_ns, local, side="right") - 1
+        for j in range(max(j0 - 1, 0), min(j0 + 2, n)):
+            utc = local - utc_offsets_ns[j]
+            if utc < transitions_ns[j] or (j + 1 < n and utc >= transitions_ns[j + 1]):
+                continue
+            if utc <= first_ticks_ns[k] and (not found or utc > out[k]):
+                out[k] = utc
+                found = True
+    return out
+
+
+@njit(nogil=True)
+def _session_mask(bucket_ns, offset_ns, open_ns, close_ns):
+    # Sessions crossing midnight (open after close) keep the ticks after the open or before the close
+    mask = np.empty(len(bucket_ns), dtype=np.bool_)
+    for i in range(len(bucket_ns)):
+        time_of_day = (bucket_ns[i] + offset_ns) % _DAY_NS
+        if open_ns < close_ns:
+            mask[i] = open_ns <= time_of_day < close_ns
+        else:
+            mask[i] = time_of_day >= open_ns or time_of_day < close_ns
+    return mask
+
+
+def _time_of_day_ns(value: str) -> int:
+    # "09:30" is not understood by pd.Timedelta, "09:30:00" is
+    if isinstance(value, str) and value.count(":") == 1:
+        value += ":00"
+    value = pd.Timedelta(value).value
+    if not 0 <= value < _DAY_NS:
+        raise ValueError("session bounds must be times of day between 00:00 and 24:00.")
+    return value
+
+
+def _calendar_buckets(timestamps_ns, timezone, offset, session):
+    """
+    Bucketing timestamps of the ticks for a timezone, a period offset and a trading session.
+
+    Returns the local time of the ticks minus the offset, on which the periods are aligned, the
+    boolean mask of the ticks within the session (None without session), and the (transition
+    times, UTC offsets, period offset) needed to label the periods in UTC.
+    """
+    offset_ns = pd.Timedelta(offset).value if offset is not None else 0
+    transitions_ns, utc_offsets_ns = _utc_offset_table(timezone, timestamps_ns)
+    bucket_ns = _bucket_timestamps(timestamps_ns, transitions_ns, utc_offsets_ns, offset_ns)
+
+    mask = None
+    if session is not None:
+        open_ns, close_ns = (_time_of_day_ns(bound) for bound in session)
+        if open_ns == close_ns:
+            raise ValueError("session open and close must be different.")
+        mask = _session_mask(bucket_ns, offset_ns, open_ns, close_ns)
+
+    return bucket_ns, mask, (transitions_ns, utc_offsets_ns, offset_ns)
+
+
+def _calendar_ticks(prices, volumes, timestamps_ns, timezone, offset, session):
+    """
+    Ticks within the session (prices, volumes, timestamps), their bucketing timestamps, and the
+    (transition times, UTC offsets, period offset) needed to label the periods in UTC.
+    """
+    bucket_ns, mask, calendar = _calendar_buckets(timestamps_ns, timezone, offset, session)
+    if mask is not None:
+        prices, volumes, timestamps_ns, bucket_ns = (
+            x[mask] for x in (prices, volumes, timestamps_ns, bucket_ns)
+        )
+
+    return prices, volumes, timestamps_ns, bucket_ns, calendar
+
+
+def _label_periods(times, starts, timestamps_ns, bucket_ns, calendar):
+    """UTC start times of the periods, from their starts in bucketing time."""
+    if calendar is None:
+        return times
+    return _period_starts_utc(times, timestamps_ns[starts], bucket_ns[starts], *calendar)
+
+
+def _multi_resolution_time_bars(
+    prices,
+    volumes,
+    timestamps_ns,
+    bucket_ns,
+    calendar,
+    resample_factors,
+    additional_metrics,
+    extra,
+    compact,
+    parallel,
+    output,
+):
+    windows = {factor: pd.to_timedelta(factor).value for factor in resample_factors}
+    extra_mode = _extra_mode(extra)
+
+    # Ticks are binned once at the greatest common divisor of all the windows, every requested
+    # resolution is then cascaded from the coarsest resolution already built that divides it
+    base_ns = reduce(math.gcd, windows.values())
+    levels = {
+        base_ns: _build_time_bars_sparse(
+            prices, volumes, timestamps_ns, bucket_ns, base_ns, parallel, extra_mode
+        )
+    }
+
+    bars = {}
+    for factor in sorted(set(resample_factors), key=windows.get):
+        window_ns = windows[factor]
+        if window_ns not in levels:
+            finer_ns = max(w for w in levels if window_ns % w == 0)
+            (
+                (
+                    times,
+                    opens,
+                    highs,
+                    lows,
+                    closes,
+                    vols,
+                    counts,
+                    starts,
+                    ends,
+                    high_times,
+                    low_times,
+                ),
+                extra_columns,
+            ) = levels[finer_ns]
+            first, last = _time_bar_boundaries(times, window_ns)
+            extra_columns = _merge_extra(first, last, opens, closes, extra_columns, extra_mode)
+            opens, highs, lows, closes, vols, counts, high_times, low_times = _merge_bars(
+                first, last, opens, highs, lows, closes, vols, counts, high_times, low_times
+            )
+            levels[window_ns] = (
+                (
+                    times[first] // window_ns * window_ns,
+                    opens,
+                    highs,
+                    lows,
+                    closes,
+                    vols,
+                    counts,
+                    starts[first],
+                    ends[last - 1],
+                    high_times,
+                    low_times,
+                ),
+                extra_columns,
+            )
+
+        (
+            (times, opens, highs, lows, closes, vols, counts, starts, ends, high_times, low_times),
+            extra_columns,
+        ) = levels[window_ns]
+        metrics = _compute_extra_columns(extra, extra_columns, vols, compact)
+        metrics.update(
+            _compute_additional_metrics(additional_metrics, prices, volumes, starts, ends)
+        )
+        # Periods are labelled by the UTC time of their start
+        times = _label_periods(times, starts, timestamps_ns, bucket_ns, calendar)
+        bars[factor] = _to_bar_frame(
+            (times, opens, highs, lows, closes, vols, counts, None, high_times, low_times),
+            metrics,
+            compact,
+            output,
+        )
+
+    return {factor: bars[factor] for factor in resample_factors}
+
+
 def ticks_to_time_bars(
     df: pd.DataFrame,
-    resample_factor: str = "60min",
+    resample_factor: Union[str, List[str]] = "60min",
     col_price: str = "price",
     col_volume: str = "volume",
     additional_metrics: List[Tuple[Callable, str, List[str]]] = [],
-) -> pd.DataFrame:
+    compact: bool = False,
+    sparse: bool = True,
+    parallel: bool = False,
+    extra: List[str] = [],
+    timezone: str = None,
+    offset: str = None,
+    session: Tuple[str, str] = None,
+    col_time: str = "datetime",
+    output: str = "pandas",
+    step: str = None,
+) -> Union[pd.DataFrame, Dict[str, pd.DataFrame]]:
     """
     Convert tick-level data into fixed time bars using Numba, with optional additional metrics.
 
@@ -81,63 +503,206 @@ def ticks_to_time_bars(
         Name of the column containing tick prices.
     col_volume : str
         Name of the column containing tick volumes.
-    resample_factor : str
-        Resampling frequency (e.g., "1min", "5min", "1H", "1D").
+    resample_factor : str or list of str
+        Resampling frequency (e.g., "1min", "5min", "1H", "1D"). A list of frequencies builds every
+        resolution from a single pass over the ticks: ticks are binned once and the coarser bars are
+        cascaded from the finer ones, keeping `high_time` and `low_time` exact.
     additional_metrics : List of (function, source, col_names)
         Each element is a tuple of:
         - a function applied to slices of data (must return float or tuple of floats),
         - the source: "price", "volume", or "price_volume",
         - a list of column names for the output(s) of the function.
+    compact : bool, default=False
+        If True, prices and volumes are returned as float32 and tick counts as int32.
+        Timestamps are always kept exactly as datetime64[ns].
+    sparse : bool, default=True
+        If True, bars are built in a single pass over the sorted ticks that only allocates the
+        non-empty periods, so memory is proportional to ticks and bars rather than to the calendar
+        span. If False, every period between the first and last tick is allocated. Always True
+        with `timezone`, `offset`, `session` or `extra`.
+    parallel : bool, default=False
+        If True, the bins are located and filled concurrently on all the threads available to
+        numba (see `numba.set_num_threads`), using the sparse layout. The output is identical to
+        the sequential one.
+    extra : list of str, default=[]
+        Built-in columns computed in a single compiled pass over the ticks of the bars, placed
+        before the additional metrics: "vwap", "buy_volume" and "sell_volume" (tick rule, ticks
+        without price change are not counted), "signed_ticks", "realized_var" (sum of squared log
+        returns between consecutive ticks of the bar), "first_time" and "last_time".
+    timezone : str, optional
+        Timezone (e.g. "America/New_York") in which the periods are aligned, DST included: daily
+        bars then start at local midnight instead of UTC midnight. Naive tick timestamps are read
+        as UTC. A local period repeated by a DST fall-back gives a single bar when both of its
+        occurrences follow each other, and one bar per occurrence otherwise.
+    offset : str, optional
+        Shift of the period starts (e.g. "17h" for daily bars opening at 17:00, or "30min" for
+        hourly bars starting on the half hour), in the local time of `timezone`.
+    session : tuple of str, optional
+        Local trading session (open, close), e.g. ("09:30", "16:00"). Ticks outside of it are
+        excluded from the bars. A session whose open is after its close spans midnight.
+    col_time : str, default="datetime"
+        Name of the timestamp column when `df` is a pyarrow Table or a polars DataFrame, which are
+        accepted in place of a pandas DataFrame indexed by datetime.
+    output : str, default="pandas"
+        "pandas", "arrow" (pyarrow Table), "polars" (polars DataFrame) or "numpy" (dict of arrays).
+        Except for pandas, the bar start time is the first column, "time". The arrays computed by
+        the kernels are wrapped without copy.
+    step : str, optional
+        If given, overlapping bars spanning `resample_factor` are emitted every `step` (e.g. 1h
+        bars every 5min), labelled by their start, a multiple of `step`. OHLCV, high_time,
+        low_time and the `extra` columns are computed in one pass with rolling extremes and running
+        sums, so the cost does not grow with the overlap. `step` equal to `resample_factor` gives
+        the usual bars. Requires a single `resample_factor`, `sparse` and `parallel` are ignored.
 
     Returns
     -------
-    pd.DataFrame
+    pd.DataFrame or dict of pd.DataFrame
         Time bars indexed by period start time with OHLCV, tick count, and any custom metrics.
+        When `resample_factor` is a list, a dict mapping each frequency to its bars.
+        The index and the `high_time`/`low_time` columns are UTC timestamps, also when `timezone`
+        is given.
     """
-    prices = df[col_price].to_numpy(np.float64)
-    volumes = df[col_volume].to_numpy(np.float64)
-    timestamps_ns = df.index.values.astype(np.int64)
+    extra_mode = _extra_mode(extra)
+    prices, volumes, timestamps_ns = _tick_arrays(df, col_price, col_volume, col_time)
+
+    if not _is_sorted(timestamps_ns):
+        raise ValueError("Ticks must be sorted by time to build time bars.")
+
+    # With a calendar, periods are aligned on the local time of the ticks minus the offset, which
+    # the compiled bucketing uses in place of the UTC timestamps
+    if timezone is None and offset is None and session is None:
+        bucket_ns, calendar = timestamps_ns, None
+    else:
+        prices, volumes, timestamps_ns, bucket_ns, calendar = _calendar_ticks(
+            prices, volumes, timestamps_ns, timezone, offset, session
+        )
+        sparse = True
+
+    if step is not None and not isinstance(resample_factor, str):
+        raise ValueError("step requires a single resample_factor.")
+    if not isinstance(resample_factor, str):
+        return _multi_resolution_time_bars(
+            prices,
+            volumes,
+            timestamps_ns,
+            bucket_ns,
+            calendar,
+            list(resample_factor),
+            additional_metrics,
+            extra,
+            compact,
+            parallel,
+            output,
+        )
+
     window_ns = pd.to_timedelta(resample_factor).value
 
     # Call numba-accelerated function
+    if step is not None:
+        step_ns = pd.to_timedelta(step).value
+        if step_ns <= 0:
+            raise ValueError("step must be a positive duration.")
+        result, extra_columns = _build_sliding_time_bars(
+            prices, volumes, timestamps_ns, bucket_ns, window_ns, step_ns, extra_mode
+        )
+    elif parallel or sparse or extra_mode != _EXTRA_NONE:
+        result, extra_columns = _build_time_bars_sparse(
+            prices, volumes, timestamps_ns, bucket_ns, window_ns, parallel, extra_mode
+        )
+    else:
+        result = _build_time_bars(prices, volumes, timestamps_ns, window_ns)
+        extra_columns = _empty_extra(0, extra_mode)
     times, opens, highs, lows, closes, vols, counts, start_idxs, end_idxs, high_times, low_times = (
-        _build_time_bars(prices, volumes, timestamps_ns, window_ns)
+        result
     )
-
-    # Base output dictionary
-    out = {
-        "open": opens,
-        "high": highs,
-        "low": lows,
-        "close": closes,
-        "volume": vols,
-        "number_ticks": counts,
-        "high_time": pd.to_datetime(high_times),
-        "low_time": pd.to_datetime(low_times),
-    }
+    # Periods are labelled by the UTC time of their start
+    times = _label_periods(times, start_idxs, timestamps_ns, bucket_ns, calendar)
 
     # Compute additional metrics
-    for func, source, col_names in additional_metrics:
-        if source == "price":
-            data = [func(prices[start:end]) for start, end in zip(start_idxs, end_idxs)]
-        elif source == "volume":
-            data = [func(volumes[start:end]) for start, end in zip(start_idxs, end_idxs)]
-        elif source == "price_volume":
-            data = [
-                func(prices[start:end], volumes[start:end])
-                for start, end in zip(start_idxs, end_idxs)
-            ]
-        else:
-            raise ValueError(
-                f"Invalid source '{source}'. Must be 'price', 'volume', or 'price_volume'."
-            )
+    metrics = _compute_extra_columns(extra, extra_columns, vols, compact)
+    metrics.update(
+        _compute_additional_metrics(additional_metrics, prices, volumes, start_idxs, end_idxs)
+    )
 
-        if isinstance(data[0], tuple):
-            for i, name in enumerate(col_names):
-                out[name] = [row[i] for row in data]
-        else:
-            out[col_names[0]] = data
+    bars = (times, opens, highs, lows, closes, vols, counts, None, high_times, low_times)
+    return _to_bar_frame(bars, metrics, compact, output)
+
+
+def time_bar_boundaries(
+    df: pd.DataFrame,
+    resample_factor: str = "60min",
+    col_price: str = "price",
+    col_volume: str = "volume",
+    parallel: bool = False,
+    timezone: str = None,
+    offset: str = None,
+    session: Tuple[str, str] = None,
+    col_time: str = "datetime",
+    step: str = None,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Locate the time bars in the ticks without building them.
+
+    Bar k holds the ticks `starts[k]:ends[k]` of `df`, the bars of `ticks_to_time_bars` called with
+    the same parameters. Per-bar statistics can then be computed on views of the tick arrays without
+    materialising OHLCV.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        DataFrame indexed by datetime, containing at least price and volume columns. A pyarrow
+        Table, a polars DataFrame or a `TickStore` are also accepted.
+    resample_factor : str, default="60min"
+        Resampling frequency (e.g., "1min", "5min", "1H", "1D").
+    col_price : str, default="price"
+        Name of the column containing tick prices.
+    col_volume : str, default="volume"
+        Name of the column containing tick volumes.
+    parallel : bool, default=False
+        If True, the bins are located concurrently on all the threads available to numba.
+    timezone : str, optional
+        Timezone in which the periods are aligned, see `ticks_to_time_bars`.
+    offset : str, optional
+        Shift of the period starts, see `ticks_to_time_bars`.
+    session : tuple of str, optional
+        Local trading session (open, close). A bar then runs from its first to its last tick within
+        the session, so a session spanning midnight may leave excluded ticks inside daily bars.
+    col_time : str, default="datetime"
+        Name of the timestamp column for pyarrow and polars inputs.
+    step : str, optional
+        Offset between the starts of overlapping bars, see `ticks_to_time_bars`.
+
+    Returns
+    -------
+    tuple of np.ndarray
+        int64 `starts` and `ends` offsets of the bars in the ticks.
+    """
+    _, _, timestamps_ns = _tick_arrays(df, col_price, col_volume, col_time)
+
+    if not _is_sorted(timestamps_ns):
+        raise ValueError("Ticks must be sorted by time to build time bars.")
+
+    mask = None
+    if timezone is None and offset is None and session is None:
+        bucket_ns = timestamps_ns
+    else:
+        bucket_ns, mask, _ = _calendar_buckets(timestamps_ns, timezone, offset, session)
+        if mask is not None:
+            bucket_ns = bucket_ns[mask]
+
+    window_ns = pd.to_timedelta(resample_factor).value
+    if step is not None:
+        step_ns = pd.to_timedelta(step).value
+        if step_ns <= 0:
+            raise ValueError("step must be a positive duration.")
+        _, starts, ends = _sliding_time_bar_boundaries(bucket_ns, window_ns, step_ns)
+    elif parallel:
+        starts, ends = _time_bar_boundaries_parallel(bucket_ns, window_ns)
+    else:
+        starts, ends = _time_bar_boundaries(bucket_ns, window_ns)
 
-    df_out = pd.DataFrame(out, index=pd.to_datetime(times))
-    df_out.index.name = "time"
-    return df_out
+    # Offsets among the ticks of the session are mapped back to offsets among all the ticks
+    if mask is not None:
+        kept = np.flatnonzero(mask)
+        starts, ends = kept[starts], kept[ends - 1] + 1
+    return starts, ends
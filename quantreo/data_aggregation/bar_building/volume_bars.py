@@ -3,49 +3,55 @@ import numpy as np
 from numba import njit
 from typing import Callable, List, Tuple
 
-
-@njit
-def _build_volume_bars(prices, volumes, timestamps_ns, volume_per_bar):
-    bars = []
-    indices = []
-
+from .engine import (
+    _compute_additional_metrics,
+    _compute_extra_columns,
+    _extra_mode,
+    _fill_bars,
+    _tick_arrays,
+    _to_bar_frame,
+)
+from .speculative import _VOLUME, _build_speculative_bars, _parallel_bar_boundaries
+
+
+@njit(nogil=True)
+def _volume_bar_scan(volumes, volume_per_bar, record, starts, ends):
+    n_bars = 0
     cum_volume = 0.0
     start = 0
-    i = 0
-    n = len(prices)
 
-    while i < n:
+    for i in range(len(volumes)):
         cum_volume += volumes[i]
 
         if cum_volume >= volume_per_bar:
-            p = prices[start : i + 1]
-            v = volumes[start : i + 1]
-            t = timestamps_ns[start : i + 1]
-
-            high_idx = np.argmax(p)
-            low_idx = np.argmin(p)
-
-            bar = (
-                t[0],
-                p[0],
-                np.max(p),
-                np.min(p),
-                p[-1],
-                np.sum(v),
-                i + 1 - start,
-                (t[-1] - t[0]) / 60_000_000_000,
-                t[high_idx],
-                t[low_idx],
-            )
-            bars.append(bar)
-            indices.append((start, i + 1))
+            if record:
+                starts[n_bars] = start
+                ends[n_bars] = i + 1
+            n_bars += 1
 
             cum_volume = 0.0
             start = i + 1
 
-        i += 1
+    return n_bars
+
+
+@njit(nogil=True)
+def _volume_bar_boundaries(volumes, volume_per_bar):
+    # Count the bars first so that the boundaries can be written into exact-size arrays
+    empty = np.empty(0, dtype=np.int64)
+    n_bars = _volume_bar_scan(volumes, volume_per_bar, False, empty, empty)
 
-    return bars, indices
+    starts = np.empty(n_bars, dtype=np.int64)
+    ends = np.empty(n_bars, dtype=np.int64)
+    _volume_bar_scan(volumes, volume_per_bar, True, starts, ends)
+    return starts, ends
+
+
+@njit(nogil=True)
+def _build_volume_bars(prices, volumes, timestamps_ns, volume_per_bar, extra_mode):
+    starts, ends = _volume_bar_boundaries(volumes, volume_per_bar)
+    bars, extra = _fill_bars(prices, volumes, timestamps_ns, starts, ends, extra_mode)
+    return bars, extra, starts, ends
 
 
 def ticks_to_volume_bars(
@@ -54,6 +60,11 @@ def ticks_to_volume_bars(
     col_price: str = "price",
     col_volume: str = "volume",
     additional_metrics: List[Tuple[Callable, str, List[str]]] = [],
+    compact: bool = False,
+    parallel: bool = False,
+    extra: List[str] = [],
+    col_time: str = "datetime",
+    output: str = "pandas",
 ) -> pd.DataFrame:
     """
     Convert tick-level data into volume-based bars, optionally enriched with custom metrics.
@@ -73,6 +84,25 @@ def ticks_to_volume_bars(
         - function : a callable applied to bar slices (can return float or tuple of floats)
         - source   : "price", "volume", or "price_volume"
         - col_names: list of strings (column names returned by the function)
+    compact : bool, default=False
+        If True, prices, volumes and durations are returned as float32 and tick counts as int32.
+        Timestamps are always kept exactly as datetime64[ns].
+    parallel : bool, default=False
+        If True, the bar boundaries are searched speculatively on chunks of ticks with all the
+        threads available to numba (see `numba.set_num_threads`), then reconciled by a short
+        sequential pass. The output is identical to the sequential one.
+    extra : list of str, default=[]
+        Built-in columns accumulated in the loop that builds the bars, placed before the
+        additional metrics: "vwap", "buy_volume" and "sell_volume" (tick rule, ticks without
+        price change are not counted), "signed_ticks", "realized_var" (sum of squared log returns
+        between consecutive ticks of the bar), "first_time" and "last_time".
+    col_time : str, default="datetime"
+        Name of the timestamp column when `df` is a pyarrow Table or a polars DataFrame, which are
+        accepted in place of a pandas DataFrame indexed by datetime.
+    output : str, default="pandas"
+        "pandas", "arrow" (pyarrow Table), "polars" (polars DataFrame) or "numpy" (dict of arrays).
+        Except for pandas, the bar start time is the first column, "time". The arrays computed by
+        the kernels are wrapped without copy.
 
     Returns
     -------
@@ -80,61 +110,65 @@ def ticks_to_volume_bars(
         Volume bars indexed by bar start time with OHLCV, metadata, and custom metric columns.
     """
 
-    prices = df[col_price].to_numpy(np.float64)
-    volumes = df[col_volume].to_numpy(np.float64)
-    timestamps_ns = df.index.values.astype("int64")
+    extra_mode = _extra_mode(extra)
+    prices, volumes, timestamps_ns = _tick_arrays(df, col_price, col_volume, col_time)
 
     # Core bar extraction
-    raw_bars, index_pairs = _build_volume_bars(prices, volumes, timestamps_ns, volume_per_bar)
-
-    if not raw_bars:
-        return pd.DataFrame(
-            columns=[
-                "open",
-                "high",
-                "low",
-                "close",
-                "volume",
-                "number_ticks",
-                "duration_minutes",
-                "high_time",
-                "low_time",
-            ]
-            + [name for _, _, names in additional_metrics for name in names]
+    if parallel:
+        bars, extra_columns, starts, ends = _build_speculative_bars(
+            _VOLUME, prices, volumes, timestamps_ns, float(volume_per_bar), extra_mode
         )
+    else:
+        bars, extra_columns, starts, ends = _build_volume_bars(
+            prices, volumes, timestamps_ns, volume_per_bar, extra_mode
+        )
+
+    # Apply additional metrics (flexible: price, volume, or both)
+    metrics = _compute_extra_columns(extra, extra_columns, bars[5], compact)
+    metrics.update(_compute_additional_metrics(additional_metrics, prices, volumes, starts, ends))
 
-    bars_np = np.array(raw_bars)
+    return _to_bar_frame(bars, metrics, compact, output)
 
-    data = {
-        "open": bars_np[:, 1],
-        "high": bars_np[:, 2],
-        "low": bars_np[:, 3],
-        "close": bars_np[:, 4],
-        "volume": bars_np[:, 5],
-        "number_ticks": bars_np[:, 6].astype(int),
-        "duration_minutes": bars_np[:, 7],
-        "high_time": pd.to_datetime(bars_np[:, 8].astype(np.int64)),
-        "low_time": pd.to_datetime(bars_np[:, 9].astype(np.int64)),
-    }
 
-    # Apply additional metrics (flexible: price, volume, or both)
-    for func, source, col_names in additional_metrics:
-        if source == "price":
-            outputs = [func(prices[start:end]) for start, end in index_pairs]
-        elif source == "volume":
-            outputs = [func(volumes[start:end]) for start, end in index_pairs]
-        elif source == "price_volume":
-            outputs = [func(prices[start:end], volumes[start:end]) for start, end in index_pairs]
-        else:
-            raise ValueError(
-                f"Invalid source '{source}'. Must be 'price', 'volume', or 'price_volume'."
-            )
-
-        if isinstance(outputs[0], tuple):
-            for i, name in enumerate(col_names):
-                data[name] = [out[i] for out in outputs]
-        else:
-            data[col_names[0]] = outputs
-
-    index = pd.to_datetime(bars_np[:, 0].astype(np.int64))
-    return pd.DataFrame(data, index=index).rename_axis("time")
+def volume_bar_boundaries(
+    df: pd.DataFrame,
+    volume_per_bar: float = 1_000_000,
+    col_price: str = "price",
+    col_volume: str = "volume",
+    parallel: bool = False,
+    col_time: str = "datetime",
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Locate the volume bars in the ticks without building them.
+
+    Bar k holds the ticks `starts[k]:ends[k]` of `df`, the bars of `ticks_to_volume_bars` called
+    with the same parameters. Per-bar statistics can then be computed on views of the tick arrays
+    without materialising OHLCV.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        Tick DataFrame indexed by datetime, must include price and volume columns. A pyarrow
+        Table, a polars DataFrame or a `TickStore` are also accepted.
+    volume_per_bar : float, default=1_000_000
+        Volume threshold that triggers a new bar.
+    col_price : str, default="price"
+        Column name representing the price of each tick.
+    col_volume : str, default="volume"
+        Column name representing the volume of each tick.
+    parallel : bool, default=False
+        If True, the boundaries are searched speculatively on chunks of ticks with all the threads
+        available to numba, then reconciled by a short sequential pass. Same output.
+    col_time : str, default="datetime"
+        Name of the timestamp column for pyarrow and polars inputs.
+
+    Returns
+    -------
+    tuple of np.ndarray
+        int64 `starts` and `ends` offsets of the bars in the ticks.
+    """
+    prices, volumes, _ = _tick_arrays(df, col_price, col_volume, col_time)
+
+    if parallel:
+        return _parallel_bar_boundaries(_VOLUME, prices, volumes, float(volume_per_bar))
+    return _volume_bar_boundaries(volumes, volume_per_bar)
@@ -1,9 +1,16 @@
 from .distribution import skewness, kurtosis
-from .volume import max_traded_volume, volume_profile_features
+from .volume import (
+    max_traded_volume,
+    rolling_volume_profile,
+    volume_profile_features,
+    volume_profile_features_batch,
+)
 
 __all__ = [
     "skewness",
     "kurtosis",
     "max_traded_volume",
     "volume_profile_features",
+    "volume_profile_features_batch",
+    "rolling_volume_profile",
 ]
@@ -1,6 +1,42 @@
 from numba import njit
 import numpy as np
-from typing import Tuple
+from typing import Dict, Tuple
+
+
+@njit(nogil=True)
+def _bin_edge(price_min, price_max, step, j, n_bins):
+    # Edges computed as by np.linspace(price_min, price_max, n_bins + 1)
+    return price_max if j == n_bins else j * step + price_min
+
+
+@njit(nogil=True)
+def _fill_volume_profile(prices, volumes, start, end, volume_per_bin):
+    # Bins split [min, max] into equal widths, so the bin of a tick is computed from its price and
+    # only checked against its two edges, instead of scanning all of them. The max price falls in
+    # the last bin, like a constant price
+    n_bins = len(volume_per_bin)
+    price_min = prices[start]
+    price_max = prices[start]
+    for i in range(start + 1, end):
+        if prices[i] < price_min:
+            price_min = prices[i]
+        elif prices[i] > price_max:
+            price_max = prices[i]
+
+    step = (price_max - price_min) / n_bins
+    for i in range(start, end):
+        price = prices[i]
+        if step > 0.0:
+            j = min(int((price - price_min) / step), n_bins - 1)
+            if price < _bin_edge(price_min, price_max, step, j, n_bins):
+                j -= 1
+            elif j < n_bins - 1 and price >= _bin_edge(price_min, price_max, step, j + 1, n_bins):
+                j += 1
+        else:
+            j = n_bins - 1
+        volume_per_bin[j] += volumes[i]
+
+    return price_min, price_max, step
 
 
 @njit
@@ -25,25 +61,16 @@ def volume_profile_features(
         - poc_price : Price level with the highest accumulated volume.
         - poc_position : Normalized position of POC between min and max price (range 0–1).
     """
-    price_min = prices.min()
-    price_max = prices.max()
-    bin_edges = np.linspace(price_min, price_max, n_bins + 1)
     volume_per_bin = np.zeros(n_bins)
-
-    for i in range(prices.shape[0]):
-        price = prices[i]
-        volume = volumes[i]
-
-        for j in range(n_bins):
-            if bin_edges[j] <= price < bin_edges[j + 1]:
-                volume_per_bin[j] += volume
-                break
-            elif j == n_bins - 1 and price == bin_edges[-1]:
-                volume_per_bin[j] += volume
-                break
+    price_min, price_max, step = _fill_volume_profile(
+        prices, volumes, 0, len(prices), volume_per_bin
+    )
 
     max_idx = np.argmax(volume_per_bin)
-    poc_price = (bin_edges[max_idx] + bin_edges[max_idx + 1]) / 2
+    poc_price = (
+        _bin_edge(price_min, price_max, step, max_idx, n_bins)
+        + _bin_edge(price_min, price_max, step, max_idx + 1, n_bins)
+    ) / 2
 
     poc_position = (
         (poc_price - price_min) / (price_max - price_min) if price_max > price_min else 0.0
@@ -83,3 +110,295 @@ def max_traded_volume(prices: np.ndarray, volumes: np.ndarray) -> Tuple[float, f
             max_idx = i
 
     return max_vol, prices[max_idx]
+
+
+@njit(nogil=True)
+def _volume_profile_batch(prices, volumes, starts, ends, n_bins, value_area, out, histograms):
+    volume_per_bin = np.empty(n_bins)
+    for k in range(len(starts)):
+        if ends[k] <= starts[k]:
+            continue
+        volume_per_bin[:] = 0.0
+        price_min, price_max, step = _fill_volume_profile(
+            prices, volumes, starts[k], ends[k], volume_per_bin
+        )
+
+        poc = np.argmax(volume_per_bin)
+        out[k, 0] = (
+            _bin_edge(price_min, price_max, step, poc, n_bins)
+            + _bin_edge(price_min, price_max, step, poc + 1, n_bins)
+        ) / 2
+        out[k, 1] = (out[k, 0] - price_min) / (price_max - price_min) if step > 0.0 else 0.0
+
+        # The value area grows from the POC towards the heavier neighbouring bin, until it holds
+        # the requested share of the bar volume
+        if value_area > 0.0:
+            target = value_area * volume_per_bin.sum()
+            low = poc
+            high = poc
+            area = volume_per_bin[poc]
+            while area < target and (low > 0 or high < n_bins - 1):
+                below = volume_per_bin[low - 1] if low > 0 else -1.0
+                above = volume_per_bin[high + 1] if high < n_bins - 1 else -1.0
+                if above >= below:
+                    high += 1
+                    area += above
+                else:
+                    low -= 1
+                    area += below
+            out[k, 2] = _bin_edge(price_min, price_max, step, high + 1, n_bins)
+            out[k, 3] = _bin_edge(price_min, price_max, step, low, n_bins)
+
+        if histograms.shape[0] > 0:
+            histograms[k, :] = volume_per_bin
+
+
+def volume_profile_features_batch(
+    prices: np.ndarray,
+    volumes: np.ndarray,
+    starts: np.ndarray,
+    ends: np.ndarray,
+    n_bins: int = 20,
+    value_area: float = None,
+    return_histogram: bool = False,
+) -> Dict[str, np.ndarray]:
+    """
+    Volume profile features of every bar in a single compiled pass over the ticks.
+
+    Same POC as `volume_profile_features` applied to each bar, but the ticks of all the bars are
+    binned in one call (O(ticks), the bin of a tick being computed from its price), for instance on
+    the offsets returned by the `*_bar_boundaries` functions.
+
+    Parameters
+    ----------
+    prices : np.ndarray
+        1D array of price values corresponding to each tick.
+    volumes : np.ndarray
+        1D array of traded volume at each tick.
+    starts : np.ndarray
+        First tick offset of each bar.
+    ends : np.ndarray
+        Offset following the last tick of each bar.
+    n_bins : int, default=20
+        Number of price bins to use for the volume profile of each bar.
+    value_area : float, optional
+        Share of the bar volume (e.g., 0.7) held by the value area. If given, the value area high
+        and low are returned. The area grows from the POC bin towards its heavier neighbour.
+    return_histogram : bool, default=False
+        If True, the volume of every bin of every bar is also returned.
+
+    Returns
+    -------
+    dict of np.ndarray
+        - poc_price : Price level with the highest accumulated volume in each bar.
+        - poc_position : Normalized position of the POC between min and max price (range 0–1).
+        - value_area_high, value_area_low : Bounds of the value area (with `value_area`).
+        - histogram : float32 array of shape (n_bars, n_bins), from the lowest to the highest
+          price bin (with `return_histogram`).
+        Empty bars get NaN features and a zero histogram.
+    """
+    if n_bins < 1:
+        raise ValueError("n_bins must be a positive integer.")
+    if value_area is not None and not 0.0 < value_area <= 1.0:
+        raise ValueError("value_area must be in (0, 1].")
+
+    prices = np.asarray(prices, dtype=np.float64)
+    volumes = np.asarray(volumes, dtype=np.float64)
+    starts = np.asarray(starts, dtype=np.int64)
+    ends = np.asarray(ends, dtype=np.int64)
+
+    out = np.full((len(starts), 4), np.nan)
+    histograms = np.zeros((len(starts) if return_histogram else 0, n_bins), dtype=np.float32)
+    _volume_profile_batch(prices, volumes, starts, ends, n_bins, value_area or 0.0, out, histograms)
+
+    features = {"poc_price": out[:, 0], "poc_position": out[:, 1]}
+    if value_area is not None:
+        features["value_area_high"] = out[:, 2]
+        features["value_area_low"] = out[:, 3]
+    if return_histogram:
+        features["histogram"] = histograms
+    return features
+
+
+@njit(nogil=True)
+def _bars_price_range(prices, starts, ends):
+    price_min = np.inf
+    price_max = -np.inf
+    for k in range(len(starts)):
+        for i in range(starts[k], ends[k]):
+            price_min = min(price_min, prices[i])
+            price_max = max(price_max, prices[i])
+    return price_min, price_max
+
+
+@njit(nogil=True)
+def _bar_histograms(prices, volumes, starts, ends, origin, bin_size, n_grid):
+    # Histogram of each bar over its own range [lo, hi] of the global grid, stored back to back
+    n_bars = len(starts)
+    lo = np.zeros(n_bars, dtype=np.int64)
+    hi = np.full(n_bars, -1, dtype=np.int64)
+    offsets = np.zeros(n_bars + 1, dtype=np.int64)
+    for k in range(n_bars):
+        if ends[k] > starts[k]:
+            lo[k] = n_grid - 1
+            hi[k] = 0
+            for i in range(starts[k], ends[k]):
+                j = min(int((prices[i] - origin) / bin_size), n_grid - 1)
+                lo[k] = min(lo[k], j)
+                hi[k] = max(hi[k], j)
+        offsets[k + 1] = offsets[k] + hi[k] - lo[k] + 1
+
+    histograms = np.zeros(offsets[-1])
+    for k in range(n_bars):
+        for i in range(starts[k], ends[k]):
+            j = min(int((prices[i] - origin) / bin_size), n_grid - 1)
+            histograms[offsets[k] + j - lo[k]] += volumes[i]
+    return lo, hi, offsets, histograms
+
+
+@njit(nogil=True)
+def _rolling_volume_profile(
+    prices, volumes, starts, ends, window_starts, origin, bin_size, n_grid, value_area, out
+):
+    lo, hi, offsets, histograms = _bar_histograms(
+        prices, volumes, starts, ends, origin, bin_size, n_grid
+    )
+    composite = np.zeros(n_grid)
+
+    # Monotonic deques of the bars of the window, giving the lowest and highest used bins
+    n_bars = len(starts)
+    low_deque = np.empty(n_bars, dtype=np.int64)
+    high_deque = np.empty(n_bars, dtype=np.int64)
+    low_head, low_tail, high_head, high_tail = 0, 0, 0, 0
+
+    left = 0
+    for k in range(n_bars):
+        while left < window_starts[k]:
+            for j in range(lo[left], hi[left] + 1):
+                composite[j] -= histograms[offsets[left] + j - lo[left]]
+            left += 1
+        for j in range(lo[k], hi[k] + 1):
+            composite[j] += histograms[offsets[k] + j - lo[k]]
+
+        if hi[k] >= lo[k]:
+            while low_tail > low_head and lo[low_deque[low_tail - 1]] >= lo[k]:
+                low_tail -= 1
+            low_deque[low_tail] = k
+            low_tail += 1
+            while high_tail > high_head and hi[high_deque[high_tail - 1]] <= hi[k]:
+                high_tail -= 1
+            high_deque[high_tail] = k
+            high_tail += 1
+        while low_tail > low_head and low_deque[low_head] < left:
+            low_head += 1
+        while high_tail > high_head and high_deque[high_head] < left:
+            high_head += 1
+        if low_tail == low_head:
+            continue
+
+        first = lo[low_deque[low_head]]
+        last = hi[high_deque[high_head]]
+        poc = first + np.argmax(composite[first : last + 1])
+        out[k, 0] = origin + (poc + 0.5) * bin_size
+
+        # Same value area as `volume_profile_features_batch`, over the bins used by the window
+        target = value_area * composite[first : last + 1].sum()
+        low = poc
+        high = poc
+        area = composite[poc]
+        while area < target and (low > first or high < last):
+            below = composite[low - 1] if low > first else -1.0
+            above = composite[high + 1] if high < last else -1.0
+            if above >= below:
+                high += 1
+                area += above
+            else:
+                low -= 1
+                area += below
+        out[k, 1] = origin + (high + 1) * bin_size
+        out[k, 2] = origin + low * bin_size
+
+
+def rolling_volume_profile(
+    prices: np.ndarray,
+    volumes: np.ndarray,
+    starts: np.ndarray,
+    ends: np.ndarray,
+    bin_size: float,
+    window: int = None,
+    sessions: np.ndarray = None,
+    value_area: float = 0.7,
+) -> Dict[str, np.ndarray]:
+    """
+    Rolling composite volume profile (POC and value area) over the last bars or the session.
+
+    Every bar is binned once on a price grid shared by all the bars, then the composite profile
+    of the window is updated by adding the histogram of the new bar and subtracting the ones of
+    the bars leaving it, instead of re-binning the ticks of every overlapping window.
+
+    Parameters
+    ----------
+    prices : np.ndarray
+        1D array of price values corresponding to each tick.
+    volumes : np.ndarray
+        1D array of traded volume at each tick.
+    starts : np.ndarray
+        First tick offset of each bar.
+    ends : np.ndarray
+        Offset following the last tick of each bar.
+    bin_size : float
+        Price width of the bins of the shared grid (e.g., a multiple of the tick size), which starts
+        at the lowest price.
+    window : int, optional
+        Number of bars in the rolling window, the current one included. If None, the profile
+        accumulates all the bars (of the session, with `sessions`).
+    sessions : np.ndarray, optional
+        Session label of each bar (e.g., its trading date). The window restarts at every change of
+        label.
+    value_area : float, default=0.7
+        Share of the window volume held by the value area, grown from the POC bin towards its
+        heavier neighbour.
+
+    Returns
+    -------
+    dict of np.ndarray
+        One value per bar, for the window ending with it:
+        - poc_price : Middle of the bin with the highest accumulated volume.
+        - value_area_high, value_area_low : Bounds of the value area.
+        NaN while the window holds no tick.
+    """
+    if bin_size <= 0:
+        raise ValueError("bin_size must be positive.")
+    if window is not None and window < 1:
+        raise ValueError("window must be a positive integer.")
+    if not 0.0 < value_area <= 1.0:
+        raise ValueError("value_area must be in (0, 1].")
+
+    prices = np.asarray(prices, dtype=np.float64)
+    volumes = np.asarray(volumes, dtype=np.float64)
+    starts = np.asarray(starts, dtype=np.int64)
+    ends = np.asarray(ends, dtype=np.int64)
+    n_bars = len(starts)
+
+    # First bar of the window ending with each bar
+    window_starts = np.zeros(n_bars, dtype=np.int64)
+    if window is not None:
+        window_starts = np.maximum(np.arange(n_bars, dtype=np.int64) - window + 1, 0)
+    if sessions is not None:
+        sessions = np.asarray(sessions)
+        if len(sessions) != n_bars:
+            raise ValueError("sessions must hold one label per bar.")
+        new_session = np.ones(n_bars, dtype=bool)
+        new_session[1:] = sessions[1:] != sessions[:-1]
+        session_starts = np.maximum.accumulate(np.where(new_session, np.arange(n_bars), 0))
+        window_starts = np.maximum(window_starts, session_starts)
+
+    out = np.full((n_bars, 3), np.nan)
+    origin, price_max = _bars_price_range(prices, starts, ends)
+    if origin <= price_max:
+        n_grid = int((price_max - origin) / bin_size) + 1
+        _rolling_volume_profile(
+            prices, volumes, starts, ends, window_starts, origin, bin_size, n_grid, value_area, out
+        )
+
+    return {"poc_price": out[:, 0], "value_area_high": out[:, 1], "value_area_low": out[:, 2]}
@@ -0,0 +1,402 @@
+from numba import njit
+import numpy as np
+from typing import Tuple
+
+# Segmented reductions over the ticks of every bar at once. A segment k covers
+# `values[starts[k]:ends[k]]`, the layout returned by the `*_bar_boundaries` functions, and each
+# primitive returns one value per segment. An empty segment gives NaN, except in `segment_sum`,
+# `segment_skewness` and `segment_kurtosis` (0) and in the offsets of `segment_min` and
+# `segment_max` (-1). They are numba-compiled, so they can also be called from a user's own
+# `@njit` code.
+
+
+@njit(nogil=True)
+def segment_sum(values: np.ndarray, starts: np.ndarray, ends: np.ndarray) -> np.ndarray:
+    """
+    Sum of the values of each segment.
+
+    Parameters
+    ----------
+    values : np.ndarray
+        1D array of values (e.g., tick prices or volumes).
+    starts : np.ndarray
+        First offset of each segment.
+    ends : np.ndarray
+        Offset following the last value of each segment.
+
+    Returns
+    -------
+    np.ndarray
+        Sum of each segment (0 for an empty segment).
+    """
+    out = np.zeros(len(starts), dtype=np.float64)
+    for k in range(len(starts)):
+        total = 0.0
+        for i in range(starts[k], ends[k]):
+            total += values[i]
+        out[k] = total
+    return out
+
+
+@njit(nogil=True)
+def segment_mean(values: np.ndarray, starts: np.ndarray, ends: np.ndarray) -> np.ndarray:
+    """
+    Mean of the values of each segment.
+
+    Parameters
+    ----------
+    values : np.ndarray
+        1D array of values (e.g., tick prices or volumes).
+    starts : np.ndarray
+        First offset of each segment.
+    ends : np.ndarray
+        Offset following the last value of each segment.
+
+    Returns
+    -------
+    np.ndarray
+        Mean of each segment.
+    """
+    out = np.full(len(starts), np.nan)
+    for k in range(len(starts)):
+        n = ends[k] - starts[k]
+        if n > 0:
+            total = 0.0
+            for i in range(starts[k], ends[k]):
+                total += values[i]
+            out[k] = total / n
+    return out
+
+
+@njit(nogil=True)
+def segment_var(
+    values: np.ndarray, starts: np.ndarray, ends: np.ndarray, ddof: int = 0
+) -> np.ndarray:
+    """
+    Variance of the values of each segment, computed in one pass with Welford's algorithm.
+
+    Parameters
+    ----------
+    values : np.ndarray
+        1D array of values (e.g., tick prices or volumes).
+    starts : np.ndarray
+        First offset of each segment.
+    ends : np.ndarray
+        Offset following the last value of each segment.
+    ddof : int, default=0
+        Delta degrees of freedom, the divisor being `n - ddof` as in `np.var`.
+
+    Returns
+    -------
+    np.ndarray
+        Variance of each segment (NaN when it holds `ddof` values or fewer).
+    """
+    out = np.full(len(starts), np.nan)
+    for k in range(len(starts)):
+        n = ends[k] - starts[k]
+        if n <= ddof:
+            continue
+        mean = 0.0
+        m2 = 0.0
+        for j in range(n):
+            x = values[starts[k] + j]
+            delta = x - mean
+            mean += delta / (j + 1)
+            m2 += delta * (x - mean)
+        out[k] = m2 / (n - ddof)
+    return out
+
+
+@njit(nogil=True)
+def segment_std(
+    values: np.ndarray, starts: np.ndarray, ends: np.ndarray, ddof: int = 0
+) -> np.ndarray:
+    """
+    Standard deviation of the values of each segment.
+
+    Parameters
+    ----------
+    values : np.ndarray
+        1D array of values (e.g., tick prices or volumes).
+    starts : np.ndarray
+        First offset of each segment.
+    ends : np.ndarray
+        Offset following the last value of each segment.
+    ddof : int, default=0
+        Delta degrees of freedom, the divisor being `n - ddof` as in `np.std`.
+
+    Returns
+    -------
+    np.ndarray
+        Standard deviation of each segment.
+    """
+    return np.sqrt(segment_var(values, starts, ends, ddof))
+
+
+@njit(nogil=True)
+def segment_min(
+    values: np.ndarray, starts: np.ndarray, ends: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Minimum of each segment and its offset.
+
+    Parameters
+    ----------
+    values : np.ndarray
+        1D array of values (e.g., tick prices or volumes).
+    starts : np.ndarray
+        First offset of each segment.
+    ends : np.ndarray
+        Offset following the last value of each segment.
+
+    Returns
+    -------
+    Tuple[np.ndarray, np.ndarray]
+        - minimum : Smallest value of each segment.
+        - offset : Offset of its first occurrence in `values` (-1 for an empty segment), so that
+          `timestamps[offset]` gives the time of the minimum.
+    """
+    out = np.full(len(starts), np.nan)
+    offsets = np.full(len(starts), -1, dtype=np.int64)
+    for k in range(len(starts)):
+        if ends[k] > starts[k]:
+            best = starts[k]
+            for i in range(starts[k] + 1, ends[k]):
+                if values[i] < values[best]:
+                    best = i
+            out[k] = values[best]
+            offsets[k] = best
+    return out, offsets
+
+
+@njit(nogil=True)
+def segment_max(
+    values: np.ndarray, starts: np.ndarray, ends: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Maximum of each segment and its offset.
+
+    Parameters
+    ----------
+    values : np.ndarray
+        1D array of values (e.g., tick prices or volumes).
+    starts : np.ndarray
+        First offset of each segment.
+    ends : np.ndarray
+        Offset following the last value of each segment.
+
+    Returns
+    -------
+    Tuple[np.ndarray, np.ndarray]
+        - maximum : Largest value of each segment.
+        - offset : Offset of its first occurrence in `values` (-1 for an empty segment), so that
+          `timestamps[offset]` gives the time of the maximum.
+    """
+    out = np.full(len(starts), np.nan)
+    offsets = np.full(len(starts), -1, dtype=np.int64)
+    for k in range(len(starts)):
+        if ends[k] > starts[k]:
+            best = starts[k]
+            for i in range(starts[k] + 1, ends[k]):
+                if values[i] > values[best]:
+                    best = i
+            out[k] = values[best]
+            offsets[k] = best
+    return out, offsets
+
+
+@njit(nogil=True)
+def segment_first(values: np.ndarray, starts: np.ndarray, ends: np.ndarray) -> np.ndarray:
+    """
+    First value of each segment.
+
+    Parameters
+    ----------
+    values : np.ndarray
+        1D array of values (e.g., tick prices or volumes).
+    starts : np.ndarray
+        First offset of each segment.
+    ends : np.ndarray
+        Offset following the last value of each segment.
+
+    Returns
+    -------
+    np.ndarray
+        First value of each segment.
+    """
+    out = np.full(len(starts), np.nan)
+    for k in range(len(starts)):
+        if ends[k] > starts[k]:
+            out[k] = values[starts[k]]
+    return out
+
+
+@njit(nogil=True)
+def segment_last(values: np.ndarray, starts: np.ndarray, ends: np.ndarray) -> np.ndarray:
+    """
+    Last value of each segment.
+
+    Parameters
+    ----------
+    values : np.ndarray
+        1D array of values (e.g., tick prices or volumes).
+    starts : np.ndarray
+        First offset of each segment.
+    ends : np.ndarray
+        Offset following the last value of each segment.
+
+    Returns
+    -------
+    np.ndarray
+        Last value of each segment.
+    """
+    out = np.full(len(starts), np.nan)
+    for k in range(len(starts)):
+        if ends[k] > starts[k]:
+            out[k] = values[ends[k] - 1]
+    return out
+
+
+@njit(nogil=True)
+def segment_weighted_mean(
+    values: np.ndarray, weights: np.ndarray, starts: np.ndarray, ends: np.ndarray
+) -> np.ndarray:
+    """
+    Weighted mean of the values of each segment (e.g., the VWAP with prices and volumes).
+
+    Parameters
+    ----------
+    values : np.ndarray
+        1D array of values (e.g., tick prices).
+    weights : np.ndarray
+        1D array of weights aligned with `values` (e.g., tick volumes).
+    starts : np.ndarray
+        First offset of each segment.
+    ends : np.ndarray
+        Offset following the last value of each segment.
+
+    Returns
+    -------
+    np.ndarray
+        Weighted mean of each segment (NaN when its weights sum to 0).
+    """
+    out = np.full(len(starts), np.nan)
+    for k in range(len(starts)):
+        total = 0.0
+        total_weight = 0.0
+        for i in range(starts[k], ends[k]):
+            total += values[i] * weights[i]
+            total_weight += weights[i]
+        if total_weight != 0.0:
+            out[k] = total / total_weight
+    return out
+
+
+@njit(nogil=True)
+def segment_quantile(
+    values: np.ndarray, starts: np.ndarray, ends: np.ndarray, q: float
+) -> np.ndarray:
+    """
+    Quantile of the values of each segment, linearly interpolated as in `np.quantile`.
+
+    Parameters
+    ----------
+    values : np.ndarray
+        1D array of values (e.g., tick prices or volumes).
+    starts : np.ndarray
+        First offset of each segment.
+    ends : np.ndarray
+        Offset following the last value of each segment.
+    q : float
+        Quantile to compute, between 0 and 1.
+
+    Returns
+    -------
+    np.ndarray
+        Quantile of each segment.
+    """
+    if not 0.0 <= q <= 1.0:
+        raise ValueError("q must be between 0 and 1.")
+
+    out = np.full(len(starts), np.nan)
+    for k in range(len(starts)):
+        n = ends[k] - starts[k]
+        if n == 0:
+            continue
+        # Sorting a copy of each segment keeps the cost at O(n log(ticks per bar))
+        sorted_values = np.sort(values[starts[k] : ends[k]])
+        position = q * (n - 1)
+        lower = int(np.floor(position))
+        upper = min(lower + 1, n - 1)
+        fraction = position - lower
+        out[k] = sorted_values[lower] + fraction * (sorted_values[upper] - sorted_values[lower])
+    return out
+
+
+@njit(nogil=True)
+def _segment_standardized_moment(values, starts, ends, order, min_count, shift):
+    # Same conventions as `bar_metrics.skewness` / `kurtosis`: 0 for short or constant segments
+    out = np.zeros(len(starts), dtype=np.float64)
+    for k in range(len(starts)):
+        n = ends[k] - starts[k]
+        if n < min_count:
+            continue
+        mean = 0.0
+        for i in range(starts[k], ends[k]):
+            mean += values[i]
+        mean /= n
+        m2 = 0.0
+        moment = 0.0
+        for i in range(starts[k], ends[k]):
+            delta = values[i] - mean
+            m2 += delta * delta
+            moment += delta**order
+        m2 /= n
+        if m2 == 0.0:
+            continue
+        out[k] = moment / n / m2 ** (order / 2) - shift
+    return out
+
+
+@njit(nogil=True)
+def segment_skewness(values: np.ndarray, starts: np.ndarray, ends: np.ndarray) -> np.ndarray:
+    """
+    Skewness of the values of each segment, as computed by `bar_metrics.skewness`.
+
+    Parameters
+    ----------
+    values : np.ndarray
+        1D array of values (e.g., tick prices or volumes).
+    starts : np.ndarray
+        First offset of each segment.
+    ends : np.ndarray
+        Offset following the last value of each segment.
+
+    Returns
+    -------
+    np.ndarray
+        Skewness of each segment (0 with fewer than 2 values or a zero variance).
+    """
+    return _segment_standardized_moment(values, starts, ends, 3, 2, 0.0)
+
+
+@njit(nogil=True)
+def segment_kurtosis(values: np.ndarray, starts: np.ndarray, ends: np.ndarray) -> np.ndarray:
+    """
+    Excess kurtosis (Fisher) of the values of each segment, as computed by `bar_metrics.kurtosis`.
+
+    Parameters
+    ----------
+    values : np.ndarray
+        1D array of values (e.g., tick prices or volumes).
+    starts : np.ndarray
+        First offset of each segment.
+    ends : np.ndarray
+        Offset following the last value of each segment.
+
+    Returns
+    -------
+    np.ndarray
+        Excess kurtosis of each segment (0 with fewer than 4 values or a zero variance).
+    """
+    return _segment_standardized_moment(values, starts, ends, 4, 4, 3.0)
@@ -0,0 +1,343 @@
+import numpy as np
+import pandas as pd
+from numba import njit
+from typing import Dict
+
+from .bar_building.engine import _timestamps_ns
+
+_TIME_REPAIRS = ("drop", "clip", None)
+_OUTLIERS = ("mad", "jump", None)
+_TIME_MODES = {"drop": 0, "clip": 1, None: 2}
+_OUTLIER_MODES = {"mad": 0, "jump": 1, None: 2}
+
+# Float state: last kept price and volume, then the price of the last tick that reached the
+# outlier filter, kept or not. Integer state: last kept time, tick kept flag, size
+# and next slot of the MAD window, then the counters of dropped and repaired ticks
+_F_PRICE, _F_VOLUME, _F_RAW_PRICE = range(3)
+_I_TIME, _I_HAS_LAST, _I_COUNT, _I_HEAD = range(4)
+_COUNTERS = ("invalid", "out_of_order", "duplicate", "outlier", "time_repaired")
+_I_COUNTERS = 4
+
+
+@njit(nogil=True)
+def _window_insert(window, ring, istate, price):
+    # `ring` holds the last prices in arrival order and `window` the same prices sorted, so that
+    # the median and the MAD are read in O(window) without sorting
+    size = len(ring)
+    count = istate[_I_COUNT]
+    head = istate[_I_HEAD]
+    if count == size:
+        j = np.searchsorted(window[:count], ring[head])
+        for k in range(j, count - 1):
+            window[k] = window[k + 1]
+        count -= 1
+    j = np.searchsorted(window[:count], price)
+    for k in range(count, j, -1):
+        window[k] = window[k - 1]
+    window[j] = price
+    ring[head] = price
+    istate[_I_HEAD] = (head + 1) % size
+    istate[_I_COUNT] = count + 1
+
+
+@njit(nogil=True)
+def _window_median_mad(window, count):
+    mid = count // 2
+    median = window[mid] if count % 2 else 0.5 * (window[mid - 1] + window[mid])
+
+    # Deviations from the median grow on both sides of it, so merging the two sides yields them
+    # in increasing order until the middle one(s)
+    left = mid - 1
+    right = mid
+    previous = 0.0
+    deviation = 0.0
+    for k in range(mid + 1):
+        if right < count and (left < 0 or window[right] - median <= median - window[left]):
+            deviation = window[right] - median
+            right += 1
+        else:
+            deviation = median - window[left]
+            left -= 1
+        if k < mid:
+            previous = deviation
+    mad = deviation if count % 2 else 0.5 * (previous + deviation)
+    return median, mad
+
+
+@njit(nogil=True)
+def _clean_ticks(
+    prices,
+    volumes,
+    timestamps_ns,
+    drop_duplicates,
+    time_mode,
+    outlier_mode,
+    mad_threshold,
+    mad_floor,
+    max_jump,
+    fstate,
+    istate,
+    window,
+    ring,
+    kept,
+):
+    n_kept = 0
+    for i in range(len(prices)):
+        price = prices[i]
+        volume = volumes[i]
+        ts = timestamps_ns[i]
+
+        if not (price > 0.0 and np.isfinite(price) and volume >= 0.0 and np.isfinite(volume)):
+            istate[_I_COUNTERS + 0] += 1
+            continue
+
+        has_last = istate[_I_HAS_LAST] == 1
+        if has_last and ts < istate[_I_TIME]:
+            if time_mode == 0:
+                istate[_I_COUNTERS + 1] += 1
+                continue
+            if time_mode == 1:
+                ts = istate[_I_TIME]
+                istate[_I_COUNTERS + 4] += 1
+
+        if (
+            drop_duplicates
+            and has_last
+            and ts == istate[_I_TIME]
+            and price == fstate[_F_PRICE]
+            and volume == fstate[_F_VOLUME]
+        ):
+            istate[_I_COUNTERS + 2] += 1
+            continue
+
+        if outlier_mode == 0:
+            # Every valid price enters the window, so that a lasting level shift is accepted once
+            # it holds half of the window, while isolated spikes barely move the median
+            outlier = False
+            if istate[_I_COUNT] == len(ring):
+                median, mad = _window_median_mad(window, istate[_I_COUNT])
+                scale = max(1.4826 * mad, mad_floor * median)
+                outlier = abs(price - median) > mad_threshold * scale
+            _window_insert(window, ring, istate, price)
+            if outlier:
+                istate[_I_COUNTERS + 3] += 1
+                continue
+        elif outlier_mode == 1:
+            # A jump from the last kept price is accepted when the previous tick already made it,
+            # so that a lasting level shift only loses its first tick while a single-tick spike,
+            # far from both, is dropped
+            previous = fstate[_F_RAW_PRICE]
+            fstate[_F_RAW_PRICE] = price
+            if (
+                has_last
+                and abs(price / fstate[_F_PRICE] - 1.0) > max_jump
+                and abs(price / previous - 1.0) > max_jump
+            ):
+                istate[_I_COUNTERS + 3] += 1
+                continue
+
+        # Kept ticks are compacted at the front of the arrays, which are never read again there
+        prices[n_kept] = price
+        volumes[n_kept] = volume
+        timestamps_ns[n_kept] = ts
+        kept[n_kept] = i
+        n_kept += 1
+
+        fstate[_F_PRICE] = price
+        fstate[_F_VOLUME] = volume
+        istate[_I_TIME] = ts
+        istate[_I_HAS_LAST] = 1
+
+    return n_kept
+
+
+class TickCleaner:
+    """
+    Compiled tick filter fed chunk by chunk, placed in front of the bar builders.
+
+    Ticks are dropped when their price is not strictly positive or their volume negative (or
+    either is not finite), when they exactly repeat the previous tick, when they go back in time,
+    and when their price is an outlier. The state (last kept tick and rolling window) is carried
+    from one chunk to the next, so cleaning a stream chunk by chunk gives the same ticks as
+    cleaning it at once.
+
+    Parameters
+    ----------
+    col_price : str, default="price"
+        Name of the column containing tick prices.
+    col_volume : str, default="volume"
+        Name of the column containing tick volumes.
+    drop_duplicates : bool, default=True
+        If True, a tick with the same time, price and volume as the previous kept tick is dropped.
+    time_repair : str or None, default="drop"
+        Handling of a tick earlier than the previous kept tick: "drop" removes it, "clip" moves it
+        to the time of the previous kept tick, None keeps it as is.
+    outlier : str or None, default="mad"
+        Outlier filter. "mad" drops a price further than `mad_threshold` scaled MADs from the
+        median of the last `mad_window` valid prices (checked once the window is full). "jump"
+        drops a price moving by more than `max_jump` (relative) from both the last kept price and
+        the previous valid price, so a level shift is accepted from its second tick on.
+    mad_window : int, default=50
+        Number of past prices in the rolling median and MAD.
+    mad_threshold : float, default=10.0
+        Number of scaled MADs (1.4826 * MAD, the standard deviation for Gaussian prices) beyond
+        which a price is an outlier.
+    mad_floor : float, default=5e-4
+        Lower bound of the scaled MAD, relative to the median, so that a flat window does not flag
+        every price change.
+    max_jump : float, default=0.05
+        Largest relative price change accepted by the "jump" filter.
+
+    Examples
+    --------
+    >>> cleaner = TickCleaner(outlier="jump", max_jump=0.02)
+    >>> builder = VolumeBarBuilder(volume_per_bar=1_000)
+    >>> for chunk in chunks:
+    ...     bars = builder.update(cleaner.update(chunk))
+    """
+
+    def __init__(
+        self,
+        col_price: str = "price",
+        col_volume: str = "volume",
+        drop_duplicates: bool = True,
+        time_repair: str = "drop",
+        outlier: str = "mad",
+        mad_window: int = 50,
+        mad_threshold: float = 10.0,
+        mad_floor: float = 5e-4,
+        max_jump: float = 0.05,
+    ):
+        if time_repair not in _TIME_REPAIRS:
+            raise ValueError(
+                f"Invalid time_repair '{time_repair}'. Must be one of {_TIME_REPAIRS}."
+            )
+        if outlier not in _OUTLIERS:
+            raise ValueError(f"Invalid outlier '{outlier}'. Must be one of {_OUTLIERS}.")
+        if mad_window < 1:
+            raise ValueError("mad_window must be a positive integer.")
+
+        self.col_price = col_price
+        self.col_volume = col_volume
+        self.drop_duplicates = drop_duplicates
+        self.time_repair = time_repair
+        self.outlier = outlier
+        self.mad_window = mad_window
+        self.mad_threshold = mad_threshold
+        self.mad_floor = mad_floor
+        self.max_jump = max_jump
+        self.reset()
+
+    def reset(self) -> None:
+        """Forget the previous ticks and the counters."""
+        self._fstate = np.zeros(3, dtype=np.float64)
+        self._istate = np.zeros(_I_COUNTERS + len(_COUNTERS), dtype=np.int64)
+        self._window = np.empty(self.mad_window, dtype=np.float64)
+        self._ring = np.empty(self.mad_window, dtype=np.float64)
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        """Number of ticks dropped for each reason, and of ticks moved in time, since the reset."""
+        return {name: int(self._istate[_I_COUNTERS + k]) for k, name in enumerate(_COUNTERS)}
+
+    def _clean(self, prices, volumes, timestamps_ns):
+        kept = np.empty(len(prices), dtype=np.int64)
+        n_kept = _clean_ticks(
+            prices,
+            volumes,
+            timestamps_ns,
+            self.drop_duplicates,
+            _TIME_MODES[self.time_repair],
+            _OUTLIER_MODES[self.outlier],
+            float(self.mad_threshold),
+            float(self.mad_floor),
+            float(self.max_jump),
+            self._fstate,
+            self._istate,
+            self._window,
+            self._ring,
+            kept,
+        )
+        return n_kept, kept[:n_kept]
+
+    def clean_arrays(
+        self, prices: np.ndarray, volumes: np.ndarray, timestamps_ns: np.ndarray
+    ) -> int:
+        """
+        Clean the next chunk of tick columns in place.
+
+        Parameters
+        ----------
+        prices : np.ndarray
+            float64 tick prices, overwritten.
+        volumes : np.ndarray
+            float64 tick volumes, overwritten.
+        timestamps_ns : np.ndarray
+            int64 tick timestamps in nanoseconds, overwritten.
+
+        Returns
+        -------
+        int
+            Number n of kept ticks, which are the first n values of the three arrays. Wrapped in
+            a `TickSlice(timestamps_ns[:n], prices[:n], volumes[:n])`, they can be passed to the
+            `ticks_to_*_bars` functions without copy.
+        """
+        for values, dtype in (
+            (prices, np.float64),
+            (volumes, np.float64),
+            (timestamps_ns, np.int64),
+        ):
+            if values.dtype != dtype:
+                raise ValueError(
+                    f"Tick columns must be {np.dtype(dtype)} arrays to be cleaned in place."
+                )
+        n_kept, _ = self._clean(prices, volumes, timestamps_ns)
+        return n_kept
+
+    def update(self, chunk: pd.DataFrame) -> pd.DataFrame:
+        """
+        Clean the next chunk of ticks.
+
+        Parameters
+        ----------
+        chunk : pd.DataFrame
+            Tick DataFrame indexed by datetime, must include price and volume columns. Chunks must
+            be passed in chronological order.
+
+        Returns
+        -------
+        pd.DataFrame
+            The kept rows of `chunk`, with every column, ready for the bar functions or builders.
+            With `time_repair="clip"`, the index holds the repaired times.
+        """
+        prices = chunk[self.col_price].to_numpy(np.float64, copy=True)
+        volumes = chunk[self.col_volume].to_numpy(np.float64, copy=True)
+        timestamps_ns = _timestamps_ns(chunk.index).copy()
+
+        n_kept, kept = self._clean(prices, volumes, timestamps_ns)
+        cleaned = chunk.iloc[kept]
+        if self.time_repair == "clip":
+            index = pd.DatetimeIndex(timestamps_ns[:n_kept].view("datetime64[ns]"))
+            if chunk.index.tz is not None:
+                index = index.tz_localize("UTC").tz_convert(chunk.index.tz)
+            cleaned = cleaned.set_axis(index.rename(chunk.index.name))
+        return cleaned
+
+
+def clean_ticks(df: pd.DataFrame, **kwargs) -> pd.DataFrame:
+    """
+    Clean a tick DataFrame in one call, with the filters of `TickCleaner`.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        Tick DataFrame indexed by datetime, must include price and volume columns.
+    **kwargs
+        Parameters of `TickCleaner`.
+
+    Returns
+    -------
+    pd.DataFrame
+        The kept rows of `df`.
+    """
+    return TickCleaner(**kwargs).update(df)
@@ -0,0 +1,67 @@
+import numpy as np
+import pandas as pd
+import pytest
+from quantreo.data_aggregation.bar_building import (
+    bars_to_tick_bars,
+    bars_to_time_bars,
+    bars_to_volume_bars,
+    ticks_to_tick_bars,
+    ticks_to_time_bars,
+    ticks_to_volume_bars,
+)
+
+
+def test_bars_to_time_bars_matches_ticks(ticks_sample):
+    """Rolling 1min bars up to 15min must give the bars built directly from the ticks."""
+    df = ticks_sample.copy()
+    fine = ticks_to_time_bars(df, resample_factor="1min")
+
+    bars = bars_to_time_bars(fine, resample_factor="15min")
+    pd.testing.assert_frame_equal(bars, ticks_to_time_bars(df, resample_factor="15min"))
+
+
+def test_bars_to_threshold_bars_match_ticks(ticks_sample):
+    """Rolling up fine tick bars must give the volume and tick bars built from the ticks."""
+    df = ticks_sample.copy()
+
+    single_ticks = ticks_to_tick_bars(df, tick_per_bar=1)
+    pd.testing.assert_frame_equal(
+        bars_to_volume_bars(single_ticks, volume_per_bar=50),
+        ticks_to_volume_bars(df, volume_per_bar=50),
+    )
+
+    fine = ticks_to_tick_bars(df, tick_per_bar=10)
+    pd.testing.assert_frame_equal(
+        bars_to_tick_bars(fine, tick_per_bar=100), ticks_to_tick_bars(df, tick_per_bar=100)
+    )
+
+
+def test_bars_to_time_bars_ohlcv(ohlcv_with_time_sample):
+    """Bars without tick counts are rolled up without a 'number_ticks' column."""
+    df = ohlcv_with_time_sample.copy()
+    df_original = df.copy()
+
+    bars = bars_to_time_bars(df, resample_factor="1D")
+
+    assert "number_ticks" not in bars.columns
+    assert bars.index.name == "time"
+    np.testing.assert_allclose(bars["volume"].sum(), df["volume"].sum())
+    np.testing.assert_allclose(bars["high"], df["high"].resample("1D").max().dropna())
+    assert (bars["high_time"].dt.floor("1D") == bars.index).all()
+    assert (bars["low_time"].dt.floor("1D") == bars.index).all()
+
+    # Ensure that the original DataFrame remains unchanged after processing
+    pd.testing.assert_frame_equal(df, df_original)
+
+
+def test_bars_rollup_invalid_inputs(ohlcv_with_time_sample):
+    df = ohlcv_with_time_sample.copy()
+
+    with pytest.raises(ValueError):
+        bars_to_time_bars(df.drop(columns="high_time"))
+    with pytest.raises(ValueError):
+        bars_to_time_bars(df.iloc[::-1])
+    with pytest.raises(ValueError):
+        bars_to_volume_bars(df, volume_per_bar=0)
+    with pytest.raises(ValueError):
+        bars_to_tick_bars(df, tick_per_bar=10)
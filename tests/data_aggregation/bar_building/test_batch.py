@@ -0,0 +1,80 @@
+import pickle
+import pandas as pd
+import pytest
+from quantreo.data_aggregation.bar_building import (
+    TickStore,
+    ticks_to_bars_batch,
+    ticks_to_volume_bars,
+)
+from quantreo.data_aggregation.bar_building.batch import _process_inputs
+
+
+@pytest.mark.parametrize("backend", ["thread", "process"])
+def test_ticks_to_bars_batch(ticks_sample, tmp_path, backend):
+    """Every symbol must get the bars of the single-symbol function, whatever the source."""
+    df = ticks_sample.copy()
+    path = tmp_path / "ticks.csv"
+    df.iloc[:4_000].rename_axis("datetime").reset_index().to_csv(path, index=False)
+    sources = {"A": df.iloc[:6_000], "B": df.iloc[6_000:], "C": str(path)}
+
+    bars, report = ticks_to_bars_batch(
+        sources, "volume", backend=backend, n_jobs=2, volume_per_bar=5_000
+    )
+
+    assert list(bars) == ["A", "B", "C"]
+    pd.testing.assert_frame_equal(bars["A"], ticks_to_volume_bars(df.iloc[:6_000], 5_000))
+    pd.testing.assert_frame_equal(bars["B"], ticks_to_volume_bars(df.iloc[6_000:], 5_000))
+    pd.testing.assert_frame_equal(bars["C"], ticks_to_volume_bars(df.iloc[:4_000], 5_000))
+
+    assert list(report.index) == ["A", "B", "C"]
+    assert report["n_ticks"].tolist() == [6_000, len(df) - 6_000, 4_000]
+    assert report["n_bars"].tolist() == [len(bars[symbol]) for symbol in "ABC"]
+    assert (report["seconds"] >= 0).all()
+
+
+def test_ticks_to_bars_batch_invalid_inputs(ticks_sample):
+    sources = {"A": ticks_sample.copy()}
+
+    with pytest.raises(ValueError):
+        ticks_to_bars_batch(sources, "renko")
+    with pytest.raises(ValueError):
+        ticks_to_bars_batch(sources, "volume", backend="gpu")
+    with pytest.raises(ValueError):
+        ticks_to_bars_batch(sources, "volume", n_jobs=0)
+
+
+@pytest.mark.parametrize("backend", ["thread", "process"])
+@pytest.mark.parametrize("extension", ["csv", "parquet"])
+def test_ticks_to_bars_batch_utc_offset(ticks_sample, tmp_path, backend, extension):
+    """Tick files with offset timestamps are read as naive UTC times."""
+    df = ticks_sample.copy()
+    path = tmp_path / f"ticks.{extension}"
+    ticks = df.tz_localize("UTC").tz_convert("Europe/Paris").rename_axis("datetime").reset_index()
+    if extension == "csv":
+        ticks.to_csv(path, index=False)
+    else:
+        ticks.to_parquet(path, index=False)
+
+    bars, _ = ticks_to_bars_batch(
+        {"A": str(path)}, "volume", backend=backend, n_jobs=1, volume_per_bar=5_000
+    )
+
+    pd.testing.assert_frame_equal(bars["A"], ticks_to_volume_bars(df, 5_000))
+
+
+def test_ticks_to_bars_batch_tick_store(ticks_sample, tmp_path):
+    """Store reads are sent to the worker processes as file offsets, never as tick data."""
+    df = ticks_sample.copy()
+    store = TickStore(str(tmp_path / "store"))
+    store.append(df)
+    ticks = store.read(df.index[1_000], df.index[9_000])
+    sources = {"A": ticks, "B": store}
+
+    inputs = _process_inputs(sources, str(tmp_path), "datetime", "price", "volume")
+    assert all(len(pickle.dumps(source)) < 1_000 for source in inputs.values())
+
+    bars, report = ticks_to_bars_batch(sources, "volume", backend="process", volume_per_bar=5_000)
+
+    pd.testing.assert_frame_equal(bars["A"], ticks_to_volume_bars(ticks, 5_000))
+    pd.testing.assert_frame_equal(bars["B"], ticks_to_volume_bars(df, 5_000))
+    assert report["n_ticks"].tolist() == [len(ticks), len(df)]
@@ -0,0 +1,268 @@
+import numpy as np
+import pandas as pd
+import pytest
+from numba import njit
+from quantreo.data_aggregation.bar_building import (
+    ticks_to_tick_bars,
+    ticks_to_volume_bars,
+    ticks_to_tick_imbalance_bars,
+    ticks_to_volume_imbalance_bars,
+    ticks_to_dollar_bars,
+    ticks_to_dollar_imbalance_bars,
+    ticks_to_tick_run_bars,
+    ticks_to_volume_run_bars,
+    ticks_to_time_bars,
+    tick_bar_boundaries,
+    volume_bar_boundaries,
+    tick_imbalance_bar_boundaries,
+    volume_imbalance_bar_boundaries,
+    dollar_bar_boundaries,
+    dollar_imbalance_bar_boundaries,
+    tick_run_bar_boundaries,
+    volume_run_bar_boundaries,
+    time_bar_boundaries,
+)
+from quantreo.data_aggregation.bar_building.engine import (
+    _EXTRA_ALL,
+    _compute_additional_metrics,
+    _fill_bars,
+)
+from quantreo.data_aggregation.bar_metrics import (
+    skewness,
+    kurtosis,
+    max_traded_volume,
+    volume_profile_features,
+)
+
+
+@njit
+def _count_and_mean(x):
+    return len(x), np.mean(x)
+
+
+def test_compiled_metrics_match_python_metrics(ticks_sample):
+    """Metrics dispatched from the compiled loop must match the per-bar Python calls."""
+    df = ticks_sample.copy()
+
+    compiled = [
+        (skewness, "price", ["skew"]),
+        (kurtosis, "volume", ["kurt"]),
+        (max_traded_volume, "price_volume", ["max_vol", "max_vol_price"]),
+        (volume_profile_features, "price_volume", ["poc_price", "poc_position"]),
+    ]
+    python = [(func.py_func, source, names) for func, source, names in compiled]
+
+    bars_compiled = ticks_to_volume_bars(df, volume_per_bar=5_000, additional_metrics=compiled)
+    bars_python = ticks_to_volume_bars(df, volume_per_bar=5_000, additional_metrics=python)
+
+    pd.testing.assert_frame_equal(bars_compiled, bars_python)
+
+
+def test_compiled_metrics_non_float_fallback(ticks_sample):
+    """Metrics returning non-float values keep the per-bar Python path and their dtype."""
+    df = ticks_sample.copy()
+    bars = ticks_to_tick_bars(
+        df, tick_per_bar=1000, additional_metrics=[(_count_and_mean, "price", ["n", "mean"])]
+    )
+
+    assert (bars["n"] == 1000).all()
+    assert pd.api.types.is_integer_dtype(bars["n"])
+    assert np.allclose(
+        bars["mean"], df["price"].to_numpy()[: len(bars) * 1000].reshape(-1, 1000).mean(axis=1)
+    )
+
+
+def test_compute_additional_metrics_empty_and_invalid():
+    prices = np.arange(10, dtype=np.float64)
+    empty = np.empty(0, dtype=np.int64)
+
+    out = _compute_additional_metrics([(skewness, "price", ["skew"])], prices, prices, empty, empty)
+    assert len(out["skew"]) == 0
+
+    with pytest.raises(ValueError):
+        _compute_additional_metrics([(skewness, "spread", ["skew"])], prices, prices, empty, empty)
+
+
+def test_fill_bars_matches_numpy(ticks_sample):
+    """Bars filled from boundaries must match a direct NumPy computation on each slice."""
+    df = ticks_sample.copy()
+    prices = df["price"].to_numpy(np.float64)
+    volumes = df["volume"].to_numpy(np.float64)
+    timestamps_ns = df.index.values.astype("int64")
+    starts = np.array([0, 10, 500, 501], dtype=np.int64)
+    ends = np.array([10, 500, 501, 2_000], dtype=np.int64)
+
+    bars, extra = _fill_bars(prices, volumes, timestamps_ns, starts, ends, _EXTRA_ALL)
+    times, opens, highs, lows, closes, vols, counts, durations, high_times, low_times = bars
+    notionals, first_times, last_times = extra[0], extra[5], extra[6]
+
+    for k, (start, end) in enumerate(zip(starts, ends)):
+        p, v, t = prices[start:end], volumes[start:end], timestamps_ns[start:end]
+        assert times[k] == t[0]
+        assert (opens[k], highs[k], lows[k], closes[k]) == (p[0], p.max(), p.min(), p[-1])
+        assert vols[k] == v.sum()
+        assert counts[k] == end - start
+        assert durations[k] == (t[-1] - t[0]) / 60_000_000_000
+        assert high_times[k] == t[np.argmax(p)]
+        assert low_times[k] == t[np.argmin(p)]
+        assert np.isclose(notionals[k], (p * v).sum())
+        assert (first_times[k], last_times[k]) == (t[0], t[-1])
+
+
+@pytest.mark.parametrize(
+    "func, param",
+    [
+        (ticks_to_tick_bars, 100),
+        (ticks_to_volume_bars, 5_000),
+        (ticks_to_tick_imbalance_bars, 10),
+        (ticks_to_volume_imbalance_bars, 500),
+        (ticks_to_dollar_bars, 250_000),
+        (ticks_to_dollar_imbalance_bars, 50_000),
+        (ticks_to_tick_run_bars, 20),
+        (ticks_to_volume_run_bars, 1_000),
+        (ticks_to_time_bars, "30min"),
+    ],
+)
+def test_bar_outputs_lossless_and_compact(ticks_sample, func, param):
+    """Nanosecond timestamps are kept exactly and compact mode only changes the value dtypes."""
+    df = ticks_sample.copy()
+    # Shift every tick by an odd number of nanoseconds, which float64 cannot represent at ~1.7e18
+    df.index = df.index + pd.Timedelta(nanoseconds=123_456_789)
+    ticks_ns = df.index.values.astype("int64")
+
+    bars = func(df, param)
+    assert bars.index.dtype == "datetime64[ns]"
+    if func is not ticks_to_time_bars:
+        assert np.isin(bars.index.values.astype("int64"), ticks_ns).all()
+    assert np.isin(bars["high_time"].values.astype("int64"), ticks_ns).all()
+    assert np.isin(bars["low_time"].values.astype("int64"), ticks_ns).all()
+
+    compact = func(df, param, compact=True)
+    assert compact["close"].dtype == np.float32
+    assert compact["volume"].dtype == np.float32
+    assert compact["number_ticks"].dtype == np.int32
+    pd.testing.assert_index_equal(compact.index, bars.index)
+    pd.testing.assert_series_equal(compact["high_time"], bars["high_time"])
+    assert np.allclose(compact["close"], bars["close"], rtol=1e-6)
+
+
+EXTRA = ["vwap", "buy_volume", "sell_volume", "signed_ticks", "realized_var", "first_time", "last_time"]
+
+
+def test_extra_columns_match_numpy(ticks_sample):
+    """Built-in columns must match a direct NumPy computation on each bar slice."""
+    df = ticks_sample.copy()
+    prices = df["price"].to_numpy(np.float64)
+    volumes = df["volume"].to_numpy(np.float64)
+    signs = np.sign(np.diff(prices, prepend=prices[0]))
+
+    bars = ticks_to_volume_bars(df, volume_per_bar=5_000, extra=EXTRA)
+    assert list(bars.columns[-len(EXTRA):]) == EXTRA
+    assert bars["signed_ticks"].dtype == np.int64
+
+    ends = np.cumsum(bars["number_ticks"].to_numpy())
+    for k, end in enumerate(ends):
+        start = end - bars["number_ticks"].iloc[k]
+        p, v, s = prices[start:end], volumes[start:end], signs[start:end]
+        row = bars.iloc[k]
+        assert np.isclose(row["vwap"], (p * v).sum() / v.sum())
+        assert np.isclose(row["buy_volume"], v[s > 0].sum())
+        assert np.isclose(row["sell_volume"], v[s < 0].sum())
+        assert row["signed_ticks"] == s.sum()
+        assert np.isclose(row["realized_var"], (np.diff(np.log(p)) ** 2).sum())
+        assert row["first_time"] == df.index[start]
+        assert row["last_time"] == df.index[end - 1]
+
+
+@pytest.mark.parametrize(
+    "func, param",
+    [
+        (ticks_to_tick_bars, 100),
+        (ticks_to_volume_imbalance_bars, 500),
+        (ticks_to_tick_run_bars, 20),
+        (ticks_to_time_bars, "30min"),
+    ],
+)
+def test_extra_columns_on_every_bar_type(ticks_sample, func, param):
+    """The built-in columns come before the additional metrics and follow the compact dtypes."""
+    df = ticks_sample.copy()
+    metrics = [(skewness, "price", ["skew"])]
+
+    bars = func(df, param, extra=["vwap", "last_time"], additional_metrics=metrics)
+    assert list(bars.columns[-3:]) == ["vwap", "last_time", "skew"]
+    assert (bars["vwap"] >= bars["low"]).all() and (bars["vwap"] <= bars["high"]).all()
+
+    compact = func(df, param, extra=["vwap"], compact=True)
+    assert compact["vwap"].dtype == np.float32
+
+    with pytest.raises(ValueError):
+        func(df, param, extra=["spread"])
+
+
+@pytest.mark.parametrize(
+    "boundaries, func, param",
+    [
+        (tick_bar_boundaries, ticks_to_tick_bars, 100),
+        (volume_bar_boundaries, ticks_to_volume_bars, 50),
+        (dollar_bar_boundaries, ticks_to_dollar_bars, 5_000),
+        (tick_imbalance_bar_boundaries, ticks_to_tick_imbalance_bars, 10),
+        (volume_imbalance_bar_boundaries, ticks_to_volume_imbalance_bars, 100),
+        (dollar_imbalance_bar_boundaries, ticks_to_dollar_imbalance_bars, 10_000),
+        (tick_run_bar_boundaries, ticks_to_tick_run_bars, 20),
+        (volume_run_bar_boundaries, ticks_to_volume_run_bars, 100),
+        (time_bar_boundaries, ticks_to_time_bars, "30min"),
+    ],
+)
+def test_bar_boundaries(ticks_sample, boundaries, func, param):
+    """The boundaries delimit exactly the ticks of the bars, in every mode."""
+    df = ticks_sample.copy()
+    bars = func(df, param, extra=["first_time", "last_time"])
+
+    starts, ends = boundaries(df, param)
+    assert starts.dtype == np.int64 and ends.dtype == np.int64
+    np.testing.assert_array_equal(ends - starts, bars["number_ticks"].to_numpy())
+    np.testing.assert_array_equal(df.index[starts], bars["first_time"].to_numpy())
+    np.testing.assert_array_equal(df.index[ends - 1], bars["last_time"].to_numpy())
+
+    if "parallel" in boundaries.__code__.co_varnames:
+        parallel_starts, parallel_ends = boundaries(df, param, parallel=True)
+        np.testing.assert_array_equal(parallel_starts, starts)
+        np.testing.assert_array_equal(parallel_ends, ends)
+
+
+def test_arrow_input_and_outputs(ticks_sample):
+    """Arrow ticks and every output format give the same bars as the pandas path."""
+    pa = pytest.importorskip("pyarrow")
+    df = ticks_sample.copy()
+    table = pa.Table.from_pandas(df.rename_axis("datetime").reset_index(), preserve_index=False)
+    expected = ticks_to_volume_bars(df, volume_per_bar=5_000, extra=["vwap"])
+
+    bars = ticks_to_volume_bars(table, volume_per_bar=5_000, extra=["vwap"], output="arrow")
+    assert isinstance(bars, pa.Table)
+    assert bars.column_names[0] == "time"
+    pd.testing.assert_frame_equal(bars.to_pandas().set_index("time"), expected)
+
+    arrays = ticks_to_volume_bars(df, volume_per_bar=5_000, extra=["vwap"], output="numpy")
+    assert list(arrays) == ["time"] + list(expected.columns)
+    np.testing.assert_array_equal(arrays["time"], expected.index.values)
+    np.testing.assert_array_equal(arrays["vwap"], expected["vwap"])
+
+    multi = ticks_to_time_bars(table, ["5min", "30min"], output="numpy")
+    np.testing.assert_array_equal(multi["30min"]["close"], ticks_to_time_bars(df, "30min")["close"])
+
+    with pytest.raises(ValueError):
+        ticks_to_volume_bars(df, volume_per_bar=5_000, output="excel")
+    with pytest.raises(ValueError):
+        ticks_to_volume_bars(table, volume_per_bar=5_000, col_time="timestamp")
+
+
+def test_polars_input_and_output(ticks_sample):
+    pl = pytest.importorskip("polars")
+    df = ticks_sample.copy()
+    frame = pl.from_pandas(df.rename_axis("datetime").reset_index())
+
+    bars = ticks_to_tick_bars(frame, 1_000, output="polars")
+    assert isinstance(bars, pl.DataFrame)
+    pd.testing.assert_frame_equal(
+        bars.to_pandas().set_index("time"), ticks_to_tick_bars(df, 1_000), check_dtype=False
+    )
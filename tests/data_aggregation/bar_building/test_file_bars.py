@@ -0,0 +1,73 @@
+import pandas as pd
+import pytest
+from quantreo.data_aggregation.bar_building import (
+    ticks_file_to_bars,
+    ticks_to_tick_bars,
+    ticks_to_tick_imbalance_bars,
+    ticks_to_volume_bars,
+)
+
+
+def test_ticks_file_to_bars_csv(ticks_sample, tmp_path):
+    """Bars written chunk by chunk must match the in-memory function."""
+    df = ticks_sample.copy()
+    input_path = tmp_path / "ticks.csv"
+    output_path = tmp_path / "bars.csv"
+    df.rename_axis("datetime").to_csv(input_path)
+
+    n_bars = ticks_file_to_bars(
+        input_path, output_path, bar_type="volume", chunk_size=999, volume_per_bar=5_000
+    )
+    expected = ticks_to_volume_bars(df, volume_per_bar=5_000)
+
+    bars = pd.read_csv(output_path, index_col="time", parse_dates=["time", "high_time", "low_time"])
+    assert n_bars == len(expected) == len(bars)
+    pd.testing.assert_index_equal(bars.index.astype("datetime64[ns]"), expected.index, exact=False)
+    for col in ["open", "high", "low", "close", "volume", "number_ticks"]:
+        pd.testing.assert_series_equal(bars[col], expected[col], check_index=False)
+
+
+def test_ticks_file_to_bars_tz_aware_csv(ticks_sample, tmp_path):
+    """Timestamps with an offset are read as naive UTC times."""
+    df = ticks_sample.copy()
+    input_path = tmp_path / "ticks.csv"
+    output_path = tmp_path / "bars.csv"
+    df.tz_localize("UTC").tz_convert("Europe/Paris").rename_axis("datetime").to_csv(input_path)
+
+    n_bars = ticks_file_to_bars(input_path, output_path, bar_type="tick", tick_per_bar=10)
+    expected = ticks_to_tick_bars(df, tick_per_bar=10)
+
+    bars = pd.read_csv(output_path, index_col="time", parse_dates=["time"])
+    assert n_bars == len(expected) == len(bars)
+    pd.testing.assert_index_equal(bars.index.astype("datetime64[ns]"), expected.index, exact=False)
+    pd.testing.assert_series_equal(bars["close"], expected["close"], check_index=False)
+
+
+def test_ticks_file_to_bars_parquet(ticks_sample, tmp_path):
+    pytest.importorskip("pyarrow")
+    df = ticks_sample.copy()
+    input_path = tmp_path / "ticks.parquet"
+    output_path = tmp_path / "bars.parquet"
+    df.rename_axis("datetime").reset_index().to_parquet(input_path, row_group_size=1_000)
+
+    n_bars = ticks_file_to_bars(
+        input_path,
+        output_path,
+        bar_type="tick_imbalance",
+        chunk_size=512,
+        expected_imbalance=10,
+        include_partial=True,
+    )
+    expected = ticks_to_tick_imbalance_bars(df, expected_imbalance=10)
+
+    bars = pd.read_parquet(output_path)
+    assert n_bars == len(bars)
+    pd.testing.assert_frame_equal(bars.iloc[: len(expected)], expected, check_freq=False)
+    assert len(bars) - len(expected) <= 1
+
+
+def test_ticks_file_to_bars_invalid_inputs(tmp_path):
+    with pytest.raises(ValueError):
+        ticks_file_to_bars(tmp_path / "ticks.csv", tmp_path / "bars.csv", bar_type="renko")
+    with pytest.raises(ValueError):
+        ticks_file_to_bars(tmp_path / "ticks.csv", tmp_path / "bars.json")
@@ -0,0 +1,121 @@
+import numpy as np
+import pandas as pd
+import pytest
+from quantreo.data_aggregation.bar_building import speculative
+from quantreo.data_aggregation.bar_building.dollar_bars import (
+    _dollar_bar_boundaries,
+    ticks_to_dollar_bars,
+)
+from quantreo.data_aggregation.bar_building.dollar_imbalance_bars import (
+    _dollar_imbalance_bar_boundaries,
+    ticks_to_dollar_imbalance_bars,
+)
+from quantreo.data_aggregation.bar_building.tick_imbalance_bars import (
+    _tick_imbalance_bar_boundaries,
+    ticks_to_tick_imbalance_bars,
+)
+from quantreo.data_aggregation.bar_building.tick_run_bars import (
+    _tick_run_bar_boundaries,
+    ticks_to_tick_run_bars,
+)
+from quantreo.data_aggregation.bar_building.volume_bars import (
+    _volume_bar_boundaries,
+    ticks_to_volume_bars,
+)
+from quantreo.data_aggregation.bar_building.volume_imbalance_bars import (
+    _volume_imbalance_bar_boundaries,
+    ticks_to_volume_imbalance_bars,
+)
+from quantreo.data_aggregation.bar_building.volume_run_bars import (
+    _volume_run_bar_boundaries,
+    ticks_to_volume_run_bars,
+)
+
+
+def _fixed(threshold):
+    return 0.0, float(threshold), float(threshold)
+
+
+# (mode, sequential boundaries, thresholds)
+CASES = [
+    (speculative._VOLUME, lambda p, v, t: _volume_bar_boundaries(v, t), [3, 500]),
+    (speculative._DOLLAR, lambda p, v, t: _dollar_bar_boundaries(p, v, t), [300, 50_000]),
+    (
+        speculative._TICK_IMBALANCE,
+        lambda p, v, t: _tick_imbalance_bar_boundaries(p, t, _fixed(t)),
+        [1, 20],
+    ),
+    (
+        speculative._VOLUME_IMBALANCE,
+        lambda p, v, t: _volume_imbalance_bar_boundaries(p, v, t, _fixed(t)),
+        [5, 300],
+    ),
+    (
+        speculative._DOLLAR_IMBALANCE,
+        lambda p, v, t: _dollar_imbalance_bar_boundaries(p, v, t, _fixed(t)),
+        [500, 30_000],
+    ),
+    (speculative._TICK_RUN, lambda p, v, t: _tick_run_bar_boundaries(p, t), [2, 30]),
+    (speculative._VOLUME_RUN, lambda p, v, t: _volume_run_bar_boundaries(p, v, t), [20, 200]),
+]
+
+
+@pytest.mark.parametrize("mode, sequential, thresholds", CASES)
+def test_speculative_bar_boundaries(ticks_sample, mode, sequential, thresholds):
+    """The chunked scan must give the sequential boundaries, whatever the number of chunks."""
+    prices = ticks_sample["price"].to_numpy(np.float64)
+    volumes = ticks_sample["volume"].to_numpy(np.float64)
+
+    for threshold in thresholds:
+        expected_starts, expected_ends = sequential(prices, volumes, threshold)
+        # More chunks than bars forces fix-ups running over whole chunks
+        for n_chunks in [1, 2, 7, 64, 5_000]:
+            starts, ends = speculative._speculative_bar_boundaries(
+                mode, prices, volumes, float(threshold), n_chunks
+            )
+            np.testing.assert_array_equal(starts, expected_starts)
+            np.testing.assert_array_equal(ends, expected_ends)
+
+    # Fewer ticks than chunks, and no ticks at all
+    for n_ticks in [0, 1, 3]:
+        starts, ends = speculative._speculative_bar_boundaries(
+            mode, prices[:n_ticks], volumes[:n_ticks], float(thresholds[0]), 8
+        )
+        expected_starts, expected_ends = sequential(
+            prices[:n_ticks], volumes[:n_ticks], thresholds[0]
+        )
+        np.testing.assert_array_equal(starts, expected_starts)
+        np.testing.assert_array_equal(ends, expected_ends)
+
+
+@pytest.mark.parametrize(
+    "func, params",
+    [
+        (ticks_to_volume_bars, {"volume_per_bar": 50}),
+        (ticks_to_dollar_bars, {"dollar_per_bar": 5_000}),
+        (ticks_to_tick_imbalance_bars, {"expected_imbalance": 10}),
+        (ticks_to_volume_imbalance_bars, {"expected_imbalance": 100}),
+        (ticks_to_dollar_imbalance_bars, {"expected_imbalance": 10_000}),
+        (ticks_to_tick_run_bars, {"expected_run": 20}),
+        (ticks_to_volume_run_bars, {"expected_run": 100}),
+    ],
+)
+def test_parallel_bars(ticks_sample, func, params):
+    """parallel=True must return exactly the sequential bars."""
+    df = ticks_sample.copy()
+    metrics = [(lambda x: float(x.std()), "price", ["price_std"])]
+
+    pd.testing.assert_frame_equal(
+        func(df, additional_metrics=metrics, parallel=True, **params),
+        func(df, additional_metrics=metrics, **params),
+    )
+
+
+def test_parallel_imbalance_bars_with_ewma(ticks_sample):
+    """The adaptive threshold is not reset between bars, so it falls back to the sequential scan."""
+    df = ticks_sample.copy()
+
+    pd.testing.assert_frame_equal(
+        ticks_to_volume_imbalance_bars(df, expected_imbalance=100, ewma_span=10, parallel=True),
+        ticks_to_volume_imbalance_bars(df, expected_imbalance=100, ewma_span=10),
+    )
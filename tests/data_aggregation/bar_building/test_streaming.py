@@ -0,0 +1,111 @@
+import numpy as np
+import pandas as pd
+import pytest
+from quantreo.data_aggregation.bar_building import (
+    ticks_to_tick_bars,
+    ticks_to_volume_bars,
+    ticks_to_time_bars,
+    ticks_to_tick_imbalance_bars,
+    ticks_to_volume_imbalance_bars,
+    ticks_to_dollar_bars,
+    ticks_to_dollar_imbalance_bars,
+    ticks_to_tick_run_bars,
+    ticks_to_volume_run_bars,
+    TickBarBuilder,
+    VolumeBarBuilder,
+    TimeBarBuilder,
+    TickImbalanceBarBuilder,
+    VolumeImbalanceBarBuilder,
+    DollarBarBuilder,
+    DollarImbalanceBarBuilder,
+    TickRunBarBuilder,
+    VolumeRunBarBuilder,
+)
+from quantreo.data_aggregation.bar_metrics import skewness, max_traded_volume
+
+CASES = [
+    (ticks_to_tick_bars, TickBarBuilder, 500),
+    (ticks_to_volume_bars, VolumeBarBuilder, 5_000),
+    (ticks_to_tick_imbalance_bars, TickImbalanceBarBuilder, 10),
+    (ticks_to_volume_imbalance_bars, VolumeImbalanceBarBuilder, 500),
+    (ticks_to_dollar_bars, DollarBarBuilder, 250_000),
+    (ticks_to_dollar_imbalance_bars, DollarImbalanceBarBuilder, 50_000),
+    (ticks_to_tick_run_bars, TickRunBarBuilder, 20),
+    (ticks_to_volume_run_bars, VolumeRunBarBuilder, 1_000),
+    (ticks_to_time_bars, TimeBarBuilder, "30min"),
+]
+
+
+@pytest.mark.parametrize("batch_func, builder_cls, param", CASES)
+def test_streaming_matches_batch(ticks_sample, batch_func, builder_cls, param):
+    """Bars built chunk by chunk must be identical to the batch function output."""
+    df = ticks_sample.copy()
+    metrics = [
+        (skewness, "price", ["skew"]),
+        (max_traded_volume, "price_volume", ["max_vol", "max_vol_price"]),
+    ]
+
+    expected = batch_func(df, param, additional_metrics=metrics)
+
+    builder = builder_cls(param, additional_metrics=metrics)
+    outputs = [builder.update(df.iloc[i : i + 777]) for i in range(0, len(df), 777)]
+    last = builder.flush()
+
+    # Time bars emit their last period on flush, the other bar types drop the partial bar
+    if builder_cls is TimeBarBuilder:
+        outputs.append(last)
+    else:
+        assert len(last) <= 1
+
+    bars = pd.concat(outputs)
+    pd.testing.assert_frame_equal(bars, expected, check_freq=False)
+
+
+@pytest.mark.parametrize("batch_func, builder_cls, param", CASES)
+def test_streaming_extra_matches_batch(ticks_sample, batch_func, builder_cls, param):
+    """The extra columns are accumulated in the state of the open bar across chunks."""
+    df = ticks_sample.copy()
+    extra = ["vwap", "buy_volume", "sell_volume", "signed_ticks", "realized_var", "last_time"]
+    expected = batch_func(df, param, extra=extra)
+
+    builder = builder_cls(param, extra=extra)
+    outputs = [builder.update(df.iloc[i : i + 777]) for i in range(0, len(df), 777)]
+    if builder_cls is TimeBarBuilder:
+        outputs.append(builder.flush())
+
+    bars = pd.concat(outputs)
+    pd.testing.assert_frame_equal(bars, expected, check_freq=False, rtol=1e-9)
+
+
+@pytest.mark.parametrize(
+    "batch_func, builder_cls, param",
+    [case for case in CASES if "imbalance" in case[0].__name__],
+)
+def test_streaming_adaptive_imbalance_matches_batch(ticks_sample, batch_func, builder_cls, param):
+    """The adaptive threshold state must be carried across chunks."""
+    df = ticks_sample.copy()
+    expected = batch_func(df, param, ewma_span=20)
+
+    builder = builder_cls(param, ewma_span=20)
+    bars = pd.concat([builder.update(df.iloc[i : i + 777]) for i in range(0, len(df), 777)])
+    pd.testing.assert_frame_equal(bars, expected, check_freq=False)
+
+
+def test_streaming_flush_and_reset(ticks_sample):
+    """flush returns the open bar once and leaves the builder empty."""
+    df = ticks_sample.copy()
+    builder = VolumeBarBuilder(volume_per_bar=df["volume"].sum() * 2)
+
+    assert builder.update(df).empty
+
+    last = builder.flush()
+    assert len(last) == 1
+    assert last["number_ticks"].iloc[0] == len(df)
+    assert np.isclose(last["volume"].iloc[0], df["volume"].sum())
+
+    assert builder.flush().empty
+
+
+def test_streaming_invalid_source():
+    with pytest.raises(ValueError):
+        TickBarBuilder(100, additional_metrics=[(np.mean, "spread", ["x"])])
@@ -0,0 +1,80 @@
+import numpy as np
+import pandas as pd
+import pytest
+from scipy import stats
+from quantreo.data_aggregation.bar_building import (
+    TickStore,
+    sweep_bar_thresholds,
+    ticks_to_dollar_bars,
+    ticks_to_tick_bars,
+    ticks_to_volume_bars,
+)
+
+
+@pytest.mark.parametrize(
+    "bar_type, batch_func, thresholds",
+    [
+        ("tick", ticks_to_tick_bars, [10, 100, 1000]),
+        ("volume", ticks_to_volume_bars, [500, 5_000, 12_345.5]),
+        ("dollar", ticks_to_dollar_bars, [50_000, 1_000_000]),
+    ],
+)
+def test_sweep_matches_batch(ticks_sample, bar_type, batch_func, thresholds):
+    """Each threshold of the sweep must give the batch bars and their return statistics."""
+    df = ticks_sample.copy()
+
+    summary, bars = sweep_bar_thresholds(df, thresholds, bar_type=bar_type, return_bars=True)
+
+    assert list(summary.index) == thresholds
+    for threshold in thresholds:
+        expected = batch_func(df, threshold)
+        pd.testing.assert_frame_equal(bars[threshold], expected)
+
+        returns = np.log(expected["close"]).diff().dropna()
+        np.testing.assert_allclose(
+            summary.loc[threshold].to_numpy(np.float64),
+            [
+                len(expected),
+                returns.mean(),
+                returns.std(ddof=0),
+                stats.skew(returns),
+                stats.kurtosis(returns),
+                stats.jarque_bera(returns).statistic,
+            ],
+            rtol=1e-6,
+        )
+
+    # Statistics only
+    pd.testing.assert_frame_equal(sweep_bar_thresholds(df, thresholds, bar_type=bar_type), summary)
+
+
+def test_sweep_tick_store_and_arrow_inputs(ticks_sample, tmp_path):
+    """Store reads and Arrow ticks give the same sweep as the pandas ticks."""
+    pa = pytest.importorskip("pyarrow")
+    df = ticks_sample.copy()
+    store = TickStore(str(tmp_path / "store"))
+    store.append(df)
+    table = pa.Table.from_pandas(df.rename_axis("time").reset_index(), preserve_index=False)
+    thresholds = [500, 5_000]
+
+    summary, bars = sweep_bar_thresholds(df, thresholds, return_bars=True)
+    for ticks, col_time in ((store.read(), "datetime"), (table, "time")):
+        other_summary, other_bars = sweep_bar_thresholds(
+            ticks, thresholds, return_bars=True, col_time=col_time
+        )
+        pd.testing.assert_frame_equal(other_summary, summary)
+        for threshold in thresholds:
+            pd.testing.assert_frame_equal(other_bars[threshold], bars[threshold])
+
+
+def test_sweep_invalid_inputs(ticks_sample):
+    df = ticks_sample.copy()
+
+    with pytest.raises(ValueError):
+        sweep_bar_thresholds(df, [100], bar_type="time")
+    with pytest.raises(ValueError):
+        sweep_bar_thresholds(df, [])
+    with pytest.raises(ValueError):
+        sweep_bar_thresholds(df, [100, 0])
+    with pytest.raises(ValueError):
+        sweep_bar_thresholds(df, [100, 500, 100])
@@ -54,3 +54,35 @@ def test_ticks_to_tick_bars(ticks_sample):
     df_original = df.copy()
     ticks_to_tick_bars(df_original, tick_per_bar=1000)
     pd.testing.assert_frame_equal(df, df_original)
+
+
+def test_ticks_to_tick_bars_parallel(ticks_sample):
+    """Parallel tick bars must be identical to the sequential ones."""
+    df = ticks_sample.copy()
+
+    for tick_per_bar in [1, 7, 1_000]:
+        pd.testing.assert_frame_equal(
+            ticks_to_tick_bars(df, tick_per_bar=tick_per_bar, parallel=True),
+            ticks_to_tick_bars(df, tick_per_bar=tick_per_bar),
+        )
+
+
+def test_ticks_to_tick_bars_sliding(ticks_sample):
+    """Overlapping tick bars match the bars built on each window of ticks, and are the usual bars
+    without overlap."""
+    df = ticks_sample.copy()
+    # Fractional volumes, whose running sum is not exact
+    df["volume"] = np.random.default_rng(0).random(len(df)) * df["volume"]
+
+    pd.testing.assert_frame_equal(
+        ticks_to_tick_bars(df, tick_per_bar=500, step=500),
+        ticks_to_tick_bars(df, tick_per_bar=500),
+        check_exact=True,
+    )
+
+    bars = ticks_to_tick_bars(df, tick_per_bar=500, step=70, extra=["vwap"])
+    assert len(bars) == (len(df) - 500) // 70 + 1
+    for k in [0, 1, 57, len(bars) - 1]:
+        ticks = df.iloc[70 * k : 70 * k + 500]
+        window = ticks_to_tick_bars(ticks, tick_per_bar=500, extra=["vwap"])
+        pd.testing.assert_frame_equal(bars.iloc[[k]], window)
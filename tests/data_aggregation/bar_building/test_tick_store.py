@@ -0,0 +1,87 @@
+import numpy as np
+import pandas as pd
+import pytest
+from quantreo.data_aggregation.bar_building import (
+    TickStore,
+    ticks_to_time_bars,
+    ticks_to_volume_bars,
+)
+from quantreo.datasets import load_generated_ticks
+
+
+@pytest.fixture
+def ticks():
+    # A full week of ticks, so that the store spans several days
+    return load_generated_ticks()
+
+
+@pytest.fixture
+def store(ticks, tmp_path):
+    store = TickStore(str(tmp_path / "ticks"))
+    # Appended in two chunks split in the middle of a day
+    store.append(ticks.iloc[:14_321])
+    store.append(ticks.iloc[14_321:])
+    return store
+
+
+def test_tick_store_round_trip(ticks, store):
+    """The store keeps every tick and its day index follows the UTC days of the ticks."""
+    df = ticks
+
+    assert len(store) == len(df)
+    pd.testing.assert_index_equal(store.days, df.index.normalize().unique().rename(None))
+
+    sliced = store.read()
+    assert isinstance(sliced.prices, np.memmap)
+    pd.testing.assert_frame_equal(sliced.to_pandas(), df[["price", "volume"]].astype(np.float64))
+
+    # A reopened store sees the same ticks
+    assert len(TickStore(store.path)) == len(df)
+
+
+@pytest.mark.parametrize(
+    "start, end",
+    [
+        (None, None),
+        ("2024-01-04", "2024-01-05"),
+        ("2024-01-05 12:34", "2024-01-08 01:00"),
+        ("2024-01-03 12:34", None),
+        (None, "2024-01-04 06:00"),
+        ("2024-01-04 10:00", "2024-01-04 10:00"),
+        ("2100-01-01", None),
+    ],
+)
+def test_tick_store_read_range(ticks, store, start, end):
+    df = ticks
+    mask = np.ones(len(df), dtype=bool)
+    if start is not None:
+        mask &= df.index >= pd.Timestamp(start)
+    if end is not None:
+        mask &= df.index < pd.Timestamp(end)
+
+    sliced = store.read(start, end)
+    np.testing.assert_array_equal(sliced.timestamps_ns, df.index.values[mask].astype("int64"))
+    np.testing.assert_array_equal(sliced.prices, df["price"].to_numpy()[mask])
+    np.testing.assert_array_equal(sliced.volumes, df["volume"].to_numpy()[mask])
+
+
+def test_bars_from_tick_store(ticks, store):
+    """Bar functions accept the store and its slices in place of a DataFrame."""
+    df = ticks
+
+    pd.testing.assert_frame_equal(
+        ticks_to_volume_bars(store, volume_per_bar=5_000),
+        ticks_to_volume_bars(df, volume_per_bar=5_000),
+    )
+    pd.testing.assert_frame_equal(
+        ticks_to_time_bars(store.read("2024-01-04", "2024-01-05"), "30min"),
+        ticks_to_time_bars(df.loc["2024-01-04"], "30min"),
+    )
+
+
+def test_tick_store_append_errors(ticks, store):
+    with pytest.raises(ValueError):
+        store.append(ticks.iloc[:10])
+    with pytest.raises(ValueError):
+        store.append(ticks.iloc[::-1])
+    assert len(store) == len(ticks)
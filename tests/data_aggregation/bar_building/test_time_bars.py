@@ -1,6 +1,7 @@
 import numpy as np
 import pandas as pd
-from quantreo.data_aggregation.bar_building.time_bars import ticks_to_time_bars
+import pytest
+from quantreo.data_aggregation.bar_building.time_bars import ticks_to_time_bars, time_bar_boundaries
 
 
 def test_ticks_to_time_bars(ticks_sample):
@@ -50,3 +51,171 @@ def test_ticks_to_time_bars(ticks_sample):
     df_original = df.copy()
     ticks_to_time_bars(df_original, resample_factor="30min")
     pd.testing.assert_frame_equal(df, df_original)
+
+
+def test_ticks_to_time_bars_sparse(ticks_sample):
+    """Sparse and dense time bars must match, and gaps must not create empty bars."""
+    df = ticks_sample.copy()
+
+    # Insert a multi-year gap in the middle of the sample
+    gap = pd.Timedelta(days=2_000)
+    df.index = df.index.where(np.arange(len(df)) < len(df) // 2, df.index + gap)
+
+    sparse = ticks_to_time_bars(df, resample_factor="1min")
+    assert (sparse["number_ticks"] > 0).all()
+    assert sparse["number_ticks"].sum() == len(df)
+
+    dense = ticks_to_time_bars(df.iloc[: len(df) // 2], resample_factor="1min", sparse=False)
+    pd.testing.assert_frame_equal(sparse.iloc[: len(dense)], dense)
+
+
+def test_ticks_to_time_bars_unsorted(ticks_sample):
+    df = ticks_sample.copy().iloc[::-1]
+    with pytest.raises(ValueError):
+        ticks_to_time_bars(df, resample_factor="30min")
+
+
+def test_ticks_to_time_bars_multi_resolution(ticks_sample):
+    """A list of frequencies must give the same bars as one call per frequency."""
+    df = ticks_sample.copy()
+    factors = ["1min", "5min", "15min", "1h", "7min"]
+
+    bars = ticks_to_time_bars(df, resample_factor=factors)
+
+    assert isinstance(bars, dict)
+    assert list(bars) == factors
+    for factor in factors:
+        pd.testing.assert_frame_equal(bars[factor], ticks_to_time_bars(df, resample_factor=factor))
+
+
+def test_ticks_to_time_bars_parallel(ticks_sample):
+    """Parallel time bars must be identical to the sequential ones."""
+    df = ticks_sample.copy()
+    metrics = [(lambda x: float(x.std()), "price", ["std"])]
+
+    for factor in ["1min", "7min", "1h"]:
+        pd.testing.assert_frame_equal(
+            ticks_to_time_bars(df, resample_factor=factor, additional_metrics=metrics, parallel=True),
+            ticks_to_time_bars(df, resample_factor=factor, additional_metrics=metrics),
+        )
+
+
+def _dst_ticks():
+    # One tick every 7 minutes across the US spring-forward of 2024-03-10
+    index = pd.date_range("2024-03-07", "2024-03-13", freq="7min")
+    rng = np.random.default_rng(0)
+    return pd.DataFrame(
+        {"price": 100 + np.cumsum(rng.normal(0, 0.1, len(index))), "volume": 1.0}, index=index
+    )
+
+
+def test_ticks_to_time_bars_timezone():
+    """Daily bars follow local days, DST included, and are labelled in UTC."""
+    df = _dst_ticks()
+    tz = "America/New_York"
+
+    bars = ticks_to_time_bars(df, "1D", timezone=tz, offset="17h")
+
+    local = df.index.tz_localize("UTC").tz_convert(tz).tz_localize(None)
+    days = (local - pd.Timedelta("17h")).floor("1D")
+    expected = df.groupby(days.values)["price"].agg(["first", "max", "min", "last", "size"])
+    labels = (
+        (expected.index + pd.Timedelta("17h")).tz_localize(tz).tz_convert("UTC").tz_localize(None)
+    )
+
+    np.testing.assert_array_equal(bars.index.values, labels.values)
+    np.testing.assert_array_equal(bars["open"], expected["first"])
+    np.testing.assert_array_equal(bars["high"], expected["max"])
+    np.testing.assert_array_equal(bars["close"], expected["last"])
+    np.testing.assert_array_equal(bars["number_ticks"], expected["size"])
+    # 17:00 New York is 22:00 UTC before the switch and 21:00 UTC after it
+    assert set(bars.index.hour) == {21, 22}
+
+    # Multi-resolution and parallel bucketing use the same calendar
+    multi = ticks_to_time_bars(df, ["4h", "1D"], timezone=tz, offset="17h")
+    pd.testing.assert_frame_equal(multi["1D"], bars)
+    pd.testing.assert_frame_equal(
+        multi["4h"], ticks_to_time_bars(df, "4h", timezone=tz, offset="17h", parallel=True)
+    )
+
+
+def test_ticks_to_time_bars_timezone_label_at_period_start():
+    """Periods are labelled with the UTC offset of their start, not of their first tick."""
+    tz = "America/New_York"
+    df = _dst_ticks()
+    local = df.index.tz_localize("UTC").tz_convert(tz).tz_localize(None)
+    # No tick before 09:00 local, so the first tick of 2024-03-10 follows the 02:00 switch
+    df = df[local.hour >= 9]
+
+    bars = ticks_to_time_bars(df, "1D", timezone=tz)
+
+    days = df.index.tz_localize("UTC").tz_convert(tz).tz_localize(None).normalize().unique()
+    labels = days.tz_localize(tz).tz_convert("UTC").tz_localize(None)
+    np.testing.assert_array_equal(bars.index.values, labels.values)
+    assert bars.index[bars.index.normalize() == "2024-03-10"][0].hour == 5
+    pd.testing.assert_frame_equal(ticks_to_time_bars(df, ["1D"], timezone=tz)["1D"], bars)
+
+    # Across the fall-back, each occurrence of a repeated local half hour keeps its own UTC start
+    index = pd.date_range("2024-11-02", "2024-11-05", freq="7min")
+    fall = pd.DataFrame({"price": np.arange(len(index), dtype=float), "volume": 1.0}, index=index)
+    bars = ticks_to_time_bars(fall, "30min", timezone=tz)
+    np.testing.assert_array_equal(bars.index.values, index.floor("30min").unique().values)
+
+
+def test_ticks_to_time_bars_session():
+    """Ticks outside the local session are excluded."""
+    df = _dst_ticks()
+    tz = "America/New_York"
+
+    bars = ticks_to_time_bars(df, "1D", timezone=tz, session=("09:30", "16:00"))
+
+    local = df.index.tz_localize("UTC").tz_convert(tz).tz_localize(None)
+    time_of_day = local - local.normalize()
+    in_session = (time_of_day >= pd.Timedelta("9h30min")) & (time_of_day < pd.Timedelta("16h"))
+    assert bars["number_ticks"].sum() == in_session.sum()
+    assert bars["volume"].sum() == df["volume"][in_session].sum()
+
+    # Overnight session spanning midnight
+    overnight = ticks_to_time_bars(df, "1h", timezone=tz, session=("18:00", "17:00"))
+    overnight_ticks = (time_of_day >= pd.Timedelta("18h")) | (time_of_day < pd.Timedelta("17h"))
+    assert overnight["number_ticks"].sum() == overnight_ticks.sum()
+
+    with pytest.raises(ValueError):
+        ticks_to_time_bars(df, "1D", session=("09:30", "09:30"))
+
+    # Boundaries are offsets among all the ticks, the excluded ones lying between the bars
+    starts, ends = time_bar_boundaries(df, "1D", timezone=tz, session=("09:30", "16:00"))
+    np.testing.assert_array_equal(ends - starts, bars["number_ticks"].to_numpy())
+    assert in_session[starts].all() and in_session[ends - 1].all()
+
+
+def test_ticks_to_time_bars_sliding(ticks_sample):
+    """Sliding bars hold the ticks of their window, and are the usual bars without overlap."""
+    df = ticks_sample.copy()
+    # Fractional volumes, whose running sum is not exact
+    df["volume"] = np.random.default_rng(0).random(len(df)) * df["volume"]
+
+    pd.testing.assert_frame_equal(
+        ticks_to_time_bars(df, "1h", step="1h"), ticks_to_time_bars(df, "1h"), check_exact=True
+    )
+
+    bars = ticks_to_time_bars(df, "1h", step="10min")
+    assert (bars.index == bars.index.floor("10min")).all()
+    for time in bars.index[[0, 1, 5, 40, -1]]:
+        window = df[(df.index >= time) & (df.index < time + pd.Timedelta("1h"))]
+        bar = bars.loc[time]
+        assert bar["open"] == window["price"].iloc[0] and bar["close"] == window["price"].iloc[-1]
+        assert bar["high"] == window["price"].max() and bar["low"] == window["price"].min()
+        assert bar["high_time"] == window["price"].idxmax()
+        assert bar["low_time"] == window["price"].idxmin()
+        assert bar["volume"] == pytest.approx(window["volume"].sum())
+        assert bar["number_ticks"] == len(window)
+
+    # Every window holding ticks is emitted, whatever the gaps between ticks
+    starts, ends = time_bar_boundaries(df.iloc[::500], "1h", step="10min")
+    assert (ends > starts).all() and len(starts) == len(
+        ticks_to_time_bars(df.iloc[::500], "1h", step="10min")
+    )
+
+    with pytest.raises(ValueError):
+        ticks_to_time_bars(df, ["1h", "4h"], step="10min")
@@ -1,5 +1,6 @@
 import numpy as np
 import pandas as pd
+import pytest
 from quantreo.data_aggregation.bar_building.volume_imbalance_bars import ticks_to_volume_imbalance_bars
 
 
@@ -50,3 +51,44 @@ def test_ticks_to_volume_imbalance_bars(ticks_sample):
     df_original = df.copy()
     ticks_to_volume_imbalance_bars(df_original, expected_imbalance=500_000)
     pd.testing.assert_frame_equal(df, df_original)
+
+
+def test_ticks_to_volume_imbalance_bars_adaptive(ticks_sample):
+    """The adaptive threshold must follow E[T] * |E[b]| computed from the previous bars."""
+    df = ticks_sample.copy()
+    span, initial = 10, 500
+    alpha = 2 / (span + 1)
+
+    bars = ticks_to_volume_imbalance_bars(df, expected_imbalance=initial, ewma_span=span)
+    assert len(bars) > 0
+
+    # Pure Python reference of the bar closing rule
+    prices, volumes = df["price"].to_numpy(), df["volume"].to_numpy()
+    threshold, ewma_t, ewma_b = initial, None, None
+    start, cum, lengths = 1, 0.0, []
+    for i in range(1, len(prices)):
+        sign = np.sign(prices[i] - prices[i - 1])
+        if sign == 0:
+            continue
+        cum += sign * volumes[i]
+        if abs(cum) >= threshold:
+            n_ticks = i + 1 - start
+            if ewma_t is None:
+                ewma_t, ewma_b = n_ticks, cum / n_ticks
+            else:
+                ewma_t += alpha * (n_ticks - ewma_t)
+                ewma_b += alpha * (cum / n_ticks - ewma_b)
+            threshold = min(max(ewma_t * abs(ewma_b), 0.1 * initial), 10 * initial)
+            lengths.append(n_ticks)
+            start, cum = i + 1, 0.0
+
+    np.testing.assert_array_equal(bars["number_ticks"].to_numpy(), lengths)
+
+    # Without a span, the threshold stays fixed
+    pd.testing.assert_frame_equal(
+        ticks_to_volume_imbalance_bars(df, expected_imbalance=initial, ewma_span=None),
+        ticks_to_volume_imbalance_bars(df, expected_imbalance=initial),
+    )
+
+    with pytest.raises(ValueError):
+        ticks_to_volume_imbalance_bars(df, expected_imbalance=initial, ewma_span=0)
@@ -0,0 +1,80 @@
+import numpy as np
+import pytest
+from quantreo.data_aggregation.bar_building import volume_bar_boundaries
+from quantreo.data_aggregation.bar_metrics import (
+    rolling_volume_profile,
+    volume_profile_features,
+    volume_profile_features_batch,
+)
+
+
+def test_volume_profile_features_batch(ticks_sample):
+    """The batch gives the per-bar POC, a consistent value area and the bin volumes."""
+    df = ticks_sample.copy()
+    prices = df["price"].to_numpy(np.float64)
+    volumes = df["volume"].to_numpy(np.float64)
+    starts, ends = volume_bar_boundaries(df, volume_per_bar=500)
+
+    features = volume_profile_features_batch(
+        prices, volumes, starts, ends, n_bins=10, value_area=0.7, return_histogram=True
+    )
+    expected = np.array(
+        [volume_profile_features(prices[s:e], volumes[s:e], 10) for s, e in zip(starts, ends)]
+    )
+    np.testing.assert_array_equal(features["poc_price"], expected[:, 0])
+    np.testing.assert_array_equal(features["poc_position"], expected[:, 1])
+
+    histogram = features["histogram"]
+    assert histogram.shape == (len(starts), 10) and histogram.dtype == np.float32
+    bar_volumes = [volumes[s:e].sum() for s, e in zip(starts, ends)]
+    np.testing.assert_allclose(histogram.sum(axis=1), bar_volumes, rtol=1e-6)
+
+    # The value area holds the POC and at least 70% of the volume of the bar
+    vah, val = features["value_area_high"], features["value_area_low"]
+    assert (val <= features["poc_price"]).all() and (features["poc_price"] <= vah).all()
+    for k, (s, e) in enumerate(zip(starts, ends)):
+        p, v = prices[s:e], volumes[s:e]
+        if p.max() > p.min():
+            assert v[(p >= val[k]) & (p <= vah[k])].sum() >= 0.7 * v.sum() - 1e-9
+
+    # Empty bars and invalid parameters
+    empty = volume_profile_features_batch(prices, volumes, np.array([3]), np.array([3]))
+    assert np.isnan(empty["poc_price"]).all() and list(empty) == ["poc_price", "poc_position"]
+    with pytest.raises(ValueError):
+        volume_profile_features_batch(prices, volumes, starts, ends, value_area=1.5)
+
+
+def test_rolling_volume_profile(ticks_sample):
+    """The incremental composite profile matches the profile rebuilt from the ticks of each window."""
+    df = ticks_sample.copy()
+    prices = df["price"].to_numpy(np.float64)
+    volumes = df["volume"].to_numpy(np.float64)
+    starts, ends = volume_bar_boundaries(df, volume_per_bar=500)
+    sessions = df.index[starts].floor("4h")
+    bin_size = 0.05
+
+    origin = prices[starts[0] : ends[-1]].min()
+    for window, labels in [(5, None), (None, sessions), (3, sessions)]:
+        profile = rolling_volume_profile(
+            prices, volumes, starts, ends, bin_size, window=window, sessions=labels
+        )
+        for k in range(len(starts)):
+            first = 0 if window is None else max(k - window + 1, 0)
+            if labels is not None:
+                while labels[first] != labels[k]:
+                    first += 1
+            p, v = prices[starts[first] : ends[k]], volumes[starts[first] : ends[k]]
+            bins = ((p - origin) / bin_size).astype(np.int64)
+            histogram = np.bincount(bins, weights=v)
+            poc = np.argmax(histogram[bins.min() :]) + bins.min()
+            assert profile["poc_price"][k] == pytest.approx(origin + (poc + 0.5) * bin_size)
+
+            vah, val = profile["value_area_high"][k], profile["value_area_low"][k]
+            assert val < profile["poc_price"][k] < vah
+            in_area = (bins >= round((val - origin) / bin_size)) & (
+                bins < round((vah - origin) / bin_size)
+            )
+            assert v[in_area].sum() >= 0.7 * v.sum() - 1e-9
+
+    with pytest.raises(ValueError):
+        rolling_volume_profile(prices, volumes, starts, ends, bin_size=0.0)
@@ -0,0 +1,92 @@
+import numpy as np
+import pytest
+from quantreo.data_aggregation import segments
+from quantreo.data_aggregation.bar_building import volume_bar_boundaries
+from quantreo.data_aggregation.bar_metrics import kurtosis, skewness
+
+
+@pytest.fixture
+def bars(ticks_sample):
+    df = ticks_sample.copy()
+    prices = df["price"].to_numpy(np.float64)
+    volumes = df["volume"].to_numpy(np.float64)
+    starts, ends = volume_bar_boundaries(df, volume_per_bar=200)
+    # A few short and empty segments on top of the bars
+    starts = np.concatenate((starts, np.array([0, 5, 7, 9], dtype=np.int64)))
+    ends = np.concatenate((ends, np.array([0, 6, 9, 12], dtype=np.int64)))
+    return prices, volumes, starts, ends
+
+
+def _reference(func, starts, ends, *arrays, empty=np.nan):
+    return np.array(
+        [func(*(x[s:e] for x in arrays)) if e > s else empty for s, e in zip(starts, ends)]
+    )
+
+
+def test_segment_reductions(bars):
+    """Every primitive matches its numpy counterpart applied bar by bar."""
+    prices, volumes, starts, ends = bars
+
+    np.testing.assert_allclose(
+        segments.segment_sum(volumes, starts, ends),
+        _reference(np.sum, starts, ends, volumes, empty=0.0),
+    )
+    np.testing.assert_allclose(
+        segments.segment_mean(prices, starts, ends), _reference(np.mean, starts, ends, prices)
+    )
+    np.testing.assert_allclose(
+        segments.segment_var(prices, starts, ends),
+        _reference(np.var, starts, ends, prices),
+        atol=1e-12,
+    )
+    np.testing.assert_allclose(
+        segments.segment_std(prices, starts, ends, ddof=1),
+        _reference(lambda x: np.std(x, ddof=1) if len(x) > 1 else np.nan, starts, ends, prices),
+        atol=1e-9,
+    )
+    np.testing.assert_allclose(
+        segments.segment_first(prices, starts, ends),
+        _reference(lambda x: x[0], starts, ends, prices),
+    )
+    np.testing.assert_allclose(
+        segments.segment_last(prices, starts, ends),
+        _reference(lambda x: x[-1], starts, ends, prices),
+    )
+    np.testing.assert_allclose(
+        segments.segment_weighted_mean(prices, volumes, starts, ends),
+        _reference(lambda p, v: (p * v).sum() / v.sum(), starts, ends, prices, volumes),
+    )
+    for q in [0.0, 0.25, 0.5, 0.9, 1.0]:
+        np.testing.assert_allclose(
+            segments.segment_quantile(prices, starts, ends, q),
+            _reference(lambda x, q=q: np.quantile(x, q), starts, ends, prices),
+        )
+    np.testing.assert_allclose(
+        segments.segment_skewness(prices, starts, ends),
+        _reference(skewness, starts, ends, prices, empty=0.0),
+        atol=1e-9,
+    )
+    np.testing.assert_allclose(
+        segments.segment_kurtosis(prices, starts, ends),
+        _reference(kurtosis, starts, ends, prices, empty=0.0),
+        atol=1e-9,
+    )
+
+    with pytest.raises(ValueError):
+        segments.segment_quantile(prices, starts, ends, 1.5)
+
+
+def test_segment_min_max(bars):
+    """The offsets point at the first occurrence of the extremum within the segment."""
+    prices, _, starts, ends = bars
+
+    for func, reduce, arg in [
+        (segments.segment_min, np.min, np.argmin),
+        (segments.segment_max, np.max, np.argmax),
+    ]:
+        values, offsets = func(prices, starts, ends)
+        assert offsets.dtype == np.int64
+        np.testing.assert_allclose(values, _reference(reduce, starts, ends, prices))
+        np.testing.assert_array_equal(
+            offsets, [s + arg(prices[s:e]) if e > s else -1 for s, e in zip(starts, ends)]
+        )
@@ -0,0 +1,100 @@
+import numpy as np
+import pandas as pd
+import pytest
+from quantreo.data_aggregation.bar_building import (
+    TickSlice,
+    VolumeBarBuilder,
+    ticks_to_volume_bars,
+)
+from quantreo.data_aggregation.tick_cleaning import TickCleaner, clean_ticks
+
+
+@pytest.fixture
+def dirty_ticks(ticks_sample):
+    df = ticks_sample.copy()
+    df["volume"] = df["volume"].astype(np.float64)
+    bad = df.iloc[[100, 200, 300, 400, 500]].copy()
+    bad.iloc[0, bad.columns.get_loc("price")] = -1.0  # invalid price
+    bad.iloc[1, bad.columns.get_loc("price")] *= 1.5  # fat-finger spike
+    bad.iloc[2, bad.columns.get_loc("volume")] = np.nan  # invalid volume
+    bad.index = bad.index + pd.Timedelta("1ns")
+    duplicates = df.iloc[[600, 700]]
+    late = df.iloc[[50]]  # repeated much later: out of order
+
+    dirty = pd.concat([df.iloc[:800], bad, duplicates, df.iloc[800:]])
+    dirty = dirty.sort_index(kind="stable")
+    return pd.concat([dirty.iloc[:2000], late, dirty.iloc[2000:]])
+
+
+def test_tick_cleaner(ticks_sample, dirty_ticks):
+    """Dirty ticks are dropped, the same way at once and chunk by chunk."""
+    cleaner = TickCleaner()
+    cleaned = cleaner.update(dirty_ticks)
+
+    assert cleaner.stats == {
+        "invalid": 2,
+        "out_of_order": 1,
+        "duplicate": 2,
+        "outlier": 1,
+        "time_repaired": 0,
+    }
+    assert cleaned.index.is_monotonic_increasing
+    assert (cleaned["price"] > 0).all() and cleaned["volume"].notna().all()
+    assert len(cleaned) == len(ticks_sample) + 2  # the two valid shifted ticks of `bad`
+
+    chunked = TickCleaner()
+    parts = [chunked.update(dirty_ticks.iloc[i : i + 777]) for i in range(0, len(dirty_ticks), 777)]
+    pd.testing.assert_frame_equal(pd.concat(parts), cleaned)
+    assert chunked.stats == cleaner.stats
+
+    # In place on the numpy columns
+    prices = dirty_ticks["price"].to_numpy(np.float64, copy=True)
+    volumes = dirty_ticks["volume"].to_numpy(np.float64, copy=True)
+    timestamps_ns = dirty_ticks.index.values.astype(np.int64)
+    n = TickCleaner().clean_arrays(prices, volumes, timestamps_ns)
+    np.testing.assert_array_equal(prices[:n], cleaned["price"].to_numpy())
+    np.testing.assert_array_equal(timestamps_ns[:n], cleaned.index.values.astype(np.int64))
+    pd.testing.assert_frame_equal(
+        ticks_to_volume_bars(TickSlice(timestamps_ns[:n], prices[:n], volumes[:n]), 500),
+        ticks_to_volume_bars(cleaned, 500),
+    )
+
+
+def test_tick_cleaner_options(dirty_ticks):
+    """Time clipping, the jump filter and the streaming builders."""
+    clipped = clean_ticks(dirty_ticks, time_repair="clip", outlier="jump", max_jump=0.2)
+    assert clipped.index.is_monotonic_increasing
+    assert len(clipped) == len(clean_ticks(dirty_ticks)) + 1
+
+    builder = VolumeBarBuilder(volume_per_bar=500)
+    cleaner = TickCleaner()
+    bars = pd.concat(
+        [
+            builder.update(cleaner.update(dirty_ticks.iloc[i : i + 1000]))
+            for i in range(0, len(dirty_ticks), 1000)
+        ]
+    )
+    pd.testing.assert_frame_equal(bars, ticks_to_volume_bars(clean_ticks(dirty_ticks), 500))
+
+    with pytest.raises(ValueError):
+        TickCleaner(outlier="zscore")
+    with pytest.raises(ValueError):
+        TickCleaner().clean_arrays(np.ones(3, dtype=np.float32), np.ones(3), np.arange(3))
+
+
+def test_tick_cleaner_jump_level_shift():
+    """A lasting price gap is kept from its second tick, a single-tick spike is dropped."""
+    prices = np.array([100.0, 100.1, 100.0, 110.0, 110.1, 110.0, 110.2, 130.0, 110.1, 110.0])
+    index = pd.date_range("2024-01-02", periods=len(prices), freq="1s")
+    df = pd.DataFrame({"price": prices, "volume": 1.0}, index=index)
+
+    cleaner = TickCleaner(outlier="jump", max_jump=0.05)
+    cleaned = cleaner.update(df)
+
+    # The first tick of the new level and the spike are dropped, the rest of the stream is kept
+    pd.testing.assert_frame_equal(cleaned, df.drop(index[[3, 7]]))
+    assert cleaner.stats["outlier"] == 2
+
+    chunked = TickCleaner(outlier="jump", max_jump=0.05)
+    parts = [chunked.update(df.iloc[i : i + 3]) for i in range(0, len(df), 3)]
+    pd.testing.assert_frame_equal(pd.concat(parts), cleaned)